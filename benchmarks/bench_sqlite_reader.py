@@ -0,0 +1,132 @@
+"""
+Micro-benchmark: full-table read throughput of the SQLite reader modes.
+
+    python -m benchmarks.bench_sqlite_reader [--rows 1000000] [--batch 10000]
+
+Builds a synthetic database, then scans it with SQLiteReader.read_rows:
+  default    read-write connection, SQLite's default page cache (live mode)
+  read_only  mode=ro with mmap_size and a large page cache
+  snapshot   backup-API copy opened immutable with mmap and a large cache
+             (snapshot_seconds is the cost of taking the copy)
+Each mode runs --repeat times on a fresh connection; the best run counts.
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from src.infrastructure.adapters.sqlite_reader import SQLiteReader
+from src.infrastructure.adapters.sqlite_snapshot import SQLiteSnapshot
+
+
+MMAP_BYTES = 256 * 1024 * 1024
+CACHE_KIB = 64 * 1024
+
+
+def build_database(path: str, rows: int):
+    rnd = random.Random(42)
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE events (id INTEGER PRIMARY KEY, user_id INTEGER, kind TEXT, "
+        "amount REAL, created_at TEXT, payload TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            (
+                i,
+                rnd.randint(1, 100_000),
+                rnd.choice(("click", "view", "purchase")),
+                rnd.random() * 100,
+                f"2024-01-{rnd.randint(1, 28):02d} 12:00:00",
+                "x" * rnd.randint(20, 120),
+            )
+            for i in range(rows)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def scan(reader: SQLiteReader, batch: int) -> int:
+    rows = 0
+    for rows_batch in reader.read_rows("events", batch):
+        rows += len(rows_batch)
+    return rows
+
+
+def measure(name: str, make_reader, batch: int, repeat: int, extra=None):
+    best = None
+    for _ in range(repeat):
+        reader = make_reader()
+        try:
+            started = time.perf_counter()
+            rows = scan(reader, batch)
+            seconds = time.perf_counter() - started
+        finally:
+            reader.close()
+        best = seconds if best is None else min(best, seconds)
+
+    result = {
+        "mode": name,
+        "rows": rows,
+        "seconds": round(best, 4),
+        "rows_per_second": round(rows / best),
+    }
+    result.update(extra or {})
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        build_database(path, args.rows)
+
+        results = [
+            measure("default", lambda: SQLiteReader(path, pool_size=1), args.batch, args.repeat),
+            measure(
+                "read_only",
+                lambda: SQLiteReader(
+                    path, pool_size=1, read_only=True,
+                    mmap_size=MMAP_BYTES, cache_size=CACHE_KIB,
+                ),
+                args.batch,
+                args.repeat,
+            ),
+        ]
+
+        snapshot = SQLiteSnapshot(path)
+        started = time.perf_counter()
+        snapshot_path = snapshot.create()
+        snapshot_seconds = time.perf_counter() - started
+        try:
+            results.append(measure(
+                "snapshot",
+                lambda: SQLiteReader(
+                    snapshot_path, pool_size=1, immutable=True,
+                    mmap_size=MMAP_BYTES, cache_size=CACHE_KIB,
+                ),
+                args.batch,
+                args.repeat,
+                extra={"snapshot_seconds": round(snapshot_seconds, 4)},
+            ))
+        finally:
+            snapshot.remove()
+
+    baseline = results[0]["rows_per_second"]
+    for result in results:
+        result["speedup"] = round(result["rows_per_second"] / baseline, 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
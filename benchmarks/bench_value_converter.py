@@ -0,0 +1,103 @@
+"""
+Micro-benchmark: cost of the per-column BatchConverter over raw passthrough.
+
+    python -m benchmarks.bench_value_converter [--rows 200000] [--batch 5000]
+
+Each strategy converts the same synthetic batches and encodes them for
+COPY csv, so the overhead is reported against real per-batch work:
+  passthrough  rows are handed to the writer untouched (no conversion)
+  per_value    type dispatch for every value, row by row
+  columnar     BatchConverter: compiled plan, column by column
+"""
+import argparse
+import json
+import random
+import time
+
+from src.application.schema.value_converter import BatchConverter, converter_for
+from src.infrastructure.adapters.copy_encoder import CsvCopyEncoder
+
+
+COLUMN_TYPES = [
+    "BIGINT",
+    "TEXT",
+    "BOOLEAN",
+    "TIMESTAMP",
+    "DOUBLE PRECISION",
+    "TEXT",
+    "BYTEA",
+    "DATE",
+]
+
+
+def make_batches(rows: int, batch: int):
+    rnd = random.Random(42)
+    data = [
+        (
+            i,
+            f"name-{i}",
+            rnd.randint(0, 1),
+            f"2024-01-{rnd.randint(1, 28):02d} 10:{rnd.randint(0, 59):02d}:00",
+            rnd.random() * 1000,
+            None if i % 7 == 0 else "lorem ipsum dolor sit amet",
+            b"\x00\x01\x02",
+            "2024-02-03",
+        )
+        for i in range(rows)
+    ]
+    return [data[i:i + batch] for i in range(0, rows, batch)]
+
+
+def per_value(column_types):
+    converters = [converter_for(t) for t in column_types]
+
+    def convert(rows):
+        out = []
+        for row in rows:
+            values = []
+            for value, fn in zip(row, converters):
+                values.append(value if value is None or fn is None else fn(value))
+            out.append(tuple(values))
+        return out
+
+    return convert
+
+
+def measure(name, convert, batches, rows):
+    encoder = CsvCopyEncoder()
+    convert_seconds = 0.0
+    started = time.perf_counter()
+    for batch in batches:
+        t0 = time.perf_counter()
+        converted = convert(batch)
+        convert_seconds += time.perf_counter() - t0
+        encoder.encode_batch(converted)
+    seconds = time.perf_counter() - started
+    return {
+        "strategy": name,
+        "convert_seconds": round(convert_seconds, 4),
+        "total_seconds": round(seconds, 4),
+        "rows_per_second": round(rows / seconds),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=5_000)
+    args = parser.parse_args()
+
+    batches = make_batches(args.rows, args.batch)
+    results = [
+        measure("passthrough", lambda rows: rows, batches, args.rows),
+        measure("per_value", per_value(COLUMN_TYPES), batches, args.rows),
+        measure("columnar", BatchConverter(COLUMN_TYPES), batches, args.rows),
+    ]
+    baseline = results[0]["total_seconds"]
+    for result in results:
+        result["overhead_pct"] = round((result["total_seconds"] / baseline - 1) * 100, 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
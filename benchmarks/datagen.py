@@ -0,0 +1,147 @@
+"""
+Synthetic SQLite databases for the benchmarks.
+
+    python -m benchmarks.datagen out.db [--tables 4] [--rows 100000]
+        [--text-width 32] [--blob-bytes 0] [--mix mixed] [--no-foreign-keys]
+
+Every table gets an INTEGER PRIMARY KEY plus columns drawn from a type
+mix; table N optionally references table N-1 so the scheduler has
+dependencies to honour. Data is deterministic for a given seed.
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+from typing import Dict, List
+
+
+# Tipos SQLite de las columnas de datos, por mezcla
+TYPE_MIXES: Dict[str, List[str]] = {
+    "numeric": ["INTEGER", "INTEGER", "REAL", "REAL", "BOOLEAN"],
+    "text": ["TEXT", "TEXT", "TEXT", "VARCHAR(64)"],
+    "mixed": ["INTEGER", "TEXT", "REAL", "BOOLEAN", "TIMESTAMP", "DATE", "TEXT"],
+    "temporal": ["TIMESTAMP", "TIMESTAMP", "DATE", "DATETIME"],
+}
+
+INSERT_CHUNK = 10_000
+
+
+def _value_factory(sqlite_type: str, rnd: random.Random, text_width: int, blob_bytes: int):
+    if sqlite_type == "INTEGER":
+        return lambda i: rnd.randint(-2**31, 2**31)
+    if sqlite_type == "REAL":
+        return lambda i: rnd.random() * 1e6
+    if sqlite_type == "BOOLEAN":
+        return lambda i: rnd.randint(0, 1)
+    if sqlite_type in ("TIMESTAMP", "DATETIME"):
+        return lambda i: (
+            f"2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} "
+            f"{rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}:{rnd.randint(0, 59):02d}"
+        )
+    if sqlite_type == "DATE":
+        return lambda i: f"2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"
+    if sqlite_type == "BLOB":
+        return lambda i: rnd.randbytes(blob_bytes)
+
+    alphabet = "abcdefghijklmnopqrstuvwxyz "
+    return lambda i: "".join(rnd.choices(alphabet, k=rnd.randint(text_width // 2, text_width)))
+
+
+def generate(
+    path: str,
+    tables: int = 4,
+    rows: int = 100_000,
+    text_width: int = 32,
+    blob_bytes: int = 0,
+    mix: str = "mixed",
+    foreign_keys: bool = True,
+    seed: int = 42,
+) -> Dict:
+    """Writes a new database at ``path`` and returns a description of it."""
+    if mix not in TYPE_MIXES:
+        raise ValueError(f"Unknown type mix '{mix}' (choose from {', '.join(TYPE_MIXES)})")
+    if os.path.exists(path):
+        os.remove(path)
+
+    rnd = random.Random(seed)
+    column_types = list(TYPE_MIXES[mix])
+    if blob_bytes > 0:
+        column_types.append("BLOB")
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+
+    try:
+        for n in range(tables):
+            table = f"t{n:02d}"
+            columns = ['"id" INTEGER PRIMARY KEY']
+            if foreign_keys and n > 0:
+                columns.append(f'"parent_id" INTEGER REFERENCES "t{n - 1:02d}"("id")')
+            columns += [f'"c{i}" {t}' for i, t in enumerate(column_types)]
+            conn.execute(f'CREATE TABLE "{table}" ({", ".join(columns)})')
+
+            factories = [
+                _value_factory(t, rnd, text_width, blob_bytes) for t in column_types
+            ]
+            with_parent = foreign_keys and n > 0
+            placeholders = ", ".join("?" * (len(factories) + 1 + with_parent))
+
+            for start in range(0, rows, INSERT_CHUNK):
+                chunk = []
+                for i in range(start, min(start + INSERT_CHUNK, rows)):
+                    row = [i + 1]
+                    if with_parent:
+                        row.append(rnd.randint(1, rows) if rows else None)
+                    row += [f(i) for f in factories]
+                    chunk.append(row)
+                conn.executemany(f'INSERT INTO "{table}" VALUES ({placeholders})', chunk)
+            conn.commit()
+
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        "path": path,
+        "tables": tables,
+        "rows_per_table": rows,
+        "total_rows": tables * rows,
+        "text_width": text_width,
+        "blob_bytes": blob_bytes,
+        "mix": mix,
+        "column_types": column_types,
+        "foreign_keys": foreign_keys,
+        "file_bytes": os.path.getsize(path),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path")
+    parser.add_argument("--tables", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--text-width", type=int, default=32)
+    parser.add_argument("--blob-bytes", type=int, default=0)
+    parser.add_argument("--mix", choices=sorted(TYPE_MIXES), default="mixed")
+    parser.add_argument("--no-foreign-keys", action="store_true")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    info = generate(
+        args.path,
+        tables=args.tables,
+        rows=args.rows,
+        text_width=args.text_width,
+        blob_bytes=args.blob_bytes,
+        mix=args.mix,
+        foreign_keys=not args.no_foreign_keys,
+        seed=args.seed,
+    )
+    print(json.dumps(info, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from src.api.routes.schema_routes import router as schema_router
-from src.api.routes.migration_routes import router as migration_router
+from src.api.routes.migration_routes import router as migration_router, migration_service
+from src.api.routes.metrics_routes import router as metrics_router
 
 app = FastAPI(
     title="SQLite → PostgreSQL Migrator",
@@ -10,6 +11,13 @@ app = FastAPI(
 
 app.include_router(schema_router)
 app.include_router(migration_router)
+app.include_router(metrics_router)
+
+
+@app.on_event("shutdown")
+def flush_jobs():
+    # Último estado de los jobs al store antes de salir (escrituras throttled)
+    migration_service.job_manager.flush()
 
 if __name__ == "__main__":
     import uvicorn
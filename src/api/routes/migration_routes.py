@@ -1,16 +1,33 @@
-from fastapi import APIRouter, HTTPException, status
+import json
+import os
+from typing import Optional
 
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from src.application.jobs.job_store import job_store_from_url
 from src.application.migration_service import MigrationService
 from src.application.dtos import (
     StartMigrationRequest,
     StartMigrationResponse,
+    PlanMigrationRequest,
+    MigrationPlanResponse,
+    StartSyncRequest,
+    StartVerificationRequest,
+    StartExportRequest,
+    StartSpoolLoadRequest,
+    ResumeJobRequest,
     JobStatusResponse,
     JobErrorResponse,
 )
 
 router = APIRouter(prefix="/migration", tags=["Migration"])
 
-migration_service = MigrationService()
+# memory (por defecto) o sqlite:///ruta/jobs.db para conservar los jobs entre reinicios
+# (fichero 0600; las contraseñas de postgres_url no se guardan)
+migration_service = MigrationService(
+    job_store=job_store_from_url(os.environ.get("MIGRATOR_JOB_STORE"))
+)
 
 
 @router.post(
@@ -37,6 +54,138 @@ def start_migration(req: StartMigrationRequest):
         )
 
 
+@router.post(
+    "/plan",
+    response_model=MigrationPlanResponse,
+    status_code=status.HTTP_200_OK,
+)
+def plan_migration(req: PlanMigrationRequest):
+    try:
+        return migration_service.plan_migration(req)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to build migration plan",
+        )
+
+
+@router.post(
+    "/sync",
+    response_model=StartMigrationResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def start_sync(req: StartSyncRequest):
+    try:
+        return migration_service.start_sync(req)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to start delta sync job",
+        )
+
+
+@router.post(
+    "/verify",
+    response_model=StartMigrationResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def start_verification(req: StartVerificationRequest):
+    try:
+        return migration_service.start_verification(req)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to start verification job",
+        )
+
+
+@router.post(
+    "/export",
+    response_model=StartMigrationResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def start_export(req: StartExportRequest):
+    try:
+        return migration_service.start_export(req)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to start export job",
+        )
+
+
+@router.post(
+    "/load",
+    response_model=StartMigrationResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def start_load(req: StartSpoolLoadRequest):
+    try:
+        return migration_service.start_load(req)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to start spool load job",
+        )
+
+
+@router.post(
+    "/resume/{job_id}",
+    response_model=StartMigrationResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def resume_migration(job_id: str, req: Optional[ResumeJobRequest] = None):
+    try:
+        return migration_service.resume_migration(job_id, req)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to resume migration job",
+        )
+
+
 @router.get(
     "/status/{job_id}",
     response_model=JobStatusResponse,
@@ -58,13 +207,70 @@ def get_status(job_id: str):
         )
 
 
+@router.get("/stream/{job_id}")
+def stream_job(
+    job_id: str,
+    interval: float = Query(default=0.5, ge=0.05, le=60, description="Min seconds between progress events"),
+):
+    """Server-Sent Events: table, error and coalesced progress events until the job ends."""
+    try:
+        events = migration_service.stream_job_events(job_id, interval)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+
+    return StreamingResponse(
+        _server_sent_events(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _server_sent_events(events):
+    async for name, data in events:
+        if name == "ping":
+            # Comentario SSE: mantiene viva la conexión a través de proxies
+            yield ": ping\n\n"
+            continue
+        yield f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.websocket("/ws/{job_id}")
+async def stream_job_ws(websocket: WebSocket, job_id: str, interval: float = 0.5):
+    """Same events as /stream, as JSON messages ``{"event": ..., "data": ...}``."""
+    try:
+        events = migration_service.stream_job_events(job_id, max(0.05, interval))
+    except ValueError:
+        await websocket.close(code=4404)
+        return
+
+    await websocket.accept()
+    try:
+        async for name, data in events:
+            await websocket.send_json({"event": name, "data": data})
+    except WebSocketDisconnect:
+        return
+    finally:
+        await events.aclose()
+
+    await websocket.close()
+
+
 @router.get(
     "/errors/{job_id}",
     response_model=JobErrorResponse,
 )
-def get_errors(job_id: str):
+def get_errors(
+    job_id: str,
+    offset: int = Query(default=0, ge=0, description="Quarantined rows to skip"),
+    limit: int = Query(default=100, ge=1, le=1000, description="Quarantined rows per page"),
+    table: Optional[str] = Query(default=None, description="Only rows quarantined from this table"),
+):
     try:
-        return migration_service.get_job_errors(job_id)
+        return migration_service.get_job_errors(job_id, offset=offset, limit=limit, table=table)
 
     except ValueError as e:
         raise HTTPException(
@@ -1,6 +1,7 @@
-from typing import Optional, List
+from datetime import datetime
+from typing import Any, Optional, List, Dict
 from pydantic import BaseModel, Field
-from src.domain.models import JobStatus
+from src.domain.models import JobExecutor, JobStatus, JobType, LoadMode, RowEstimate, SourceMode
 
 
 # ==============================================
@@ -10,11 +11,402 @@ from src.domain.models import JobStatus
 class StartMigrationRequest(BaseModel):
     sqlite_path: str = Field(..., description="Path to the source SQLite database")
     postgres_url: str = Field(..., description="PostgreSQL connection URL")
+    priority: int = Field(
+        default=0,
+        description="Scheduling priority; higher starts first among queued jobs"
+    )
+    postgres_schema: str = Field(
+        default="public",
+        description="Target PostgreSQL schema (search_path and catalog lookups)"
+    )
     batch_size: Optional[int] = Field(
         default=1000,
         gt=0,
         description="Number of rows to process per batch"
     )
+    auto_batch_size: bool = Field(
+        default=False,
+        description="Adapt rows per batch to target_batch_bytes and write latency"
+    )
+    target_batch_bytes: int = Field(
+        default=8 * 1024 * 1024,
+        gt=0,
+        description="Byte size aimed for per batch in auto mode"
+    )
+    target_batch_seconds: float = Field(
+        default=0.5,
+        gt=0,
+        description="Write latency aimed for per batch in auto mode"
+    )
+    memory_budget_bytes: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Max batch bytes in flight for this job (also capped process-wide)"
+    )
+    load_mode: LoadMode = Field(
+        default=LoadMode.COPY_CSV,
+        description="Load path: COPY (csv/binary) or execute_batch INSERTs as fallback"
+    )
+    table_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Number of tables migrated concurrently"
+    )
+    range_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Concurrent rowid/integer-PK ranges copied per large table"
+    )
+    min_rows_per_range: int = Field(
+        default=250_000,
+        gt=0,
+        description="Smallest key range worth a separate stream"
+    )
+    prefetch_depth: int = Field(
+        default=4,
+        ge=0,
+        description="Batches buffered between read/convert/write stages (0 = lockstep)"
+    )
+    convert_values: bool = Field(
+        default=True,
+        description="Convert values per column for the target type (booleans, datetimes, BLOB, NUL in TEXT)"
+    )
+    fast_load: bool = Field(
+        default=False,
+        description="Load new tables UNLOGGED without PK, then build the PK and SET LOGGED"
+    )
+    maintenance_work_mem: str = Field(
+        default="1GB",
+        description="maintenance_work_mem for fast-load sessions (PK build) and post-load index builds"
+    )
+    source_mode: SourceMode = Field(
+        default=SourceMode.LIVE,
+        description="live: read the file as is; snapshot: read a consistent backup copy; immutable: file is known not to change"
+    )
+    snapshot_dir: Optional[str] = Field(
+        default=None,
+        description="Where the snapshot copy is written (default: next to the SQLite file)"
+    )
+    sqlite_mmap_bytes: Optional[int] = Field(
+        default=256 * 1024 * 1024,
+        ge=0,
+        description="PRAGMA mmap_size for SQLite reader connections (None = SQLite default)"
+    )
+    sqlite_cache_kib: Optional[int] = Field(
+        default=64 * 1024,
+        gt=0,
+        description="Page cache per SQLite reader connection, in KiB (None = SQLite default)"
+    )
+    large_value_bytes: Optional[int] = Field(
+        default=4 * 1024 * 1024,
+        gt=0,
+        description="TEXT/BLOB values longer than this are streamed from SQLite in chunks instead of fetched with the row (None = never)"
+    )
+    large_value_chunk_bytes: int = Field(
+        default=1024 * 1024,
+        gt=0,
+        description="Chunk size when streaming large values"
+    )
+    checkpoints: bool = Field(
+        default=True,
+        description="Persist per-range checkpoints so the job can be resumed"
+    )
+    row_estimate: RowEstimate = Field(
+        default=RowEstimate.AUTO,
+        description="How total_rows is estimated before copying starts"
+    )
+    refine_row_counts: bool = Field(
+        default=True,
+        description="Count rows exactly in the background and refine total_rows"
+    )
+    pool_size: int = Field(
+        default=4,
+        ge=1,
+        description="Max pooled connections per side (SQLite and PostgreSQL)"
+    )
+    commit_every_batches: Optional[int] = Field(
+        default=10,
+        gt=0,
+        description="Commit after this many batches (None = once per table)"
+    )
+    commit_every_bytes: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Commit after this many estimated payload bytes"
+    )
+    create_indexes: bool = Field(
+        default=True,
+        description="Replicate SQLite secondary and UNIQUE indexes after the data load"
+    )
+    create_foreign_keys: bool = Field(
+        default=True,
+        description="Add SQLite foreign keys NOT VALID after the load, then validate them in parallel"
+    )
+    index_workers: int = Field(
+        default=4,
+        ge=1,
+        description="Index builds / foreign key validations run concurrently (each may use maintenance_work_mem)"
+    )
+    quarantine_bad_rows: bool = Field(
+        default=False,
+        description="Bisect failing batches and move the rows that fail alone to the dead-letter table instead of failing the job"
+    )
+    max_bad_rows: int = Field(
+        default=1000,
+        ge=0,
+        description="Error budget: the job fails once more rows than this are quarantined"
+    )
+    executor: JobExecutor = Field(
+        default=JobExecutor.THREADS,
+        description="threads: tables run in this process; celery: one task per table on the worker fleet (needs checkpoints)"
+    )
+    task_queue: Optional[str] = Field(
+        default=None,
+        description="Celery queue for this job's table tasks (default: the app's default queue)"
+    )
+    task_max_retries: int = Field(
+        default=3,
+        ge=0,
+        description="Retries of a table task after a connection error or a lost worker"
+    )
+
+
+class PlanMigrationRequest(StartMigrationRequest):
+    sample_rows: int = Field(
+        default=10_000,
+        gt=0,
+        description="Rows read and written (then rolled back) to sample throughput"
+    )
+    measure_throughput: bool = Field(
+        default=True,
+        description="Sample read/write throughput to estimate the duration"
+    )
+
+
+class StartSyncRequest(BaseModel):
+    sqlite_path: str = Field(..., description="Path to the source SQLite database")
+    postgres_url: str = Field(..., description="PostgreSQL connection URL")
+    priority: int = Field(
+        default=0,
+        description="Scheduling priority; higher starts first among queued jobs"
+    )
+    postgres_schema: str = Field(
+        default="public",
+        description="Target PostgreSQL schema (search_path and catalog lookups)"
+    )
+    tables: Optional[List[str]] = Field(
+        default=None,
+        description="Tables to sync (None = every table in the SQLite file)"
+    )
+    watermark_columns: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Per-table watermark column, e.g. updated_at (default: rowid / integer PK, inserts only)"
+    )
+    capture_changes: bool = Field(
+        default=False,
+        description="Use trigger-based change capture (inserts, updates and deletes) instead of watermarks"
+    )
+    baseline: bool = Field(
+        default=False,
+        description="Only record current watermarks / install capture triggers; run before the full migration"
+    )
+    prune_changes: bool = Field(
+        default=True,
+        description="Delete applied entries from the SQLite change log"
+    )
+    batch_size: int = Field(
+        default=10_000,
+        gt=0,
+        description="Rows read per batch from SQLite"
+    )
+
+
+class StartVerificationRequest(BaseModel):
+    sqlite_path: str = Field(..., description="Path to the source SQLite database")
+    postgres_url: str = Field(..., description="PostgreSQL connection URL")
+    priority: int = Field(
+        default=0,
+        description="Scheduling priority; higher starts first among queued jobs"
+    )
+    postgres_schema: str = Field(
+        default="public",
+        description="Target PostgreSQL schema (search_path and catalog lookups)"
+    )
+    tables: Optional[List[str]] = Field(
+        default=None,
+        description="Tables to verify (None = every table in the SQLite file)"
+    )
+    workers: int = Field(
+        default=4,
+        ge=1,
+        description="Key ranges compared concurrently"
+    )
+    chunk_rows: int = Field(
+        default=100_000,
+        gt=0,
+        description="Keys per top-level checksum range"
+    )
+    leaf_rows: int = Field(
+        default=1_000,
+        gt=0,
+        description="Ranges at or below this many rows are diffed row by row"
+    )
+    fanout: int = Field(
+        default=16,
+        ge=2,
+        description="Sub-ranges a mismatched range is split into"
+    )
+    max_reported_keys: int = Field(
+        default=100,
+        ge=0,
+        description="Max missing/extra/changed keys listed per table"
+    )
+
+
+class StartExportRequest(BaseModel):
+    sqlite_path: str = Field(..., description="Path to the source SQLite database")
+    spool_dir: str = Field(..., description="Directory the COPY-ready files and manifest.json are written to")
+    priority: int = Field(
+        default=0,
+        description="Scheduling priority; higher starts first among queued jobs"
+    )
+    tables: Optional[List[str]] = Field(
+        default=None,
+        description="Tables to export (None = every table in the SQLite file)"
+    )
+    load_mode: LoadMode = Field(
+        default=LoadMode.COPY_BINARY,
+        description="Format of the spool files: copy_csv or copy_binary"
+    )
+    overwrite: bool = Field(
+        default=False,
+        description="Replace an earlier export found in spool_dir"
+    )
+    batch_size: int = Field(
+        default=10_000,
+        gt=0,
+        description="Rows read per batch from SQLite"
+    )
+    rows_per_file: int = Field(
+        default=1_000_000,
+        gt=0,
+        description="Rows aimed for per spool file; tables with a rowid/integer key are split by key range"
+    )
+    workers: int = Field(
+        default=4,
+        ge=1,
+        description="Spool files written concurrently"
+    )
+    prefetch_depth: int = Field(
+        default=4,
+        ge=0,
+        description="Batches buffered between read/convert and compression (0 = lockstep)"
+    )
+    compress_level: int = Field(
+        default=3,
+        ge=1,
+        le=9,
+        description="gzip level of the spool files"
+    )
+    convert_values: bool = Field(
+        default=True,
+        description="Convert values per column for the target type (booleans, datetimes, BLOB, NUL in TEXT)"
+    )
+    source_mode: SourceMode = Field(
+        default=SourceMode.LIVE,
+        description="live: read the file as is; snapshot: read a consistent backup copy; immutable: file is known not to change"
+    )
+    snapshot_dir: Optional[str] = Field(
+        default=None,
+        description="Where the snapshot copy is written (default: next to the SQLite file)"
+    )
+    sqlite_mmap_bytes: Optional[int] = Field(
+        default=256 * 1024 * 1024,
+        ge=0,
+        description="PRAGMA mmap_size for SQLite reader connections (None = SQLite default)"
+    )
+    sqlite_cache_kib: Optional[int] = Field(
+        default=64 * 1024,
+        gt=0,
+        description="Page cache per SQLite reader connection, in KiB (None = SQLite default)"
+    )
+    large_value_bytes: Optional[int] = Field(
+        default=4 * 1024 * 1024,
+        gt=0,
+        description="TEXT/BLOB values longer than this are streamed from SQLite in chunks instead of fetched with the row (None = never)"
+    )
+    large_value_chunk_bytes: int = Field(
+        default=1024 * 1024,
+        gt=0,
+        description="Chunk size when streaming large values"
+    )
+    row_estimate: RowEstimate = Field(
+        default=RowEstimate.AUTO,
+        description="How total_rows is estimated before exporting starts"
+    )
+
+
+class StartSpoolLoadRequest(BaseModel):
+    spool_dir: str = Field(..., description="Directory holding an export's manifest.json and spool files")
+    postgres_url: str = Field(..., description="PostgreSQL connection URL")
+    priority: int = Field(
+        default=0,
+        description="Scheduling priority; higher starts first among queued jobs"
+    )
+    postgres_schema: str = Field(
+        default="public",
+        description="Target PostgreSQL schema (search_path and catalog lookups)"
+    )
+    tables: Optional[List[str]] = Field(
+        default=None,
+        description="Tables to load (None = every table in the manifest)"
+    )
+    workers: int = Field(
+        default=4,
+        ge=1,
+        description="Spool files loaded concurrently, one COPY and transaction each"
+    )
+    checkpoints: bool = Field(
+        default=True,
+        description="Record each loaded file so a failed load can be resumed without duplicates"
+    )
+    verify_checksums: bool = Field(
+        default=True,
+        description="Check each file's size and sha256 against the manifest before committing it"
+    )
+    create_indexes: bool = Field(
+        default=True,
+        description="Build the exported tables' secondary and UNIQUE indexes after the files are loaded"
+    )
+    create_foreign_keys: bool = Field(
+        default=True,
+        description="Add the exported foreign keys NOT VALID after the load, then validate them in parallel"
+    )
+    index_workers: int = Field(
+        default=4,
+        ge=1,
+        description="Index builds / foreign key validations run concurrently (each may use maintenance_work_mem)"
+    )
+    maintenance_work_mem: str = Field(
+        default="1GB",
+        description="maintenance_work_mem for the post-load index builds"
+    )
+
+
+class ResumeJobRequest(BaseModel):
+    postgres_url: Optional[str] = Field(
+        default=None,
+        description="Target URL with its password; required when the job was restored from the job store"
+    )
+
+
+class GenerateSchemaRequest(BaseModel):
+    sqlite_path: str = Field(..., description="Path to the source SQLite database")
+
+
+class ApplySchemaRequest(BaseModel):
+    postgres_url: str = Field(..., description="PostgreSQL connection URL")
+    schema_sql: str = Field(..., description="DDL to execute on the target")
 
 
 # ==============================================
@@ -27,15 +419,75 @@ class StartMigrationResponse(BaseModel):
     message: str
 
 
+class TablePlanResponse(BaseModel):
+    table: str
+    exists: bool
+    columns: List[str]
+    key_column: Optional[str] = None
+    estimated_rows: int
+    estimated_bytes: int
+    depends_on: List[str]
+    converted_columns: List[str]
+    large_columns: List[str] = []
+    indexes: List[str] = []
+    foreign_keys: List[str] = []
+    create_sql: str
+    load_sql: str
+
+
+class MigrationPlanResponse(BaseModel):
+    load_mode: LoadMode
+    table_workers: int
+    range_workers: int
+    prefetch_depth: int
+    total_rows: int
+    total_rows_exact: bool
+    total_bytes: int
+    order: List[List[str]]
+    tables: List[TablePlanResponse]
+    estimate: Optional[Dict[str, Any]] = None
+
+
 class JobStatusResponse(BaseModel):
     job_id: str
+    job_type: Optional[JobType] = None
     status: JobStatus
     progress: Optional[float] = None
     processed_rows: Optional[int] = None
     total_rows: Optional[int] = None
+    total_rows_exact: Optional[bool] = None
+    load_mode: Optional[LoadMode] = None
+    rows_per_second: Optional[float] = None
+    processed_bytes: Optional[int] = None
+    bytes_per_second: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    connection_stats: Optional[Dict[str, Dict[str, int]]] = None
+    stage_seconds: Optional[Dict[str, float]] = None
+    phase_seconds: Optional[Dict[str, float]] = None
+    table_metrics: Optional[Dict[str, Dict[str, float]]] = None
+    completed_tables: Optional[List[str]] = None
+    queue_position: Optional[int] = None
+    verification: Optional[Dict[str, Dict[str, Any]]] = None
+    post_load: Optional[Dict[str, Dict[str, Any]]] = None
+    quarantined_rows: Optional[int] = None
     error: Optional[str] = None
 
 
+class QuarantinedRowResponse(BaseModel):
+    table: str
+    row_key: Optional[str] = None
+    row: Dict[str, Any]
+    error: str
+    sqlstate: Optional[str] = None
+    created_at: datetime
+
+
 class JobErrorResponse(BaseModel):
     job_id: str
     errors: List[str]
+    errors_dropped: int = 0
+    quarantined_rows: int = 0
+    quarantine: List[QuarantinedRowResponse] = []
+    offset: int = 0
+    limit: int = 0
+    note: Optional[str] = None
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Tuple
+
+from src.domain.models import JobStatus, MigrationJob
+
+
+TERMINAL_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+Event = Tuple[str, Dict[str, Any]]
+
+
+class JobEventStream:
+    """
+    Push-based events for one job, driven by JobManager notifications.
+
+    The listener registered with the JobManager runs on the worker threads
+    on every update; it only flips a flag and, the first time, wakes the
+    event loop, so a burst of updates costs a single wake-up. After each
+    wake-up the stream waits ``interval`` seconds before reading the job
+    again, which caps events at one snapshot per interval no matter how
+    often the job changes.
+
+    Events, as ``(name, data)``:
+      table     a table finished (migrated / synced / verified)
+      error     a new error was recorded on the job
+      progress  status snapshot (the same payload as the status endpoint)
+      ping      nothing changed for ``heartbeat`` seconds
+      end       the job reached a terminal status; the stream closes
+    """
+
+    def __init__(
+        self,
+        job_manager,
+        job_id: str,
+        snapshot: Callable[[MigrationJob], Dict[str, Any]],
+        interval: float = 0.5,
+        heartbeat: float = 15.0,
+    ):
+        self.job_manager = job_manager
+        self.job_id = job_id
+        self.snapshot = snapshot
+        self.interval = interval
+        self.heartbeat = heartbeat
+
+    async def events(self) -> AsyncIterator[Event]:
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        pending = threading.Event()
+
+        def notify():
+            if pending.is_set():
+                return
+            pending.set()
+            try:
+                loop.call_soon_threadsafe(changed.set)
+            except RuntimeError:
+                # El loop ya se cerró (cliente desconectado)
+                pass
+
+        unsubscribe = self.job_manager.subscribe(self.job_id, notify)
+        tables_sent = 0
+        errors_sent = 0
+
+        try:
+            while True:
+                pending.clear()
+                changed.clear()
+                job = self.job_manager.get(self.job_id)
+
+                tables = list(job.completed_tables)
+                for table in tables[tables_sent:]:
+                    yield "table", {"job_id": job.job_id, "table": table, **job.table_metrics.get(table, {})}
+                tables_sent = len(tables)
+
+                # La lista está acotada: se cuenta con los descartados para no perder nuevos
+                errors = list(job.errors)
+                total_errors = len(errors) + job.errors_dropped
+                new_errors = min(total_errors - errors_sent, len(errors))
+                for error in errors[len(errors) - new_errors:]:
+                    yield "error", {"job_id": job.job_id, "error": error}
+                errors_sent = total_errors
+
+                yield "progress", self.snapshot(job)
+
+                if job.status in TERMINAL_STATUSES:
+                    yield "end", {"job_id": job.job_id, "status": job.status.value}
+                    return
+
+                while True:
+                    try:
+                        await asyncio.wait_for(changed.wait(), timeout=self.heartbeat)
+                        break
+                    except asyncio.TimeoutError:
+                        yield "ping", {}
+
+                # Coalesce: lo que llegue durante el intervalo sale en un solo snapshot
+                await asyncio.sleep(self.interval)
+        finally:
+            unsubscribe()
@@ -1,19 +1,166 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from src.application.jobs.job_store import InMemoryJobStore, JobStore
 from src.domain.models import MigrationJob
-from typing import Dict
+from typing import Callable, Dict, List, Optional, Tuple
 
 
 class JobManager:
+    """
+    Live jobs in memory, backed by a pluggable JobStore.
+
+    Runners call ``update`` after every batch; the store only gets a
+    snapshot when the status changes or ``persist_interval`` seconds have
+    passed since the job's last save, so the hot loop does not pay a write
+    per batch. Finished jobs stay in memory in LRU order and are evicted
+    after ``finished_ttl_seconds`` or beyond ``max_finished_jobs``; a
+    durable store can still serve them afterwards, until its own TTL purge.
+    Jobs a durable store holds as PENDING/RUNNING at startup were cut off
+    by a restart: they are marked FAILED so they can be resumed.
+    """
+
+    def __init__(
+        self,
+        store: Optional[JobStore] = None,
+        persist_interval: float = 2.0,
+        finished_ttl_seconds: float = 24 * 3600,
+        max_finished_jobs: int = 500,
+    ):
+        self.store = store or InMemoryJobStore()
+        self.persist_interval = persist_interval
+        self.finished_ttl_seconds = finished_ttl_seconds
+        self.max_finished_jobs = max_finished_jobs
 
-    def __init__(self):
-        self.jobs: Dict[str, MigrationJob] = {}
+        self.jobs: "OrderedDict[str, MigrationJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._listeners: Dict[str, List[Callable[[], None]]] = {}
+        # job_id -> (estado guardado, instante del último guardado)
+        self._persisted: Dict[str, Tuple[str, float]] = {}
+        self._last_purge = 0.0
 
-    def create_job(self, job: MigrationJob):
-        self.jobs[job.job_id] = job
+        self._restore()
 
-    def get_job(self, job_id: str) -> MigrationJob:
-        if job_id not in self.jobs:
+    def create(self, job: MigrationJob):
+        with self._lock:
+            self.jobs[job.job_id] = job
+        self._persist(job, force=True)
+
+    def get(self, job_id: str) -> MigrationJob:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is not None:
+                self.jobs.move_to_end(job_id)
+                return job
+
+        # Desalojado de memoria (o de antes de un reinicio): del store
+        job = self.store.load(job_id)
+        if job is None:
             raise ValueError(f"Job {job_id} not found")
-        return self.jobs[job_id]
 
-    def update_job(self, job: MigrationJob):
-        self.jobs[job.job_id] = job
+        with self._lock:
+            job = self.jobs.setdefault(job_id, job)
+        return job
+
+    def list(self) -> List[MigrationJob]:
+        with self._lock:
+            return list(self.jobs.values())
+
+    def update(self, job: MigrationJob):
+        with self._lock:
+            self.jobs[job.job_id] = job
+            listeners = list(self._listeners.get(job.job_id, ()))
+
+        # Fuera del lock: los listeners solo deben marcar un cambio, nunca bloquear
+        for listener in listeners:
+            listener()
+
+        # Un job terminado recibe pocas actualizaciones y todas son su estado final
+        self._persist(job, force=job.is_finished)
+        if job.is_finished:
+            self._evict()
+
+    def flush(self) -> None:
+        """Saves every in-memory job now (e.g. on shutdown)."""
+        for job in self.list():
+            self._persist(job, force=True)
+
+    # ---------------------------
+    # Change notifications
+    # ---------------------------
+    def subscribe(self, job_id: str, listener: Callable[[], None]) -> Callable[[], None]:
+        """Calls ``listener()`` after every update of the job; returns the unsubscribe function."""
+        self.get(job_id)
+        with self._lock:
+            self._listeners.setdefault(job_id, []).append(listener)
+
+        def unsubscribe():
+            with self._lock:
+                listeners = self._listeners.get(job_id, [])
+                if listener in listeners:
+                    listeners.remove(listener)
+                if not listeners:
+                    self._listeners.pop(job_id, None)
+
+        return unsubscribe
+
+    # ---------------------------
+    # Persistence / retention
+    # ---------------------------
+    def _restore(self) -> None:
+        for job in self.store.load_all():
+            if not job.is_finished:
+                job.mark_failed("Interrupted by a service restart")
+                self.store.save(job)
+            self.jobs[job.job_id] = job
+        self._evict()
+
+    def _persist(self, job: MigrationJob, force: bool = False) -> None:
+        now = time.monotonic()
+        status = job.status.value
+
+        with self._lock:
+            last = self._persisted.get(job.job_id)
+            if (
+                not force
+                and last is not None
+                and last[0] == status
+                and now - last[1] < self.persist_interval
+            ):
+                return
+            self._persisted[job.job_id] = (status, now)
+
+        self.store.save(job)
+
+    def _evict(self) -> None:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.finished_ttl_seconds)
+
+        with self._lock:
+            finished = [
+                job_id for job_id, job in self.jobs.items()
+                if job.is_finished and job_id not in self._listeners
+            ]
+            # El OrderedDict va de menos a más recientemente usado
+            excess = len(finished) - self.max_finished_jobs
+            stale = []
+            for job_id in finished:
+                job = self.jobs[job_id]
+                if excess > 0 or job.updated_at < cutoff:
+                    del self.jobs[job_id]
+                    last = self._persisted.pop(job_id, None)
+                    if last is None or last[0] != job.status.value:
+                        stale.append(job)
+                    excess -= 1
+
+            purge = time.monotonic() - self._last_purge > 60
+            if purge:
+                self._last_purge = time.monotonic()
+
+        # Lo que sale de memoria debe quedar en el store con su estado final
+        for job in stale:
+            self.store.save(job)
+
+        if purge:
+            self.store.purge(cutoff)
@@ -0,0 +1,142 @@
+import heapq
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+
+class _QueuedJob:
+    __slots__ = ("job_id", "run", "priority", "seq", "target", "source")
+
+    def __init__(self, job_id: str, run: Callable[[], None], priority: int, seq: int, target: str, source: str):
+        self.job_id = job_id
+        self.run = run
+        self.priority = priority
+        self.seq = seq
+        self.target = target
+        self.source = source
+
+    def __lt__(self, other: "_QueuedJob") -> bool:
+        # Mayor prioridad primero; a igual prioridad, orden de llegada
+        return (-self.priority, self.seq) < (-other.priority, other.seq)
+
+
+class JobScheduler:
+    """
+    Fixed pool of job workers with admission control.
+
+    Submitted jobs wait in a priority queue (higher ``priority`` first,
+    FIFO within a priority) and start when a worker is free and neither
+    their target database nor their source file already has its maximum
+    number of running jobs. A queued job that is blocked by those limits
+    does not hold back jobs behind it that could run. Submitting only
+    pushes to the queue, so a burst of requests returns immediately.
+    """
+
+    def __init__(self, max_workers: int = 4, max_per_target: int = 2, max_per_source: int = 2):
+        if min(max_workers, max_per_target, max_per_source) < 1:
+            raise ValueError("Scheduler limits must be at least 1")
+
+        self.max_workers = max_workers
+        self.max_per_target = max_per_target
+        self.max_per_source = max_per_source
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._queue: List[_QueuedJob] = []
+        self._queued: Dict[str, _QueuedJob] = {}
+        self._running: Dict[str, _QueuedJob] = {}
+        self._per_target: Dict[str, int] = {}
+        self._per_source: Dict[str, int] = {}
+        self._seq = itertools.count()
+
+    # ---------------------------
+    # Submit / cancel
+    # ---------------------------
+    def submit(self, job_id: str, run: Callable[[], None], priority: int = 0, target: str = "", source: str = "") -> None:
+        with self._lock:
+            if job_id in self._queued or job_id in self._running:
+                raise ValueError(f"Job {job_id} is already scheduled")
+            entry = _QueuedJob(job_id, run, priority, next(self._seq), target, source)
+            heapq.heappush(self._queue, entry)
+            self._queued[job_id] = entry
+        self._dispatch()
+
+    def cancel(self, job_id: str) -> bool:
+        """Drops a queued job; False if it is not queued (running or unknown)."""
+        with self._lock:
+            entry = self._queued.pop(job_id, None)
+            if entry is None:
+                return False
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+            return True
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based place in the queue, or None if the job is not queued."""
+        with self._lock:
+            entry = self._queued.get(job_id)
+            if entry is None:
+                return None
+            return 1 + sum(1 for other in self._queue if other < entry)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "running": len(self._running),
+                "queued": len(self._queued),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    # ---------------------------
+    # Internal
+    # ---------------------------
+    def _dispatch(self) -> None:
+        with self._lock:
+            started = []
+            skipped = []
+            while self._queue and len(self._running) < self.max_workers:
+                entry = heapq.heappop(self._queue)
+                if not self._admissible(entry):
+                    skipped.append(entry)
+                    continue
+
+                del self._queued[entry.job_id]
+                self._running[entry.job_id] = entry
+                self._per_target[entry.target] = self._per_target.get(entry.target, 0) + 1
+                self._per_source[entry.source] = self._per_source.get(entry.source, 0) + 1
+                started.append(entry)
+
+            for entry in skipped:
+                heapq.heappush(self._queue, entry)
+
+        for entry in started:
+            self._executor.submit(self._run, entry)
+
+    def _admissible(self, entry: _QueuedJob) -> bool:
+        return (
+            self._per_target.get(entry.target, 0) < self.max_per_target
+            and self._per_source.get(entry.source, 0) < self.max_per_source
+        )
+
+    def _run(self, entry: _QueuedJob) -> None:
+        try:
+            entry.run()
+        finally:
+            with self._lock:
+                del self._running[entry.job_id]
+                self._release(self._per_target, entry.target)
+                self._release(self._per_source, entry.source)
+            self._dispatch()
+
+    @staticmethod
+    def _release(counts: Dict[str, int], key: str) -> None:
+        counts[key] -= 1
+        if counts[key] == 0:
+            del counts[key]
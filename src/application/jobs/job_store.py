@@ -0,0 +1,138 @@
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+
+from src.domain.models import MigrationJob
+
+
+class JobStore(ABC):
+    """
+    Persistence behind JobManager.
+
+    JobManager keeps the live job objects in memory (runners mutate them in
+    place); the store only receives snapshots to keep and is asked for jobs
+    that are no longer, or not yet, in memory.
+    """
+
+    @abstractmethod
+    def save(self, job: MigrationJob) -> None:
+        ...
+
+    @abstractmethod
+    def load(self, job_id: str) -> Optional[MigrationJob]:
+        ...
+
+    @abstractmethod
+    def load_all(self) -> List[MigrationJob]:
+        ...
+
+    @abstractmethod
+    def purge(self, finished_before: datetime) -> int:
+        """Deletes finished jobs last updated before ``finished_before``."""
+
+    def close(self) -> None:
+        pass
+
+
+class InMemoryJobStore(JobStore):
+    """No persistence: jobs live only as long as JobManager keeps them."""
+
+    def save(self, job: MigrationJob) -> None:
+        pass
+
+    def load(self, job_id: str) -> Optional[MigrationJob]:
+        return None
+
+    def load_all(self) -> List[MigrationJob]:
+        return []
+
+    def purge(self, finished_before: datetime) -> int:
+        return 0
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Jobs as JSON rows in a local SQLite file, so they survive restarts.
+
+    One connection in WAL mode, serialised by a lock; writes are already
+    throttled by JobManager, so contention stays low.
+
+    Snapshots hold each job's request with the postgres_url password
+    redacted, so a job restored after a restart needs its URL supplied
+    again to resume. The file (and the WAL/SHM files SQLite derives from
+    it) is still readable only by its owner: requests carry paths and
+    hostnames.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        # 0600 antes de que SQLite lo abra: sus ficheros -wal/-shm copian estos permisos
+        os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+        os.chmod(path, 0o600)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id     TEXT PRIMARY KEY,
+                status     TEXT NOT NULL,
+                finished   INTEGER NOT NULL,
+                updated_at TEXT NOT NULL,
+                data       TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def save(self, job: MigrationJob) -> None:
+        data = job.snapshot_json()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, status, finished, updated_at, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job.job_id, job.status.value, int(job.is_finished), job.updated_at.isoformat(), data),
+            )
+            self._conn.commit()
+
+    def load(self, job_id: str) -> Optional[MigrationJob]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return MigrationJob.model_validate_json(row[0]) if row else None
+
+    def load_all(self) -> List[MigrationJob]:
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM jobs ORDER BY updated_at").fetchall()
+        return [MigrationJob.model_validate_json(row[0]) for row in rows]
+
+    def purge(self, finished_before: datetime) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE finished = 1 AND updated_at < ?",
+                (finished_before.isoformat(),),
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def job_store_from_url(url: Optional[str]) -> JobStore:
+    """``memory`` (default) or ``sqlite:///path/to/jobs.db``."""
+    if not url or url == "memory":
+        return InMemoryJobStore()
+    if url.startswith("sqlite:///"):
+        return SQLiteJobStore(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported job store URL: {url}")
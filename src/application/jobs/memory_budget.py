@@ -0,0 +1,108 @@
+import os
+import threading
+from typing import Callable, Optional
+
+
+DEFAULT_GLOBAL_LIMIT = 1024 * 1024 * 1024
+_WAIT_SLICE = 0.1
+
+
+class MemoryBudget:
+    """
+    Byte semaphore bounding the batches held in memory.
+
+    A job budget is created with the process-wide budget as ``parent`` so a
+    reservation counts against both. A single reservation larger than the
+    whole capacity is still granted once nothing else is reserved, so an
+    oversized batch slows the job down instead of deadlocking it.
+    """
+
+    def __init__(self, capacity: int, parent: Optional["MemoryBudget"] = None):
+        if capacity <= 0:
+            raise ValueError("Memory budget capacity must be positive")
+
+        self.capacity = capacity
+        self.parent = parent
+        self.used = 0
+        self.peak = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, nbytes: int, abort: Optional[Callable[[], bool]] = None) -> bool:
+        """Blocks until ``nbytes`` fit; returns False (nothing reserved) if ``abort`` fires."""
+        with self._cond:
+            while self.used and self.used + nbytes > self.capacity:
+                if abort is not None and abort():
+                    return False
+                self._cond.wait(timeout=_WAIT_SLICE)
+            self.used += nbytes
+            self.peak = max(self.peak, self.used)
+
+        if self.parent is not None and not self.parent.acquire(nbytes, abort):
+            self._release_local(nbytes)
+            return False
+        return True
+
+    def release(self, nbytes: int) -> None:
+        if self.parent is not None:
+            self.parent.release(nbytes)
+        self._release_local(nbytes)
+
+    def _release_local(self, nbytes: int) -> None:
+        with self._cond:
+            self.used = max(0, self.used - nbytes)
+            self._cond.notify_all()
+
+    def lease(self) -> "BudgetLease":
+        return BudgetLease(self)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "used": self.used,
+                "peak": self.peak,
+            }
+
+
+class BudgetLease:
+    """
+    Reservations made by one stream. ``close`` returns whatever is still
+    reserved (e.g. batches dropped from a pipeline on cancellation) and
+    unblocks a pending ``acquire`` so the stream's reader can exit.
+    """
+
+    def __init__(self, budget: MemoryBudget):
+        self.budget = budget
+        self.outstanding = 0
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def acquire(self, nbytes: int, abort: Optional[Callable[[], bool]] = None) -> bool:
+        """False (nothing reserved) if the lease is closed or ``abort`` fires while waiting."""
+        if not self.budget.acquire(nbytes, abort=lambda: self.closed or (abort is not None and abort())):
+            return False
+        with self._lock:
+            if self.closed:
+                self.budget.release(nbytes)
+                return False
+            self.outstanding += nbytes
+        return True
+
+    def release(self, nbytes: int) -> None:
+        with self._lock:
+            nbytes = min(nbytes, self.outstanding)
+            self.outstanding -= nbytes
+        self.budget.release(nbytes)
+
+    def close(self) -> None:
+        with self._lock:
+            self.closed = True
+            nbytes, self.outstanding = self.outstanding, 0
+        if nbytes:
+            self.budget.release(nbytes)
+
+
+# Techo global compartido por todos los jobs del proceso
+global_memory_budget = MemoryBudget(
+    int(os.environ.get("MIGRATOR_MEMORY_LIMIT_BYTES", DEFAULT_GLOBAL_LIMIT))
+)
@@ -0,0 +1,249 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+
+_END = object()
+_PUT_TIMEOUT = 0.05
+
+
+class _StageFailure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class BatchPipeline:
+    """
+    Read → (convert) → write pipeline joined by bounded queues.
+
+    The reader (and the optional converter) run on their own threads while
+    the caller consumes batches as the writer stage. ``depth`` bounds how
+    many batches each queue holds, so memory is capped at roughly
+    ``depth`` batches per stage. ``depth=0`` keeps the old lockstep loop on
+    the calling thread.
+
+    ``timings`` accumulates seconds per stage:
+
+    - ``read`` / ``convert`` / ``write``: time spent doing the work.
+    - ``read_blocked`` / ``convert_blocked``: stage waiting for queue space
+      (a later stage is the bottleneck).
+    - ``write_starved``: writer waiting for a batch (reader is the bottleneck).
+
+    ``observe(stage, seconds)``, when given, is also called for every batch
+    and stage so callers can keep per-batch latency distributions.
+
+    ``discard(batch)``, when given, is called for every batch a stage had
+    produced but the consumer never received (cancellation, error), so
+    resources held per batch can be given back. A source that blocks on
+    something other than the queues should poll ``stopped()`` to exit.
+    """
+
+    def __init__(
+        self,
+        source: Iterable[List],
+        convert: Optional[Callable[[List], List]] = None,
+        depth: int = 4,
+        should_stop: Optional[Callable[[], bool]] = None,
+        observe: Optional[Callable[[str, float], None]] = None,
+        discard: Optional[Callable[[List], None]] = None,
+    ):
+        self.source = source
+        self.convert = convert
+        self.depth = depth
+        self.should_stop = should_stop or (lambda: False)
+        self.observe = observe
+        self.discard = discard
+
+        self.timings: Dict[str, float] = {
+            "read": 0.0,
+            "convert": 0.0,
+            "write": 0.0,
+            "read_blocked": 0.0,
+            "convert_blocked": 0.0,
+            "write_starved": 0.0,
+        }
+        self._stop = threading.Event()
+
+    def __iter__(self) -> Iterator[List]:
+        if self.depth <= 0:
+            return self._inline()
+        return self._threaded()
+
+    # ---------------------------
+    # Lockstep (no threads)
+    # ---------------------------
+    def _inline(self) -> Iterator[List]:
+        source = iter(self.source)
+        try:
+            while not self.should_stop():
+                started = time.perf_counter()
+                batch = next(source, _END)
+                if batch is _END:
+                    self.timings["read"] += time.perf_counter() - started
+                    return
+                self._timed("read", started)
+
+                if self.convert is not None:
+                    started = time.perf_counter()
+                    batch = self.convert(batch)
+                    self._timed("convert", started)
+
+                started = time.perf_counter()
+                yield batch
+                self._timed("write", started)
+        finally:
+            self._close_source(source)
+
+    # ---------------------------
+    # Threaded stages
+    # ---------------------------
+    def _threaded(self) -> Iterator[List]:
+        read_queue: queue.Queue = queue.Queue(maxsize=self.depth)
+        queues = [read_queue]
+        threads = [
+            threading.Thread(
+                target=self._read_stage,
+                args=(read_queue,),
+                name="pipeline-read",
+                daemon=True,
+            )
+        ]
+
+        out_queue = read_queue
+        if self.convert is not None:
+            out_queue = queue.Queue(maxsize=self.depth)
+            queues.append(out_queue)
+            threads.append(
+                threading.Thread(
+                    target=self._convert_stage,
+                    args=(read_queue, out_queue),
+                    name="pipeline-convert",
+                    daemon=True,
+                )
+            )
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                if self.should_stop():
+                    return
+
+                started = time.perf_counter()
+                try:
+                    item = out_queue.get(timeout=_PUT_TIMEOUT)
+                except queue.Empty:
+                    continue
+                finally:
+                    self.timings["write_starved"] += time.perf_counter() - started
+
+                if item is _END:
+                    return
+                if isinstance(item, _StageFailure):
+                    raise item.error
+
+                started = time.perf_counter()
+                yield item
+                self._timed("write", started)
+        finally:
+            # Cancelación / error: los productores salen al ver _stop; una vez
+            # parados, lo que quedó en las colas ya no lo consumirá nadie
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            for q in queues:
+                self._drain(q)
+
+    def _read_stage(self, out_queue: queue.Queue) -> None:
+        source = iter(self.source)
+        try:
+            while not self.stopped():
+                started = time.perf_counter()
+                batch = next(source, _END)
+                if batch is _END:
+                    self.timings["read"] += time.perf_counter() - started
+                else:
+                    self._timed("read", started)
+
+                if not self._put(out_queue, batch, "read_blocked"):
+                    self._discard(batch)
+                    return
+                if batch is _END:
+                    return
+        except BaseException as e:
+            self._put(out_queue, _StageFailure(e), "read_blocked")
+        finally:
+            self._close_source(source)
+
+    def _convert_stage(self, in_queue: queue.Queue, out_queue: queue.Queue) -> None:
+        try:
+            while not self.stopped():
+                try:
+                    item = in_queue.get(timeout=_PUT_TIMEOUT)
+                except queue.Empty:
+                    continue
+
+                if item is not _END and not isinstance(item, _StageFailure):
+                    started = time.perf_counter()
+                    try:
+                        item = self.convert(item)
+                    except BaseException:
+                        self._discard(item)
+                        raise
+                    self._timed("convert", started)
+
+                if not self._put(out_queue, item, "convert_blocked"):
+                    self._discard(item)
+                    return
+                if item is _END:
+                    return
+                if isinstance(item, _StageFailure):
+                    return
+        except BaseException as e:
+            self._put(out_queue, _StageFailure(e), "convert_blocked")
+
+    # ---------------------------
+    # Helpers
+    # ---------------------------
+    def _timed(self, stage: str, started: float) -> None:
+        seconds = time.perf_counter() - started
+        self.timings[stage] += seconds
+        if self.observe is not None:
+            self.observe(stage, seconds)
+
+    def stopped(self) -> bool:
+        """True once the consumer is gone or ``should_stop`` fired."""
+        return self._stop.is_set() or self.should_stop()
+
+    def _put(self, q: queue.Queue, item, blocked_key: str) -> bool:
+        started = time.perf_counter()
+        try:
+            while True:
+                if self._stop.is_set():
+                    return False
+                try:
+                    q.put(item, timeout=_PUT_TIMEOUT)
+                    return True
+                except queue.Full:
+                    continue
+        finally:
+            self.timings[blocked_key] += time.perf_counter() - started
+
+    def _drain(self, q: queue.Queue) -> None:
+        while True:
+            try:
+                self._discard(q.get_nowait())
+            except queue.Empty:
+                return
+
+    def _discard(self, item) -> None:
+        if self.discard is not None and item is not _END and not isinstance(item, _StageFailure):
+            self.discard(item)
+
+    @staticmethod
+    def _close_source(source) -> None:
+        close = getattr(source, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,71 @@
+from typing import List, Tuple
+
+
+SAMPLE_ROWS = 16
+
+
+def sample_batch_bytes(rows: List[Tuple]) -> int:
+    """
+    Approximate payload size of a batch from a few evenly spaced rows, so
+    the cost stays constant no matter how many rows the batch holds.
+    """
+    if not rows:
+        return 0
+
+    step = max(1, len(rows) // SAMPLE_ROWS)
+    sampled = rows[::step]
+
+    total = 0
+    for row in sampled:
+        for value in row:
+            if isinstance(value, (str, bytes, bytearray, memoryview)):
+                total += len(value)
+            else:
+                total += 8
+
+    return total * len(rows) // len(sampled)
+
+
+class AdaptiveBatchSizer:
+    """
+    Picks the row count of the next fetch from what the previous batches
+    looked like.
+
+    Two targets are combined: a byte budget per batch (wide TEXT/BLOB rows
+    get fewer rows) and a write latency per batch (a slow target gets
+    smaller batches, a fast one larger). Growth is limited to doubling per
+    step so one cheap batch cannot blow the size up.
+    """
+
+    def __init__(
+        self,
+        initial_rows: int = 1000,
+        target_bytes: int = 8 * 1024 * 1024,
+        target_seconds: float = 0.5,
+        min_rows: int = 10,
+        max_rows: int = 100_000,
+    ):
+        self.target_bytes = target_bytes
+        self.target_seconds = target_seconds
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.rows = self._clamp(initial_rows)
+
+    def next_size(self) -> int:
+        return self.rows
+
+    def observe(self, rows: int, nbytes: int, write_seconds: float) -> None:
+        if rows <= 0:
+            return
+
+        candidates = [self.rows * 2]
+
+        if nbytes > 0:
+            candidates.append(int(self.target_bytes * rows / nbytes))
+        if write_seconds > 0:
+            candidates.append(int(self.target_seconds * rows / write_seconds))
+
+        self.rows = self._clamp(min(candidates))
+
+    def _clamp(self, rows: int) -> int:
+        return max(self.min_rows, min(self.max_rows, rows))
@@ -0,0 +1,276 @@
+import os
+from typing import Dict, List, Tuple
+
+from src.application.migration.table_scheduler import TableScheduler
+from src.application.schema.catalog_cache import catalog_cache
+from src.application.schema.type_converter import TypeConverter
+from src.application.schema.value_converter import BatchConverter
+from src.domain.models import JobStatus
+
+from src.infrastructure.adapters.sqlite_change_capture import SQLiteChangeCapture
+from src.infrastructure.adapters.sqlite_reader import SQLiteReader
+from src.infrastructure.adapters.postgres_writer import PostgreSQLWriter
+from src.infrastructure.adapters.watermark_store import (
+    PostgresWatermarkStore,
+    changes_scope,
+)
+
+
+class DeltaSyncRunner:
+    """
+    Replays changes written to the SQLite source since the previous pass.
+
+    Two modes:
+      * watermarks: rows whose watermark column (rowid / integer PK by
+        default, or e.g. ``updated_at``) is at or above the stored
+        watermark are upserted; rows sharing the watermark value are
+        replayed so later writes with the same timestamp are not lost.
+        Cheap, but deletes are not seen and rowid watermarks only see
+        inserts.
+      * change capture: triggers log every insert/update/delete key into a
+        side table of the SQLite file; each pass applies the net change per
+        key (upsert current row / delete). Each table keeps its own log
+        position, so a pass over some tables leaves the others' changes
+        pending.
+
+    Every table is applied in one transaction together with its watermark,
+    so an interrupted pass is simply repeated. Tables go in foreign key
+    order (parents' upserts first, children's deletes first), so the
+    target's foreign keys hold after every transaction. The intended
+    cutover flow is ``baseline`` pass → full migration → sync passes until
+    the lag is small.
+    """
+
+    def __init__(self, job_manager):
+        self.job_manager = job_manager
+        self.watermarks = PostgresWatermarkStore()
+        self._postgres_schemas = {}
+
+    # =====================================================
+    # PUBLIC – RUN SYNC PASS
+    # =====================================================
+    def run(self, job_id: str, req) -> None:
+        job = self.job_manager.get(job_id)
+
+        reader = SQLiteReader(req.sqlite_path, pool_size=2)
+        writer = PostgreSQLWriter(req.postgres_url, pool_size=1, schema=req.postgres_schema)
+        source = os.path.realpath(req.sqlite_path)
+
+        try:
+            sqlite_schemas = catalog_cache.sqlite_schemas(reader)
+            self._postgres_schemas = catalog_cache.postgres_schemas(writer)
+            tables = self._dependency_order(reader, self._select_tables(req, sqlite_schemas))
+
+            with writer.session() as session:
+                with session.cursor() as cursor:
+                    self.watermarks.ensure_table(cursor)
+
+            job.start_load()
+
+            if req.capture_changes:
+                self._sync_changes(job, req, reader, writer, source, tables, sqlite_schemas)
+            else:
+                for table in tables:
+                    if job.is_stopped:
+                        break
+                    self._sync_table(job, req, reader, writer, source, table, sqlite_schemas[table])
+                    job.record_table_done(table)
+
+            if job.status == JobStatus.CANCELLED:
+                return
+
+            job.mark_completed()
+            self.job_manager.update(job)
+
+        except Exception as e:
+            job.mark_failed(str(e))
+            self.job_manager.update(job)
+
+        finally:
+            job.connection_stats = {
+                "sqlite": reader.pool.stats(),
+                "postgres": writer.pool.stats(),
+            }
+            self.job_manager.update(job)
+            reader.close()
+            writer.close()
+
+    # =====================================================
+    # INTERNAL – TABLE SELECTION
+    # =====================================================
+    def _select_tables(self, req, sqlite_schemas) -> List[str]:
+        if not req.tables:
+            return list(sqlite_schemas)
+
+        unknown = [t for t in req.tables if t not in sqlite_schemas]
+        if unknown:
+            raise ValueError(f"Unknown tables: {', '.join(unknown)}")
+        return list(req.tables)
+
+    # =====================================================
+    # INTERNAL – WATERMARK MODE
+    # =====================================================
+    def _sync_table(self, job, req, reader, writer, source: str, table: str, schema):
+        column = req.watermark_columns.get(table) or reader.get_key_column(table)
+        if column is None:
+            raise ValueError(
+                f"Table '{table}' has no rowid/integer key; "
+                f"set watermark_columns['{table}']"
+            )
+
+        if req.baseline:
+            self._save_watermark(writer, source, table, column, reader.get_max_value(table, column))
+            return
+
+        pk_columns = self._primary_key(reader, table)
+        columns = [c["name"] for c in schema]
+        convert = self._batch_converter(table, schema)
+
+        with writer.session() as session:
+            with session.cursor() as cursor:
+                after = self.watermarks.get(cursor, source, table)
+
+            state = {"last": after}
+
+            def batches():
+                for last, rows in reader.read_rows_since(table, column, after, req.batch_size):
+                    if job.is_stopped:
+                        return
+                    # Se actualiza antes de entregar el lote: COPY consume todo
+                    # lo entregado antes de que la sesión haga commit
+                    state["last"] = last
+                    self._update_progress(job, len(rows))
+                    yield convert(rows)
+
+            session.upsert_rows(table, columns, pk_columns, batches())
+
+            if state["last"] is not None and state["last"] != after:
+                with session.cursor() as cursor:
+                    self.watermarks.save(cursor, source, table, column, state["last"])
+
+    # =====================================================
+    # INTERNAL – CHANGE CAPTURE MODE
+    # =====================================================
+    def _sync_changes(self, job, req, reader, writer, source: str, tables, sqlite_schemas):
+        capture = SQLiteChangeCapture(reader)
+
+        # Idempotente: instala los triggers que falten
+        for table in tables:
+            capture.install(table, self._primary_key(reader, table))
+
+        with writer.session() as session:
+            with session.cursor() as cursor:
+                after = {
+                    table: self.watermarks.get(cursor, source, changes_scope(table)) or 0
+                    for table in tables
+                }
+
+        # Tras podar el log MAX(seq) puede quedar por debajo de los watermarks
+        upto = max([capture.max_seq(), *after.values()])
+
+        if req.baseline:
+            self._save_change_positions(writer, source, tables, upto)
+            return
+
+        # Solo las tablas de este pase: las demás conservan sus cambios pendientes
+        changes = capture.pending_changes(after, upto)
+        job.set_total_rows(sum(len(keys) for keys in changes.values()), exact=True)
+        self.job_manager.update(job)
+
+        # Altas/cambios de padres a hijos; bajas de hijos a padres
+        order = [t for t in tables if t in changes]
+        deletes = {}
+        for table in order:
+            if job.is_stopped:
+                return
+            deletes[table] = self._apply_upserts(job, reader, writer, table, sqlite_schemas[table], changes[table])
+
+        for table in reversed(order):
+            if job.is_stopped:
+                return
+            self._apply_deletes(job, reader, writer, table, changes[table], deletes[table])
+            job.record_table_done(table)
+
+        # Las tablas ya aplicadas se repiten sin daño si esto no llega a guardarse
+        self._save_change_positions(writer, source, tables, upto)
+        if req.prune_changes:
+            capture.prune(upto, tables)
+
+    def _apply_upserts(self, job, reader, writer, table: str, schema, ops: Dict[Tuple, str]) -> List[Tuple]:
+        """Upserts the table's changed rows; returns the keys to delete."""
+        pk_columns = self._primary_key(reader, table)
+        columns = [c["name"] for c in schema]
+        key_index = [columns.index(c) for c in pk_columns]
+        convert = self._batch_converter(table, schema)
+
+        upserts = [key for key, op in ops.items() if op == "U"]
+        deletes = [key for key, op in ops.items() if op == "D"]
+        found = set()
+
+        def batches():
+            for rows in reader.read_rows_by_keys(table, pk_columns, upserts):
+                found.update(tuple(row[i] for i in key_index) for row in rows)
+                yield convert(rows)
+
+        if upserts:
+            with writer.session() as session:
+                session.upsert_rows(table, columns, pk_columns, batches())
+
+        # Filas borradas después de su último cambio registrado
+        deletes.extend(key for key in upserts if key not in found)
+        return deletes
+
+    def _apply_deletes(self, job, reader, writer, table: str, ops: Dict[Tuple, str], deletes: List[Tuple]):
+        if deletes:
+            with writer.session() as session:
+                session.delete_keys(table, self._primary_key(reader, table), deletes)
+
+        self._update_progress(job, len(ops))
+
+    # =====================================================
+    # INTERNAL – HELPERS
+    # =====================================================
+    def _dependency_order(self, reader, tables: List[str]) -> List[str]:
+        """Referenced tables before the tables that reference them (cycles broken as in a migration)."""
+        foreign_keys = catalog_cache.sqlite_foreign_keys(reader)
+        scheduler = TableScheduler(
+            tables=tables,
+            sizes={},
+            dependencies={t: {fk["table"] for fk in foreign_keys.get(t, [])} for t in tables},
+        )
+        order = []
+        while scheduler.has_work():
+            for table in scheduler.take_ready(1):
+                scheduler.mark_done(table)
+                order.append(table)
+        return order
+
+    def _primary_key(self, reader, table: str) -> List[str]:
+        pk_columns = reader.get_primary_key(table)
+        if not pk_columns:
+            raise ValueError(f"Table '{table}' has no primary key; delta sync needs one")
+        return pk_columns
+
+    def _batch_converter(self, table: str, schema) -> BatchConverter:
+        pg_types = {c["name"]: c["type"] for c in self._postgres_schemas.get(table, [])}
+        return BatchConverter([
+            pg_types.get(c["name"]) or TypeConverter.sqlite_to_postgres(c["type"])
+            for c in schema
+        ])
+
+    def _save_watermark(self, writer, source: str, table: str, column, value):
+        if value is None:
+            return
+        with writer.session() as session:
+            with session.cursor() as cursor:
+                self.watermarks.save(cursor, source, table, column, value)
+
+    def _save_change_positions(self, writer, source: str, tables: List[str], upto: int):
+        with writer.session() as session:
+            with session.cursor() as cursor:
+                for table in tables:
+                    self.watermarks.save(cursor, source, changes_scope(table), None, upto)
+
+    def _update_progress(self, job, rows: int):
+        job.record_progress(rows)
+        self.job_manager.update(job)
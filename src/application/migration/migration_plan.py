@@ -0,0 +1,423 @@
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from src.application.migration.batch_sizer import sample_batch_bytes
+from src.application.migration.post_load import compile_post_load
+from src.application.migration.row_estimator import RowEstimator
+from src.application.migration.sql_builder import SQLBuilder
+from src.application.migration.table_scheduler import TableScheduler
+from src.application.schema.catalog_cache import catalog_cache
+from src.application.schema.type_converter import TypeConverter
+from src.application.schema.value_converter import BatchConverter
+from src.domain.models import LoadMode
+from src.infrastructure.adapters.large_value import LargeColumns
+from src.infrastructure.adapters.postgres_writer import build_copy_sql, build_insert_sql
+
+
+COPY_FORMATS = {
+    LoadMode.COPY_CSV: "csv",
+    LoadMode.COPY_BINARY: "binary",
+}
+
+SIZE_SAMPLE_ROWS = 200
+# Una columna se trata como ancha si la muestra ya roza esta fracción del umbral
+LARGE_SAMPLE_FRACTION = 8
+PROBE_TABLE = "_migration_plan_probe"
+
+
+class TablePlan:
+    """Everything the run needs for one table, derived once from the catalogs."""
+
+    def __init__(
+        self,
+        table: str,
+        sqlite_schema: List[Dict],
+        postgres_schema: List[Dict],
+        column_types: List[str],
+        create_sql: str,
+        fast_create_sql: str,
+        add_primary_key_sql: str,
+        set_logged_sql: str,
+        insert_sql: str,
+        copy_sql: Optional[str],
+        converter: Optional[BatchConverter],
+        key_column: Optional[str],
+        estimated_rows: int,
+        estimated_bytes: int,
+        dependencies: Set[str],
+        large_columns: Optional[LargeColumns] = None,
+        post_load: Optional[List[Dict[str, Any]]] = None,
+    ):
+        self.table = table
+        self.sqlite_schema = sqlite_schema
+        self.postgres_schema = postgres_schema
+        self.columns = [c["name"] for c in sqlite_schema]
+        # Tipos (nomenclatura de TypeConverter) para el encoder COPY BINARY
+        self.column_types = column_types
+        self.create_sql = create_sql
+        self.fast_create_sql = fast_create_sql
+        self.add_primary_key_sql = add_primary_key_sql
+        self.set_logged_sql = set_logged_sql
+        self.insert_sql = insert_sql
+        self.copy_sql = copy_sql
+        self.converter = converter
+        self.key_column = key_column
+        self.estimated_rows = estimated_rows
+        self.estimated_bytes = estimated_bytes
+        self.dependencies = dependencies
+        # None = ninguna columna ancha: lectura y escritura por lotes de siempre
+        self.large_columns = large_columns
+        # Índices secundarios y foreign keys a crear tras la carga
+        self.post_load = post_load or []
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "table": self.table,
+            "exists": bool(self.postgres_schema),
+            "columns": self.columns,
+            "key_column": self.key_column,
+            "estimated_rows": self.estimated_rows,
+            "estimated_bytes": self.estimated_bytes,
+            "depends_on": sorted(self.dependencies),
+            "converted_columns": [
+                self.columns[index] for index, _ in (self.converter.plan if self.converter else [])
+            ],
+            "large_columns": [
+                self.columns[index] for index in (self.large_columns.indexes if self.large_columns else {})
+            ],
+            "create_sql": " ".join(self.create_sql.split()),
+            "load_sql": self.copy_sql or self.insert_sql,
+            "indexes": [o["name"] for o in self.post_load if o["kind"] == "index" and not o["skipped"]],
+            "foreign_keys": [
+                o["name"] for o in self.post_load if o["kind"] == "foreign_key" and not o["skipped"]
+            ],
+        }
+
+
+class MigrationPlan:
+    """
+    Compiled once per job: table order, DDL, load statements, converters,
+    size estimates and the chosen parallelism. Runners execute it instead
+    of re-deriving any of it per table or per batch.
+    """
+
+    def __init__(
+        self,
+        tables: Dict[str, TablePlan],
+        order: List[List[str]],
+        load_mode: LoadMode,
+        table_workers: int,
+        range_workers: int,
+        prefetch_depth: int,
+        rows_exact: bool,
+    ):
+        self.tables = tables
+        self.order = order
+        self.load_mode = load_mode
+        self.table_workers = table_workers
+        self.range_workers = range_workers
+        self.prefetch_depth = prefetch_depth
+        self.rows_exact = rows_exact
+        self.estimate: Optional[Dict[str, Any]] = None
+
+    @property
+    def sizes(self) -> Dict[str, int]:
+        return {name: t.estimated_rows for name, t in self.tables.items()}
+
+    @property
+    def dependencies(self) -> Dict[str, Set[str]]:
+        return {name: t.dependencies for name, t in self.tables.items()}
+
+    @property
+    def post_load(self) -> List[Dict[str, Any]]:
+        return [obj for wave in self.order for name in wave for obj in self.tables[name].post_load]
+
+    @property
+    def total_rows(self) -> int:
+        return sum(t.estimated_rows for t in self.tables.values())
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(t.estimated_bytes for t in self.tables.values())
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "load_mode": self.load_mode,
+            "table_workers": self.table_workers,
+            "range_workers": self.range_workers,
+            "prefetch_depth": self.prefetch_depth,
+            "total_rows": self.total_rows,
+            "total_rows_exact": self.rows_exact,
+            "total_bytes": self.total_bytes,
+            "order": self.order,
+            "tables": [self.tables[name].describe() for wave in self.order for name in wave],
+            "estimate": self.estimate,
+        }
+
+
+class MigrationPlanner:
+    def __init__(self, reader, writer, converter: Optional[TypeConverter] = None):
+        self.reader = reader
+        self.writer = writer
+        self.converter = converter or TypeConverter()
+
+    # =====================================================
+    # PUBLIC – COMPILE
+    # =====================================================
+    def compile(self, req, tables: Optional[List[str]] = None) -> MigrationPlan:
+        """``tables`` restricts the plan to a subset (e.g. the one table of a worker task)."""
+        plans, rows_exact = self.compile_tables(req, tables)
+
+        return MigrationPlan(
+            tables=plans,
+            order=self._order(plans, req.table_workers),
+            load_mode=req.load_mode,
+            table_workers=req.table_workers,
+            range_workers=req.range_workers,
+            prefetch_depth=req.prefetch_depth,
+            rows_exact=rows_exact,
+        )
+
+    def compile_tables(self, req, tables: Optional[List[str]] = None):
+        """
+        ``({table: TablePlan}, rows_exact)`` without the run's ordering.
+        With no writer (spool export) the target catalog is not read and
+        every table is planned as one the load will create.
+        """
+        sqlite_schemas = catalog_cache.sqlite_schemas(self.reader)
+        postgres_schemas = {}
+        if self.writer is not None:
+            postgres_schemas = catalog_cache.postgres_schemas(self.writer)
+        foreign_keys = catalog_cache.sqlite_foreign_keys(self.reader)
+        indexes = catalog_cache.sqlite_indexes(self.reader)
+        # Tablas del job (no solo las de este plan): destino válido de una foreign key
+        job_tables = getattr(req, "tables", None) or list(sqlite_schemas)
+        if tables is None:
+            tables = list(sqlite_schemas)
+        else:
+            missing = [t for t in tables if t not in sqlite_schemas]
+            if missing:
+                raise ValueError(f"Tables not found in SQLite source: {', '.join(missing)}")
+
+        estimator = RowEstimator(self.reader, req.row_estimate)
+        sizes = estimator.estimate(tables)
+
+        plans = {}
+        for table in tables:
+            plans[table] = self._compile_table(
+                req,
+                table,
+                sqlite_schemas[table],
+                postgres_schemas.get(table, []),
+                sizes.get(table, 0),
+                {fk["table"] for fk in foreign_keys.get(table, [])},
+            )
+            plans[table].post_load = compile_post_load(
+                table,
+                sqlite_schemas,
+                indexes.get(table, []),
+                foreign_keys.get(table, []),
+                job_tables,
+            )
+        return plans, estimator.exact
+
+    def _compile_table(self, req, table: str, sqlite_schema, postgres_schema, rows: int, deps) -> TablePlan:
+        sqlite_schema = self._blob_affinity(table, sqlite_schema)
+        columns = [c["name"] for c in sqlite_schema]
+        column_types = [self.converter.sqlite_to_postgres(c["type"]) for c in sqlite_schema]
+
+        # Tipos reales del destino si la tabla ya existe; si no, los que se van a crear
+        existing = {c["name"]: c["type"] for c in postgres_schema}
+        target_types = [existing.get(name) or pg_type for name, pg_type in zip(columns, column_types)]
+
+        converter = None
+        if req.convert_values:
+            converter = BatchConverter(target_types)
+
+        key_column = self.reader.get_key_column(table)
+        large_columns = None
+        if req.large_value_bytes and key_column == "rowid":
+            average_bytes, large_columns = self._large_columns(req, table, sqlite_schema, target_types)
+        else:
+            average_bytes = self._average_row_bytes(table)
+
+        copy_format = COPY_FORMATS.get(req.load_mode)
+
+        return TablePlan(
+            table=table,
+            sqlite_schema=sqlite_schema,
+            postgres_schema=postgres_schema,
+            column_types=column_types,
+            create_sql=SQLBuilder.build_create_table(table, sqlite_schema, self.converter),
+            fast_create_sql=SQLBuilder.build_create_table(
+                table, sqlite_schema, self.converter,
+                unlogged=True,
+                include_primary_key=False,
+            ),
+            add_primary_key_sql=SQLBuilder.build_add_primary_key(table, sqlite_schema),
+            set_logged_sql=SQLBuilder.build_set_logged(table),
+            insert_sql=build_insert_sql(table, columns),
+            copy_sql=build_copy_sql(table, columns, copy_format) if copy_format else None,
+            converter=converter,
+            key_column=key_column,
+            estimated_rows=rows,
+            estimated_bytes=rows * average_bytes,
+            dependencies=deps,
+            large_columns=large_columns,
+        )
+
+    def _blob_affinity(self, table: str, sqlite_schema):
+        """
+        Columns without a declared type (BLOB affinity in SQLite) that
+        hold blobs are planned as BLOB, so they become BYTEA instead of
+        TEXT and their bytes are copied as they are.
+        """
+        untyped = [c["name"] for c in sqlite_schema if not (c["type"] or "").strip()]
+        blobs = set(self.reader.get_blob_columns(table, untyped))
+        if not blobs:
+            return sqlite_schema
+        # Copia: el esquema viene de la caché de catálogo compartida
+        return [dict(c, type="BLOB") if c["name"] in blobs else c for c in sqlite_schema]
+
+    def _large_columns(self, req, table: str, sqlite_schema, target_types):
+        """
+        Text/bytea columns whose values may be streamed: declared BLOB
+        (bytea targets only), or seen in the sample at
+        1/LARGE_SAMPLE_FRACTION of the threshold or more. Byte sizes come
+        from SQLite, so sampling a table of huge documents does not fetch
+        them. Needs a rowid for blob I/O.
+        """
+        columns = [c["name"] for c in sqlite_schema]
+        average_bytes, maxima = self.reader.get_column_sizes(table, columns, SIZE_SAMPLE_ROWS)
+
+        indexes = {}
+        for index, (column, pg_type) in enumerate(zip(sqlite_schema, target_types)):
+            pg_type = (pg_type or "").upper()
+            is_bytea = pg_type == "BYTEA"
+            if not (is_bytea or pg_type == "TEXT" or pg_type.startswith(("CHARACTER", "VARCHAR"))):
+                continue
+            declared_blob = "BLOB" in (column["type"] or "").upper()
+            if declared_blob and not is_bytea:
+                # BLOB hacia una columna text ya existente: sin streaming, la conversión
+                # estricta del valor completo decide (nunca se decodifica un BLOB a trozos)
+                continue
+            if declared_blob or maxima[column["name"]] * LARGE_SAMPLE_FRACTION >= req.large_value_bytes:
+                indexes[index] = is_bytea
+
+        if not indexes:
+            return average_bytes, None
+        return average_bytes, LargeColumns(
+            columns,
+            indexes,
+            threshold=req.large_value_bytes,
+            chunk_size=req.large_value_chunk_bytes,
+        )
+
+    def _average_row_bytes(self, table: str) -> int:
+        batches = self.reader.read_rows(table, SIZE_SAMPLE_ROWS)
+        try:
+            sample = next(batches, [])
+        finally:
+            batches.close()
+        if not sample:
+            return 0
+        return sample_batch_bytes(sample) // len(sample)
+
+    def _order(self, plans: Dict[str, TablePlan], workers: int) -> List[List[str]]:
+        """Waves the scheduler would start, assuming every wave finishes together."""
+        scheduler = TableScheduler(
+            tables=plans,
+            sizes={name: p.estimated_rows for name, p in plans.items()},
+            dependencies={name: p.dependencies for name, p in plans.items()},
+        )
+
+        waves = []
+        while scheduler.has_work():
+            wave = scheduler.take_ready(workers)
+            for table in wave:
+                scheduler.mark_done(table)
+            waves.append(wave)
+        return waves
+
+    # =====================================================
+    # PUBLIC – DRY-RUN ESTIMATE
+    # =====================================================
+    def estimate_duration(self, plan: MigrationPlan, sample_rows: int) -> Dict[str, Any]:
+        """
+        Samples read and write throughput on the largest table and projects
+        the plan's duration from it.
+
+        The write probe COPYs the sample into a temporary table that is
+        rolled back, so the target is left untouched. The projection
+        assumes the stages overlap when prefetching (throughput of the
+        slower one) and add up otherwise, that each table/range stream
+        runs at the sampled rate, and that the biggest table bounds the run.
+        """
+        if not plan.tables or plan.total_bytes == 0:
+            plan.estimate = {"seconds": 0.0, "sample_rows": 0}
+            return plan.estimate
+
+        largest = max(plan.tables.values(), key=lambda t: t.estimated_bytes)
+        sample, read_seconds = self._sample_read(largest.table, sample_rows)
+        write_seconds = self._sample_write(plan, largest, sample)
+
+        sample_bytes = max(1, sample_batch_bytes(sample))
+        read_bps = sample_bytes / read_seconds if read_seconds > 0 else float("inf")
+        write_bps = sample_bytes / write_seconds if write_seconds > 0 else float("inf")
+
+        if plan.prefetch_depth > 0:
+            stream_bps = min(read_bps, write_bps)
+        else:
+            stream_bps = 1 / (1 / read_bps + 1 / write_bps)
+
+        streams = plan.table_workers * plan.range_workers
+        overall = plan.total_bytes / (stream_bps * streams)
+        biggest = largest.estimated_bytes / (stream_bps * plan.range_workers)
+
+        plan.estimate = {
+            "seconds": round(max(overall, biggest), 1),
+            "sample_table": largest.table,
+            "sample_rows": len(sample),
+            "read_bytes_per_second": round(read_bps),
+            "write_bytes_per_second": round(write_bps),
+            "read_rows_per_second": round(len(sample) / read_seconds) if read_seconds > 0 else None,
+            "write_rows_per_second": round(len(sample) / write_seconds) if write_seconds > 0 else None,
+        }
+        return plan.estimate
+
+    def _sample_read(self, table: str, sample_rows: int):
+        started = time.perf_counter()
+        batches = self.reader.read_rows(table, sample_rows)
+        try:
+            sample = next(batches, [])
+        finally:
+            batches.close()
+        return sample, time.perf_counter() - started
+
+    def _sample_write(self, plan: MigrationPlan, table_plan: TablePlan, sample) -> float:
+        if not sample:
+            return 0.0
+
+        probe_sql = SQLBuilder.build_create_table(
+            PROBE_TABLE, table_plan.sqlite_schema, self.converter, include_primary_key=False,
+        ).replace("CREATE TABLE", "CREATE TEMP TABLE", 1)
+        rows = table_plan.converter(sample) if table_plan.converter else sample
+
+        with self.writer.session() as session:
+            session.execute_sql(probe_sql)
+            started = time.perf_counter()
+            if plan.load_mode == LoadMode.EXECUTE_BATCH:
+                session.insert_rows(PROBE_TABLE, table_plan.columns, rows)
+            else:
+                session.copy_rows(
+                    PROBE_TABLE,
+                    table_plan.columns,
+                    [rows],
+                    copy_format=COPY_FORMATS[plan.load_mode],
+                    column_types=table_plan.column_types,
+                )
+            seconds = time.perf_counter() - started
+            # Nada del sondeo queda en el destino
+            session.rollback()
+
+        return seconds
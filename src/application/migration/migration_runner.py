@@ -1,9 +1,20 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from src.application.jobs.memory_budget import MemoryBudget, global_memory_budget
+from src.application.migration.batch_sizer import AdaptiveBatchSizer
+from src.application.migration.migration_plan import MigrationPlanner
+from src.application.migration.post_load import PostLoadBuilder, select_post_load
+from src.application.migration.range_partitioner import RangePartitioner
+from src.application.migration.row_estimator import RowEstimator
 from src.application.migration.table_migrator import TableMigrator
-from src.application.schema.type_converter import TypeConverter
-from src.domain.models import JobStatus
+from src.application.migration.table_scheduler import TableScheduler
+from src.domain.models import JobExecutor, JobStatus, SourceMode
 
-from src.infrastructure.sqlite_reader import SQLiteReader
-from src.infrastructure.postgres_writer import PostgreSQLWriter
+from src.infrastructure.adapters.checkpoint_store import PostgresCheckpointStore
+from src.infrastructure.adapters.quarantine_store import PostgresQuarantineStore
+from src.infrastructure.adapters.sqlite_reader import SQLiteReader
+from src.infrastructure.adapters.sqlite_snapshot import SQLiteSnapshot
+from src.infrastructure.adapters.postgres_writer import PostgreSQLWriter, CommitPolicy
 
 
 class MigrationRunner:
@@ -16,31 +27,80 @@ class MigrationRunner:
     def run(self, job_id: str, req) -> None:
         job = self.job_manager.get(job_id)
 
-        reader = SQLiteReader(req.sqlite_path)
-        writer = PostgreSQLWriter(req.postgres_url)
-        converter = TypeConverter()
+        snapshot = self._snapshot(job, req)
+        try:
+            source_path = self._prepare_source(job, snapshot, req)
+        except Exception as e:
+            self._fail_job(job, f"Could not snapshot SQLite source: {e}")
+            return
+
+        # Cada worker (tabla x rango) necesita su propia conexión en cada lado
+        # (+1 en SQLite para el conteo exacto en segundo plano)
+        pool_size = max(req.pool_size, req.table_workers * req.range_workers, req.index_workers)
+        reader = SQLiteReader(
+            source_path,
+            pool_size=pool_size + 1,
+            immutable=req.source_mode != SourceMode.LIVE,
+            mmap_size=req.sqlite_mmap_bytes,
+            cache_size=req.sqlite_cache_kib,
+        )
+        writer = PostgreSQLWriter(
+            req.postgres_url,
+            pool_size=pool_size,
+            schema=req.postgres_schema,
+        )
+        refiner = None
 
         try:
-            tables = reader.get_tables()
-            job.total_rows = self._count_total_rows(reader, tables)
+            # Todo lo derivable del catálogo se compila una vez para el job
+            plan = MigrationPlanner(reader, writer).compile(req)
+            tables = list(plan.tables)
+            sizes = plan.sizes
+            job.set_total_rows(plan.total_rows, exact=plan.rows_exact)
+
+            checkpoint_store = None
+            if req.checkpoints:
+                checkpoint_store = PostgresCheckpointStore()
+                job.processed_rows = self._prepare_checkpoints(
+                    writer, checkpoint_store, job
+                )
+            if req.quarantine_bad_rows:
+                job.quarantined_rows = self._prepare_quarantine(writer, job)
             self.job_manager.update(job)
 
-            table_migrator = TableMigrator(
-                reader=reader,
-                writer=writer,
-                converter=converter,
-                job_manager=self.job_manager,
+            scheduler = TableScheduler(
+                tables=tables,
+                sizes=sizes,
+                dependencies=plan.dependencies,
             )
 
-            for table in tables:
-                if job.status == JobStatus.CANCELLED:
-                    return
+            if req.refine_row_counts and not plan.rows_exact:
+                refiner = RowEstimator(reader, req.row_estimate).refine_in_background(
+                    tables=tables,
+                    sizes=sizes,
+                    on_update=lambda total, exact: self._refine_total_rows(
+                        job, total, exact
+                    ),
+                )
+
+            job.start_load()
+            if req.executor == JobExecutor.CELERY:
+                # Import diferido: celery solo hace falta con este executor
+                from src.application.migration.table_tasks import RemoteTableDispatcher
 
-                table_migrator.migrate(
-                    job=job,
-                    table=table,
-                    batch_size=req.batch_size,
+                RemoteTableDispatcher(self.job_manager).run(job, scheduler, req, source_path)
+            else:
+                table_migrator = self.build_table_migrator(
+                    req, reader, writer, plan, checkpoint_store
                 )
+                self._migrate_tables(job, scheduler, table_migrator, req, reader, writer)
+
+            if job.status == JobStatus.CANCELLED:
+                return
+
+            self._build_post_load(job, req, writer, plan)
+            if job.status == JobStatus.CANCELLED:
+                return
 
             job.mark_completed()
             self.job_manager.update(job)
@@ -48,27 +108,202 @@ class MigrationRunner:
         except Exception as e:
             self._fail_job(job, str(e))
 
+        finally:
+            # El conteo en curso se interrumpe y su conexión vuelve al pool antes de cerrarlo
+            if refiner is not None:
+                refiner.stop()
+            self._record_connection_stats(job, reader, writer)
+            reader.close()
+            writer.close()
+            if snapshot is not None:
+                snapshot.remove()
+
+    # =====================================================
+    # PUBLIC – TABLE MIGRATOR (also used by Celery workers)
+    # =====================================================
+    def build_table_migrator(self, req, reader, writer, plan, checkpoint_store=None) -> TableMigrator:
+        return TableMigrator(
+            reader=reader,
+            writer=writer,
+            plan=plan,
+            job_manager=self.job_manager,
+            load_mode=req.load_mode,
+            commit_policy=CommitPolicy(
+                every_batches=req.commit_every_batches,
+                every_bytes=req.commit_every_bytes,
+            ),
+            partitioner=RangePartitioner(
+                workers=req.range_workers,
+                min_rows_per_range=req.min_rows_per_range,
+            ),
+            prefetch_depth=req.prefetch_depth,
+            checkpoint_store=checkpoint_store,
+            fast_load_settings=self._fast_load_settings(req),
+            quarantine_store=PostgresQuarantineStore() if req.quarantine_bad_rows else None,
+            max_bad_rows=req.max_bad_rows,
+            **self._batch_memory_options(req),
+        )
+
+    # =====================================================
+    # INTERNAL – SOURCE SNAPSHOT
+    # =====================================================
+    def _snapshot(self, job, req):
+        if req.source_mode != SourceMode.SNAPSHOT:
+            return None
+        return SQLiteSnapshot(
+            req.sqlite_path,
+            directory=req.snapshot_dir,
+            tag=f"snapshot-{job.job_id[:8]}",
+        )
+
+    def _prepare_source(self, job, snapshot, req) -> str:
+        if snapshot is None:
+            return req.sqlite_path
+
+        started = time.perf_counter()
+        path = snapshot.create()
+        job.record_phase("snapshot", time.perf_counter() - started)
+        self.job_manager.update(job)
+        return path
+
+    # =====================================================
+    # INTERNAL – FAST LOAD
+    # =====================================================
+    def _fast_load_settings(self, req):
+        if not req.fast_load:
+            return None
+        return {
+            "synchronous_commit": "off",
+            "maintenance_work_mem": req.maintenance_work_mem,
+        }
+
+    # =====================================================
+    # INTERNAL – BATCH SIZE / MEMORY
+    # =====================================================
+    def _batch_memory_options(self, req) -> dict:
+        budget = global_memory_budget
+        if req.memory_budget_bytes:
+            budget = MemoryBudget(req.memory_budget_bytes, parent=global_memory_budget)
+
+        sizer_factory = None
+        if req.auto_batch_size:
+            # Lotes en vuelo por stream: cola(s) de prefetch + el que se escribe
+            in_flight = req.prefetch_depth + 2
+            streams = req.table_workers * req.range_workers
+            target_bytes = min(
+                req.target_batch_bytes,
+                max(1, budget.capacity // (in_flight * streams)),
+            )
+
+            def sizer_factory():
+                return AdaptiveBatchSizer(
+                    initial_rows=req.batch_size,
+                    target_bytes=target_bytes,
+                    target_seconds=req.target_batch_seconds,
+                )
+
+        return {
+            "batch_sizer_factory": sizer_factory,
+            "memory_budget": budget,
+        }
+
+    # =====================================================
+    # INTERNAL – CHECKPOINTS
+    # =====================================================
+    def _prepare_checkpoints(self, writer, store, job) -> int:
+        """Creates the checkpoint table; returns rows already committed by this job."""
+        with writer.session() as session:
+            with session.cursor() as cursor:
+                store.ensure_table(cursor)
+                return store.rows_copied(cursor, job.job_id)
+
+    def _prepare_quarantine(self, writer, job) -> int:
+        """Creates the dead-letter table; returns rows already quarantined by this job."""
+        store = PostgresQuarantineStore()
+        with writer.session() as session:
+            with session.cursor() as cursor:
+                store.ensure_table(cursor)
+                return store.count(cursor, job.job_id)
+
+    # =====================================================
+    # INTERNAL – TABLE WORKERS
+    # =====================================================
+    def _migrate_tables(self, job, scheduler, table_migrator, req, reader, writer):
+        workers = req.table_workers
+
+        with ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix=f"migrate-{job.job_id[:8]}",
+        ) as executor:
+            running = {}
+            try:
+                while scheduler.has_work():
+                    if job.is_stopped:
+                        return
+
+                    for table in scheduler.take_ready(workers - len(running)):
+                        future = executor.submit(
+                            table_migrator.migrate,
+                            job=job,
+                            table=table,
+                            batch_size=req.batch_size,
+                            row_count=scheduler.sizes.get(table, 0),
+                        )
+                        running[future] = table
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        table = running.pop(future)
+                        future.result()
+                        scheduler.mark_done(table)
+                        self._record_connection_stats(job, reader, writer)
+
+            except Exception as e:
+                # Marca el job antes de salir para que los demás workers paren
+                self._fail_job(job, str(e))
+                raise
+
+    # =====================================================
+    # INTERNAL – POST-LOAD INDEXES / FOREIGN KEYS
+    # =====================================================
+    def _build_post_load(self, job, req, writer, plan) -> None:
+        # Con los datos ya cargados: un índice construido de una vez es mucho
+        # más barato que mantenerlo fila a fila durante el COPY
+        objects = select_post_load(plan.post_load, req.create_indexes, req.create_foreign_keys)
+        if not objects:
+            return
+
+        PostLoadBuilder(
+            writer,
+            self.job_manager,
+            workers=req.index_workers,
+            settings={"maintenance_work_mem": req.maintenance_work_mem},
+        ).run(job, objects)
+
     # =====================================================
     # INTERNAL – JOB FAILURE
     # =====================================================
     def _fail_job(self, job, error: str):
+        if job.status == JobStatus.FAILED and error in job.errors:
+            return
         job.mark_failed(error)
         self.job_manager.update(job)
 
     # =====================================================
-    # INTERNAL – ROW COUNT
+    # INTERNAL – CONNECTION STATS
     # =====================================================
-    def _count_total_rows(self, reader, tables) -> int:
-        total = 0
-        for table in tables:
-            total += self._count_rows(reader, table)
-        return total
+    def _record_connection_stats(self, job, reader, writer):
+        job.connection_stats = {
+            "sqlite": reader.pool.stats(),
+            "postgres": writer.pool.stats(),
+        }
+        self.job_manager.update(job)
 
-    def _count_rows(self, reader, table: str) -> int:
-        conn = reader.connect()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(f'SELECT COUNT(*) FROM "{table}"')
-            return cursor.fetchone()[0]
-        finally:
-            conn.close()
+    # =====================================================
+    # INTERNAL – ROW COUNT
+    # =====================================================
+    def _refine_total_rows(self, job, total: int, exact: bool):
+        if job.is_stopped or job.status == JobStatus.COMPLETED:
+            return
+        job.set_total_rows(total, exact=exact)
+        self.job_manager.update(job)
@@ -0,0 +1,290 @@
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional
+
+import psycopg2
+
+from src.application.migration.sql_builder import SQLBuilder
+
+
+# Límite de identificadores de PostgreSQL (los nombres más largos se truncan)
+PG_NAME_BYTES = 63
+
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+# =====================================================
+# COMPILE – SQLITE CATALOG → POSTGRES DDL
+# =====================================================
+def compile_post_load(
+    table: str,
+    schemas: Dict[str, List[Dict]],
+    indexes: List[Dict],
+    foreign_keys: List[Dict],
+    tables: Iterable[str],
+) -> List[Dict[str, Any]]:
+    """
+    The secondary indexes and foreign keys of ``table`` as PostgreSQL DDL.
+
+    Each object is a plain dict (it also goes into spool manifests):
+    ``kind``, ``name``, ``table``, ``sql``, ``validate_sql`` and
+    ``references`` for foreign keys, and ``skipped`` with the reason when
+    it cannot be translated: expression and partial indexes (their SQL
+    is SQLite's), and foreign keys to tables outside the job. Indexes
+    covered by the primary key are left out; collations are not carried
+    over.
+    """
+    tables = set(tables)
+    primary_key = [c["name"] for c in schemas[table] if c["pk"]]
+    objects = []
+
+    for index in indexes:
+        columns = index["columns"]
+        if index["origin"] == "pk" or columns == primary_key:
+            continue
+
+        if index["origin"] == "u":
+            # Autoíndice de un UNIQUE: nombre al estilo de PostgreSQL
+            name = _pg_name(table, *columns, "key")
+        else:
+            name = _pg_name(index["name"])
+
+        obj = {
+            "kind": "index",
+            "name": name,
+            "table": table,
+            "sql": None,
+            "validate_sql": None,
+            "references": None,
+            "skipped": None,
+        }
+        if None in columns:
+            obj["skipped"] = "expression index"
+        elif index["partial"]:
+            obj["skipped"] = "partial index"
+        else:
+            obj["sql"] = SQLBuilder.build_create_index(
+                name, table, columns, index["descending"], unique=index["unique"]
+            )
+        objects.append(obj)
+
+    by_id: Dict[int, List[Dict]] = {}
+    for fk in foreign_keys:
+        by_id.setdefault(fk["id"], []).append(fk)
+
+    for parts in by_id.values():
+        parts.sort(key=lambda fk: fk["seq"])
+        parent = parts[0]["table"]
+        columns = [fk["from"] for fk in parts]
+
+        obj = {
+            "kind": "foreign_key",
+            "name": _pg_name(table, *columns, "fkey"),
+            "table": table,
+            "sql": None,
+            "validate_sql": None,
+            "references": parent,
+            "skipped": None,
+        }
+
+        # Sin columnas destino, SQLite referencia el PK del padre
+        ref_columns = [fk["to"] for fk in parts]
+        if None in ref_columns and parent in schemas:
+            ref_columns = [c["name"] for c in schemas[parent] if c["pk"]]
+
+        if parent not in tables:
+            obj["skipped"] = f"references {parent}, not part of this job"
+        elif len(ref_columns) != len(columns) or None in ref_columns:
+            obj["skipped"] = f"no key on {parent} to reference"
+        else:
+            obj["sql"] = SQLBuilder.build_add_foreign_key(
+                obj["name"], table, columns, parent, ref_columns,
+                on_delete=parts[0]["on_delete"],
+                on_update=parts[0]["on_update"],
+            )
+            obj["validate_sql"] = SQLBuilder.build_validate_constraint(table, obj["name"])
+        objects.append(obj)
+
+    return objects
+
+
+def select_post_load(
+    objects: Iterable[Dict[str, Any]],
+    indexes: bool,
+    foreign_keys: bool,
+    tables: Optional[Iterable[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Objects a run should build; ``tables`` skips foreign keys to tables it does not load."""
+    tables = set(tables) if tables is not None else None
+    selected = []
+    for obj in objects:
+        if obj["kind"] == "index" and not indexes:
+            continue
+        if obj["kind"] == "foreign_key":
+            if not foreign_keys:
+                continue
+            if tables is not None and obj["references"] not in tables and not obj["skipped"]:
+                obj = {**obj, "skipped": f"references {obj['references']}, not part of this job"}
+        selected.append(obj)
+    return selected
+
+
+def _pg_name(*parts: str) -> str:
+    name = "_".join(parts)
+    if len(name.encode("utf-8")) <= PG_NAME_BYTES:
+        return name
+    # Truncado + hash: nombres estables y distintos aunque compartan prefijo
+    digest = hashlib.md5(name.encode("utf-8")).hexdigest()[:8]
+    return name.encode("utf-8")[: PG_NAME_BYTES - 9].decode("utf-8", "ignore") + "_" + digest
+
+
+# =====================================================
+# BUILD – AFTER THE DATA LOAD
+# =====================================================
+class PostLoadBuilder:
+    """
+    Builds a job's secondary indexes and foreign keys once its data is in.
+
+    Indexes go first, ``workers`` at a time, each on its own connection
+    with the session ``settings`` (maintenance_work_mem: every build may
+    sort up to that much, so peak memory is workers × that). Foreign keys
+    are then added NOT VALID one by one, a short lock and no scan, and
+    validated in parallel, one table per connection: VALIDATE CONSTRAINT
+    takes a lock that still lets the table be read and written.
+
+    Each object is reported on the job. A foreign key whose existing rows
+    violate it stays NOT VALID (still enforced for new rows) and is
+    reported as such; any other failure fails the job once every object
+    has been tried. All steps are idempotent for a resumed job.
+    """
+
+    def __init__(self, writer, job_manager, workers: int = 4, settings: Optional[Dict[str, str]] = None):
+        self.writer = writer
+        self.job_manager = job_manager
+        self.workers = workers
+        self.settings = settings
+
+    # =====================================================
+    # PUBLIC – RUN
+    # =====================================================
+    def run(self, job, objects: List[Dict[str, Any]]) -> None:
+        pending = []
+        for obj in objects:
+            if obj["skipped"]:
+                self._record(job, obj, "skipped", error=obj["skipped"])
+            else:
+                pending.append(obj)
+
+        indexes = [o for o in pending if o["kind"] == "index"]
+        foreign_keys = [o for o in pending if o["kind"] == "foreign_key"]
+
+        if indexes:
+            started = time.perf_counter()
+            self._parallel(job, [[o] for o in indexes], self._build_indexes)
+            job.record_phase("indexes", time.perf_counter() - started)
+
+        if foreign_keys and not job.is_stopped:
+            started = time.perf_counter()
+            to_validate = self._add_foreign_keys(job, foreign_keys)
+
+            by_table: Dict[str, List[Dict]] = {}
+            for obj in to_validate:
+                by_table.setdefault(obj["table"], []).append(obj)
+            self._parallel(job, list(by_table.values()), self._validate_foreign_keys)
+            job.record_phase("foreign_keys", time.perf_counter() - started)
+
+        failed = [
+            o["name"] for o in pending
+            if job.post_load.get(o["name"], {}).get("status") == "failed"
+        ]
+        if failed:
+            raise ValueError(
+                f"{len(failed)} indexes/foreign keys could not be created: {', '.join(failed[:10])}"
+            )
+
+    # =====================================================
+    # INTERNAL – INDEXES
+    # =====================================================
+    def _build_indexes(self, job, objects: List[Dict]) -> None:
+        for obj in objects:
+            if job.is_stopped:
+                return
+            started = time.perf_counter()
+            try:
+                with self.writer.session(settings=self.settings) as session:
+                    if session.relation_exists(obj["name"]):
+                        status = "exists"
+                    else:
+                        session.execute_sql(obj["sql"])
+                        status = "created"
+            except psycopg2.Error as e:
+                self._record(job, obj, "failed", started, e)
+                continue
+            self._record(job, obj, status, started)
+
+    # =====================================================
+    # INTERNAL – FOREIGN KEYS
+    # =====================================================
+    def _add_foreign_keys(self, job, objects: List[Dict]) -> List[Dict]:
+        """Adds the missing ones NOT VALID; returns those still to validate."""
+        to_validate = []
+        with self.writer.session() as session:
+            for obj in objects:
+                if job.is_stopped:
+                    break
+                started = time.perf_counter()
+                try:
+                    state = session.constraint_state(obj["table"], obj["name"])
+                    if state is None:
+                        session.execute_sql(obj["sql"])
+                        session.commit()
+                except psycopg2.Error as e:
+                    session.rollback()
+                    self._record(job, obj, "failed", started, e)
+                    continue
+
+                if state:
+                    self._record(job, obj, "validated", started)
+                else:
+                    to_validate.append(obj)
+        return to_validate
+
+    def _validate_foreign_keys(self, job, objects: List[Dict]) -> None:
+        with self.writer.session() as session:
+            for obj in objects:
+                if job.is_stopped:
+                    return
+                started = time.perf_counter()
+                try:
+                    session.execute_sql(obj["validate_sql"])
+                    session.commit()
+                except psycopg2.Error as e:
+                    session.rollback()
+                    violated = getattr(e, "pgcode", None) == FOREIGN_KEY_VIOLATION
+                    self._record(job, obj, "not_valid" if violated else "failed", started, e)
+                    continue
+                self._record(job, obj, "validated", started)
+
+    # =====================================================
+    # INTERNAL – HELPERS
+    # =====================================================
+    def _parallel(self, job, groups: List[List[Dict]], work) -> None:
+        if not groups:
+            return
+        with ThreadPoolExecutor(
+            max_workers=min(self.workers, len(groups)),
+            thread_name_prefix=f"post-load-{job.job_id[:8]}",
+        ) as executor:
+            futures = [executor.submit(work, job, group) for group in groups]
+            for future in as_completed(futures):
+                future.result()
+
+    def _record(self, job, obj: Dict, status: str, started: Optional[float] = None, error=None) -> None:
+        report = {"kind": obj["kind"], "table": obj["table"], "status": status}
+        if started is not None:
+            report["seconds"] = round(time.perf_counter() - started, 3)
+        if error is not None:
+            report["error"] = str(error).strip().splitlines()[0] if str(error).strip() else type(error).__name__
+        job.record_post_load(obj["name"], report)
+        self.job_manager.update(job)
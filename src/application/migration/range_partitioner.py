@@ -0,0 +1,66 @@
+import math
+from typing import List, NamedTuple, Optional
+
+
+class KeyRange(NamedTuple):
+    """Half-open key interval [start, end) over an integer key column."""
+
+    column: str
+    start: int
+    end: int
+
+
+class RangePartitioner:
+    """
+    Splits a table's integer key space into ranges that can be copied
+    concurrently.
+
+    The number of ranges grows with the table: roughly one range per
+    ``min_rows_per_range`` rows, capped at ``ranges_per_worker`` ranges for
+    each worker so skewed key distributions still even out. Tables below the
+    threshold (or without a usable key) get a single stream.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        min_rows_per_range: int = 250_000,
+        ranges_per_worker: int = 4,
+    ):
+        self.workers = workers
+        self.min_rows_per_range = min_rows_per_range
+        self.ranges_per_worker = ranges_per_worker
+
+    def plan(
+        self,
+        column: Optional[str],
+        min_key: Optional[int],
+        max_key: Optional[int],
+        row_count: int,
+    ) -> List[KeyRange]:
+        if (
+            self.workers <= 1
+            or column is None
+            or min_key is None
+            or max_key is None
+            or row_count < 2 * self.min_rows_per_range
+        ):
+            return []
+
+        count = min(
+            math.ceil(row_count / self.min_rows_per_range),
+            self.workers * self.ranges_per_worker,
+        )
+
+        span = max_key - min_key + 1
+        count = max(1, min(count, span))
+        step = math.ceil(span / count)
+
+        ranges = []
+        start = min_key
+        while start <= max_key:
+            end = min(start + step, max_key + 1)
+            ranges.append(KeyRange(column, start, end))
+            start = end
+
+        return ranges if len(ranges) > 1 else []
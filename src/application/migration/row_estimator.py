@@ -0,0 +1,133 @@
+import threading
+import time
+from typing import Callable, Dict, List
+
+from src.domain.models import RowEstimate
+
+
+# Espera máxima al hilo de conteo al parar; el COUNT en curso se interrumpe
+STOP_TIMEOUT = 5.0
+_STOP_POLL = 0.05
+
+
+class RowEstimator:
+    """
+    Produces per-table row counts without blocking the start of the copy.
+
+    - ``exact``: COUNT(*) per table up front (full scans).
+    - ``max_rowid``: MAX(rowid) - MIN(rowid) + 1, keyless tables fall back
+      to COUNT(*).
+    - ``stat1``: sqlite_stat1 figures, other tables fall back to ``max_rowid``.
+    - ``auto``: ``stat1`` when the database has been analyzed, else ``max_rowid``.
+
+    Non-exact estimates can be replaced later by exact counts computed on a
+    background thread (``refine_in_background``).
+    """
+
+    def __init__(self, reader, strategy: RowEstimate = RowEstimate.AUTO):
+        self.reader = reader
+        self.strategy = strategy
+
+    @property
+    def exact(self) -> bool:
+        return self.strategy == RowEstimate.EXACT
+
+    # ---------------------------
+    # Quick estimate
+    # ---------------------------
+    def estimate(self, tables: List[str]) -> Dict[str, int]:
+        if self.exact:
+            return {table: self.reader.count_rows(table) for table in tables}
+
+        stat1: Dict[str, int] = {}
+        if self.strategy in (RowEstimate.STAT1, RowEstimate.AUTO):
+            stat1 = self.reader.get_stat1_row_counts()
+
+        sizes = {}
+        for table in tables:
+            if table in stat1:
+                sizes[table] = stat1[table]
+                continue
+
+            estimate = self.reader.estimate_rows_from_rowid(table)
+            sizes[table] = (
+                estimate if estimate is not None else self.reader.count_rows(table)
+            )
+        return sizes
+
+    # ---------------------------
+    # Background refinement
+    # ---------------------------
+    def refine_in_background(
+        self,
+        tables: List[str],
+        sizes: Dict[str, int],
+        on_update: Callable[[int, bool], None],
+    ) -> "RowCountRefiner":
+        """
+        Counts each table exactly, one at a time, and calls
+        ``on_update(total, exact)`` after every table whose number changed,
+        and once more with ``exact=True`` when every table is counted.
+        The returned refiner must be stopped before the reader is closed.
+        """
+        refiner = RowCountRefiner(self.reader, tables, sizes, on_update)
+        refiner.start()
+        return refiner
+
+
+class RowCountRefiner:
+    """
+    The background thread of ``refine_in_background``. Counts run on one
+    pooled connection held for the whole refinement, so ``stop`` can
+    interrupt the COUNT(*) in flight and wait for the connection to go
+    back to the pool.
+    """
+
+    def __init__(self, reader, tables: List[str], sizes: Dict[str, int], on_update: Callable[[int, bool], None]):
+        self.reader = reader
+        self.tables = sorted(tables, key=lambda t: -sizes.get(t, 0))
+        self.refined = dict(sizes)
+        self.on_update = on_update
+        self._stop = threading.Event()
+        self._conn = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="row-count-refiner", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, timeout: float = STOP_TIMEOUT) -> bool:
+        """Interrupts the count in flight and waits; False if the thread outlived ``timeout``."""
+        self._stop.set()
+        deadline = time.monotonic() + timeout
+        while self._thread.is_alive() and time.monotonic() < deadline:
+            # Se repite: un COUNT que empezó justo después del interrupt también se corta
+            with self._lock:
+                if self._conn is not None:
+                    self._conn.interrupt()
+            self._thread.join(_STOP_POLL)
+        return not self._thread.is_alive()
+
+    def _run(self) -> None:
+        try:
+            with self.reader.pool.connection() as conn:
+                with self._lock:
+                    self._conn = conn
+                try:
+                    for table in self.tables:
+                        if self._stop.is_set():
+                            return
+
+                        count = self.reader.count_rows(table, conn=conn)
+                        if count != self.refined.get(table):
+                            self.refined[table] = count
+                            self.on_update(sum(self.refined.values()), False)
+                finally:
+                    with self._lock:
+                        self._conn = None
+        except Exception:
+            # Solo refina la estimación: un fallo (o un interrupt) no afecta al job
+            return
+
+        if not self._stop.is_set():
+            self.on_update(sum(self.refined.values()), True)
@@ -0,0 +1,295 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.application.migration.batch_pipeline import BatchPipeline
+from src.application.migration.migration_plan import COPY_FORMATS, MigrationPlanner, TablePlan
+from src.application.migration.range_partitioner import KeyRange, RangePartitioner
+from src.domain.models import JobStatus, SourceMode
+from src.infrastructure.adapters.copy_encoder import build_copy_encoder, iter_copy_chunks
+from src.infrastructure.adapters.spool_files import (
+    MANIFEST_FILE,
+    MANIFEST_VERSION,
+    SPOOL_COMPRESSION,
+    SPOOL_EXTENSIONS,
+    SpoolFileWriter,
+    read_manifest,
+    remove_spool,
+    write_manifest,
+)
+from src.infrastructure.adapters.sqlite_reader import SQLiteReader
+from src.infrastructure.adapters.sqlite_snapshot import SQLiteSnapshot
+
+
+# Tope de ficheros por tabla: el partitioner reparte como mucho en tantos rangos
+MAX_FILES_PER_TABLE = 10_000
+
+
+class SpoolFile:
+    """One spool file to write: a key range of a table, or the whole table."""
+
+    def __init__(self, table: str, part: int, name: str, key_range: Optional[KeyRange]):
+        self.table = table
+        self.part = part
+        self.name = name
+        self.key_range = key_range
+        self.rows = 0
+        self.bytes = 0
+        self.sha256: Optional[str] = None
+
+    def describe(self) -> Dict:
+        return {
+            "file": self.name,
+            "part": self.part,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "sha256": self.sha256,
+            "key_range": [self.key_range.start, self.key_range.end] if self.key_range else None,
+        }
+
+
+class SpoolExportRunner:
+    """
+    Extract half of a decoupled migration: every table (or key range of
+    one) is encoded exactly as the COPY load would send it and written to
+    a gzip file in ``spool_dir``. The manifest, written last, lists each
+    file with its rows, payload size and sha256, plus what the load needs
+    to create the table; no PostgreSQL connection is opened.
+    """
+
+    def __init__(self, job_manager):
+        self.job_manager = job_manager
+
+    # =====================================================
+    # PUBLIC – RUN EXPORT
+    # =====================================================
+    def run(self, job_id: str, req) -> None:
+        job = self.job_manager.get(job_id)
+
+        snapshot = None
+        if req.source_mode == SourceMode.SNAPSHOT:
+            snapshot = SQLiteSnapshot(
+                req.sqlite_path,
+                directory=req.snapshot_dir,
+                tag=f"snapshot-{job.job_id[:8]}",
+            )
+
+        reader = None
+        try:
+            source_path = self._prepare_source(job, snapshot, req)
+
+            reader = SQLiteReader(
+                source_path,
+                pool_size=req.workers + 1,
+                immutable=req.source_mode != SourceMode.LIVE,
+                mmap_size=req.sqlite_mmap_bytes,
+                cache_size=req.sqlite_cache_kib,
+            )
+
+            plans, rows_exact = MigrationPlanner(reader, None).compile_tables(req, req.tables)
+            job.set_total_rows(sum(p.estimated_rows for p in plans.values()), exact=rows_exact)
+            job.load_mode = req.load_mode
+            self.job_manager.update(job)
+
+            self._prepare_directory(job, req)
+            files = self._plan_files(reader, plans, req)
+
+            job.start_load()
+            self._write_files(job, reader, plans, files, req)
+
+            if job.status == JobStatus.CANCELLED:
+                return
+
+            started = time.perf_counter()
+            write_manifest(req.spool_dir, self._manifest(job, req, plans, files))
+            job.record_phase("manifest", time.perf_counter() - started)
+
+            job.mark_completed()
+            self.job_manager.update(job)
+
+        except Exception as e:
+            job.mark_failed(str(e))
+            self.job_manager.update(job)
+
+        finally:
+            if reader is not None:
+                job.connection_stats = {"sqlite": reader.pool.stats()}
+                self.job_manager.update(job)
+                reader.close()
+            if snapshot is not None:
+                snapshot.remove()
+
+    # =====================================================
+    # INTERNAL – SOURCE / DIRECTORY
+    # =====================================================
+    def _prepare_source(self, job, snapshot, req) -> str:
+        if snapshot is None:
+            return req.sqlite_path
+
+        started = time.perf_counter()
+        path = snapshot.create()
+        job.record_phase("snapshot", time.perf_counter() - started)
+        self.job_manager.update(job)
+        return path
+
+    def _prepare_directory(self, job, req) -> None:
+        os.makedirs(req.spool_dir, exist_ok=True)
+        if not os.path.exists(os.path.join(req.spool_dir, MANIFEST_FILE)):
+            return
+
+        previous = read_manifest(req.spool_dir)
+        if previous.get("export_job_id") != job.job_id and not req.overwrite:
+            raise ValueError(
+                f"{req.spool_dir} already holds export {previous.get('export_job_id')}; "
+                "set overwrite to replace it"
+            )
+        # Sin manifest hasta el final: un load nunca mezcla ficheros de dos exports
+        remove_spool(req.spool_dir, previous)
+
+    # =====================================================
+    # INTERNAL – FILE PLAN
+    # =====================================================
+    def _plan_files(self, reader, plans: Dict[str, TablePlan], req) -> List[SpoolFile]:
+        """
+        Key ranges of about ``rows_per_file`` rows for tables with a
+        rowid/integer key; a single file for the rest.
+        """
+        # Aquí 'workers' del partitioner solo acota el número de ficheros por tabla
+        partitioner = RangePartitioner(
+            workers=MAX_FILES_PER_TABLE,
+            min_rows_per_range=req.rows_per_file,
+            ranges_per_worker=1,
+        )
+        extension = SPOOL_EXTENSIONS[COPY_FORMATS[req.load_mode]]
+
+        files = []
+        for ordinal, (table, plan) in enumerate(plans.items()):
+            prefix = f"{ordinal:04d}_{_safe_name(table)}"
+
+            ranges = [None]
+            if plan.key_column is not None:
+                min_key, max_key = reader.get_key_bounds(table, plan.key_column)
+                if min_key is not None:
+                    ranges = partitioner.plan(plan.key_column, min_key, max_key, plan.estimated_rows) or [
+                        KeyRange(plan.key_column, min_key, max_key + 1)
+                    ]
+
+            for part, key_range in enumerate(ranges):
+                files.append(SpoolFile(table, part, f"{prefix}.{part:05d}.{extension}", key_range))
+        return files
+
+    # =====================================================
+    # INTERNAL – WRITE FILES
+    # =====================================================
+    def _write_files(self, job, reader, plans: Dict[str, TablePlan], files: List[SpoolFile], req) -> None:
+        stop = threading.Event()
+        remaining = {table: 0 for table in plans}
+        for spool_file in files:
+            remaining[spool_file.table] += 1
+
+        with ThreadPoolExecutor(
+            max_workers=req.workers,
+            thread_name_prefix=f"export-{job.job_id[:8]}",
+        ) as executor:
+            futures = {
+                executor.submit(self._write_file, job, reader, plans[f.table], f, req, stop): f
+                for f in files
+            }
+            try:
+                for future in as_completed(futures):
+                    spool_file = futures[future]
+                    future.result()
+
+                    remaining[spool_file.table] -= 1
+                    if not remaining[spool_file.table] and not job.is_stopped:
+                        job.record_table_done(spool_file.table)
+                        self.job_manager.update(job)
+            except Exception:
+                # Los ficheros a medias se descartan; los demás dejan de empezar
+                stop.set()
+                raise
+
+    def _write_file(self, job, reader, plan: TablePlan, spool_file: SpoolFile, req, stop) -> None:
+        def should_stop() -> bool:
+            return job.is_stopped or stop.is_set()
+
+        if should_stop():
+            return
+
+        source = reader.read_rows(
+            plan.table,
+            req.batch_size,
+            key_range=spool_file.key_range,
+            large=plan.large_columns,
+        )
+        pipeline = BatchPipeline(
+            source=source,
+            convert=plan.converter if plan.converter is not None and not plan.converter.is_identity else None,
+            depth=req.prefetch_depth,
+            should_stop=should_stop,
+        )
+
+        def counted(batches):
+            for batch in batches:
+                spool_file.rows += len(batch)
+                yield batch
+                job.record_progress(len(batch))
+                self.job_manager.update(job)
+
+        encoder = build_copy_encoder(COPY_FORMATS[req.load_mode], plan.column_types)
+        path = os.path.join(req.spool_dir, spool_file.name)
+
+        batches = iter(pipeline)
+        try:
+            with SpoolFileWriter(path, req.compress_level) as out:
+                for chunk in iter_copy_chunks(encoder, counted(batches), plan.large_columns):
+                    out.write(chunk)
+                if should_stop():
+                    out.discard()
+        finally:
+            batches.close()
+            job.record_stage_times(pipeline.timings, table=plan.table)
+
+        if out.sha256 is None:
+            return
+        spool_file.bytes = out.bytes
+        spool_file.sha256 = out.sha256
+        job.record_batch(plan.table, spool_file.rows, spool_file.bytes)
+
+    # =====================================================
+    # INTERNAL – MANIFEST
+    # =====================================================
+    def _manifest(self, job, req, plans: Dict[str, TablePlan], files: List[SpoolFile]) -> Dict:
+        tables = {}
+        for table, plan in plans.items():
+            entries = [f.describe() for f in files if f.table == table]
+            tables[table] = {
+                "columns": plan.columns,
+                "column_types": plan.column_types,
+                "key_column": plan.key_column,
+                "depends_on": sorted(plan.dependencies),
+                "create_sql": plan.create_sql,
+                "copy_sql": plan.copy_sql,
+                "post_load": plan.post_load,
+                "rows": sum(e["rows"] for e in entries),
+                "files": entries,
+            }
+
+        return {
+            "version": MANIFEST_VERSION,
+            "export_job_id": job.job_id,
+            "created_at": datetime.utcnow().isoformat(),
+            "source": os.path.abspath(req.sqlite_path),
+            "format": COPY_FORMATS[req.load_mode],
+            "compression": SPOOL_COMPRESSION,
+            "total_rows": sum(t["rows"] for t in tables.values()),
+            "tables": tables,
+        }
+
+
+def _safe_name(table: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", table)[:64]
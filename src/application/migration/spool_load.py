@@ -0,0 +1,244 @@
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List
+
+from src.application.migration.post_load import PostLoadBuilder, select_post_load
+from src.application.migration.table_scheduler import TableScheduler
+from src.domain.models import JobStatus, LoadMode
+from src.infrastructure.adapters.checkpoint_store import PostgresCheckpointStore, RangeCheckpoint
+from src.infrastructure.adapters.postgres_writer import PostgreSQLWriter
+from src.infrastructure.adapters.spool_files import SpoolFileReader, read_manifest
+
+
+LOAD_MODES = {
+    "csv": LoadMode.COPY_CSV,
+    "binary": LoadMode.COPY_BINARY,
+}
+
+
+class SpoolLoadRunner:
+    """
+    Load half of a decoupled migration: replays an export's spool files
+    into PostgreSQL, several files at a time.
+
+    Each file is one COPY in its own transaction; with checkpoints its
+    checkpoint row (range_start = file part) is marked completed in that
+    same transaction. Resuming the job therefore replays exactly the files
+    that never committed, and never a file twice.
+    """
+
+    def __init__(self, job_manager):
+        self.job_manager = job_manager
+
+    # =====================================================
+    # PUBLIC – RUN LOAD
+    # =====================================================
+    def run(self, job_id: str, req) -> None:
+        job = self.job_manager.get(job_id)
+        writer = PostgreSQLWriter(
+            req.postgres_url,
+            pool_size=max(req.workers, req.index_workers),
+            schema=req.postgres_schema,
+        )
+
+        try:
+            manifest = read_manifest(req.spool_dir)
+            tables = self._select_tables(req, manifest)
+            job.load_mode = LOAD_MODES[manifest["format"]]
+            job.set_total_rows(sum(tables[t]["rows"] for t in tables), exact=True)
+
+            started = time.perf_counter()
+            units = self._plan_units(writer, job, tables, req)
+            job.record_phase("create", time.perf_counter() - started)
+            self.job_manager.update(job)
+
+            job.start_load()
+            self._load_tables(job, writer, tables, units, req)
+
+            if job.status == JobStatus.CANCELLED:
+                return
+
+            self._build_post_load(job, writer, tables, req)
+            if job.status == JobStatus.CANCELLED:
+                return
+
+            job.mark_completed()
+            self.job_manager.update(job)
+
+        except Exception as e:
+            self._fail_job(job, str(e))
+
+        finally:
+            job.connection_stats = {"postgres": writer.pool.stats()}
+            self.job_manager.update(job)
+            writer.close()
+
+    # =====================================================
+    # INTERNAL – TABLES / CHECKPOINTS
+    # =====================================================
+    def _select_tables(self, req, manifest) -> Dict[str, Dict]:
+        available = manifest["tables"]
+        if not req.tables:
+            return available
+
+        unknown = [t for t in req.tables if t not in available]
+        if unknown:
+            raise ValueError(f"Tables not in the spool manifest: {', '.join(unknown)}")
+        return {t: available[t] for t in req.tables}
+
+    def _plan_units(self, writer, job, tables: Dict[str, Dict], req) -> Dict[str, List[RangeCheckpoint]]:
+        """
+        Creates missing tables and returns, per table, the files still to
+        load as checkpoints. Rows of files committed by an earlier attempt
+        count as processed.
+        """
+        store = PostgresCheckpointStore() if req.checkpoints else None
+        units = {}
+
+        with writer.session() as session:
+            if store is not None:
+                with session.cursor() as cursor:
+                    store.ensure_table(cursor)
+
+            job.processed_rows = 0
+            for table, entry in tables.items():
+                session.execute_sql(entry["create_sql"])
+
+                planned = [
+                    RangeCheckpoint(job.job_id, table, None, f["part"], f["part"] + 1)
+                    for f in entry["files"]
+                ]
+                if store is None:
+                    units[table] = planned
+                    continue
+
+                with session.cursor() as cursor:
+                    store.create(cursor, planned)
+                    stored = store.load(cursor, job.job_id, table)
+                job.processed_rows += sum(cp.rows_copied for cp in stored if cp.completed)
+                units[table] = [cp for cp in stored if not cp.completed]
+                if not units[table]:
+                    job.record_table_done(table)
+
+        return units
+
+    # =====================================================
+    # INTERNAL – PARALLEL LOAD
+    # =====================================================
+    def _load_tables(self, job, writer, tables: Dict[str, Dict], units: Dict[str, List[RangeCheckpoint]], req) -> None:
+        """
+        Files of every ready table share the worker pool; a table becomes
+        ready once the tables it references are loaded, as in a migration.
+        """
+        scheduler = TableScheduler(
+            tables=list(units),
+            sizes={t: tables[t]["rows"] for t in units},
+            dependencies={t: set(tables[t]["depends_on"]) for t in units},
+        )
+        stop = threading.Event()
+        remaining = {table: len(pending) for table, pending in units.items()}
+
+        with ThreadPoolExecutor(
+            max_workers=req.workers,
+            thread_name_prefix=f"load-{job.job_id[:8]}",
+        ) as executor:
+            running = {}
+            try:
+                while scheduler.has_work():
+                    if job.is_stopped:
+                        stop.set()
+                        return
+
+                    for table in scheduler.take_ready(len(units)):
+                        if not remaining[table]:
+                            scheduler.mark_done(table)
+                            continue
+                        files = {f["part"]: f for f in tables[table]["files"]}
+                        for unit in units[table]:
+                            future = executor.submit(
+                                self._load_file, job, writer, tables[table], files[unit.range_start], unit, req, stop
+                            )
+                            running[future] = table
+
+                    if not running:
+                        continue
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        table = running.pop(future)
+                        if not future.result():
+                            # No se cargó (job parado): la tabla no cuenta como hecha
+                            continue
+                        remaining[table] -= 1
+                        if not remaining[table]:
+                            scheduler.mark_done(table)
+                            job.record_table_done(table)
+                            self.job_manager.update(job)
+
+            except Exception as e:
+                # Marca el job antes de salir para que los demás ficheros no empiecen
+                stop.set()
+                self._fail_job(job, str(e))
+                raise
+
+    def _load_file(self, job, writer, table_entry: Dict, file_entry: Dict, unit: RangeCheckpoint, req, stop) -> bool:
+        """Loads one file in its own transaction; False if skipped because the job stopped."""
+        if job.is_stopped or stop.is_set():
+            return False
+
+        table = unit.table
+        path = os.path.join(req.spool_dir, file_entry["file"])
+        if not os.path.exists(path):
+            raise ValueError(f"Spool file missing: {file_entry['file']}")
+
+        started = time.perf_counter()
+        with writer.session() as session:
+            with SpoolFileReader(path) as source:
+                session.copy_file(table_entry["copy_sql"], source, file_entry["bytes"])
+                if req.verify_checksums:
+                    source.verify(file_entry["bytes"], file_entry["sha256"])
+
+            if req.checkpoints:
+                # Checkpoint en la transacción del fichero: se confirman juntos
+                unit.advance(None, file_entry["rows"])
+                unit.completed = True
+                session.before_commit.append(
+                    lambda cursor: PostgresCheckpointStore().save(cursor, unit)
+                )
+
+        job.record_stage_times({"write": time.perf_counter() - started}, table=table)
+        job.record_batch(table, file_entry["rows"], file_entry["bytes"])
+        job.record_progress(file_entry["rows"])
+        self.job_manager.update(job)
+        return True
+
+    # =====================================================
+    # INTERNAL – POST-LOAD INDEXES / FOREIGN KEYS
+    # =====================================================
+    def _build_post_load(self, job, writer, tables: Dict[str, Dict], req) -> None:
+        objects = select_post_load(
+            [obj for entry in tables.values() for obj in entry.get("post_load", [])],
+            req.create_indexes,
+            req.create_foreign_keys,
+            tables=tables,
+        )
+        if not objects:
+            return
+
+        PostLoadBuilder(
+            writer,
+            self.job_manager,
+            workers=req.index_workers,
+            settings={"maintenance_work_mem": req.maintenance_work_mem},
+        ).run(job, objects)
+
+    # =====================================================
+    # INTERNAL – JOB FAILURE
+    # =====================================================
+    def _fail_job(self, job, error: str):
+        if job.status == JobStatus.FAILED and error in job.errors:
+            return
+        job.mark_failed(error)
+        self.job_manager.update(job)
@@ -1,6 +1,12 @@
 class SQLBuilder:
     @staticmethod
-    def build_create_table(table: str, schema, converter) -> str:
+    def build_create_table(
+        table: str,
+        schema,
+        converter,
+        unlogged: bool = False,
+        include_primary_key: bool = True,
+    ) -> str:
         cols = []
         pk = []
 
@@ -10,11 +16,60 @@ class SQLBuilder:
             if col["pk"]:
                 pk.append(f'"{col["name"]}"')
 
-        pk_sql = f", PRIMARY KEY ({', '.join(pk)})" if pk else ""
+        pk_sql = f", PRIMARY KEY ({', '.join(pk)})" if pk and include_primary_key else ""
+        unlogged_sql = "UNLOGGED " if unlogged else ""
 
         return f"""
-        CREATE TABLE IF NOT EXISTS "{table}" (
+        CREATE {unlogged_sql}TABLE IF NOT EXISTS "{table}" (
             {", ".join(cols)}
             {pk_sql}
         );
         """
+
+    @staticmethod
+    def build_add_primary_key(table: str, schema) -> str:
+        pk = [f'"{col["name"]}"' for col in schema if col["pk"]]
+        if not pk:
+            return ""
+
+        return f'ALTER TABLE "{table}" ADD PRIMARY KEY ({", ".join(pk)});'
+
+    @staticmethod
+    def build_set_logged(table: str) -> str:
+        return f'ALTER TABLE "{table}" SET LOGGED;'
+
+    @staticmethod
+    def build_create_index(name: str, table: str, columns, descending, unique: bool = False) -> str:
+        keys = ", ".join(
+            f'"{c}" DESC' if desc else f'"{c}"' for c, desc in zip(columns, descending)
+        )
+        unique_sql = "UNIQUE " if unique else ""
+        return f'CREATE {unique_sql}INDEX IF NOT EXISTS "{name}" ON "{table}" ({keys});'
+
+    @staticmethod
+    def build_add_foreign_key(
+        name: str,
+        table: str,
+        columns,
+        ref_table: str,
+        ref_columns,
+        on_delete: str = "NO ACTION",
+        on_update: str = "NO ACTION",
+    ) -> str:
+        # NOT VALID: solo bloquea un instante; las filas existentes se validan después
+        actions = ""
+        if on_delete and on_delete.upper() != "NO ACTION":
+            actions += f" ON DELETE {on_delete.upper()}"
+        if on_update and on_update.upper() != "NO ACTION":
+            actions += f" ON UPDATE {on_update.upper()}"
+
+        cols = ", ".join(f'"{c}"' for c in columns)
+        ref_cols = ", ".join(f'"{c}"' for c in ref_columns)
+        return (
+            f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" '
+            f'FOREIGN KEY ({cols}) REFERENCES "{ref_table}" ({ref_cols}){actions} NOT VALID;'
+        )
+
+    @staticmethod
+    def build_validate_constraint(table: str, name: str) -> str:
+        return f'ALTER TABLE "{table}" VALIDATE CONSTRAINT "{name}";'
@@ -1,6 +1,24 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from src.application.schema.schema_validator import SchemaValidator
-from src.application.migration.sql_builder import SQLBuilder
-from src.domain.models import JobStatus
+from src.application.migration.batch_pipeline import BatchPipeline
+from src.application.migration.batch_sizer import sample_batch_bytes
+from src.application.migration.migration_plan import COPY_FORMATS, MigrationPlan, TablePlan
+from src.application.migration.range_partitioner import KeyRange, RangePartitioner
+from src.domain.models import LoadMode
+from src.infrastructure.adapters.checkpoint_store import (
+    PostgresCheckpointStore,
+    RangeCheckpoint,
+)
+from src.infrastructure.adapters.postgres_writer import (
+    CommitPolicy,
+    copy_batch_writer,
+    insert_batch_writer,
+)
+from src.infrastructure.adapters.quarantine_store import PostgresQuarantineStore
+from src.infrastructure.metrics import BATCH_SECONDS, BYTES_WRITTEN, ROWS_WRITTEN
 
 
 class TableMigrator:
@@ -8,41 +26,96 @@ class TableMigrator:
         self,
         reader,
         writer,
-        converter,
+        plan: MigrationPlan,
         job_manager,
+        load_mode: LoadMode = LoadMode.COPY_CSV,
+        commit_policy: CommitPolicy = None,
+        partitioner: RangePartitioner = None,
+        prefetch_depth: int = 4,
+        checkpoint_store: PostgresCheckpointStore = None,
+        batch_sizer_factory=None,
+        memory_budget=None,
+        fast_load_settings=None,
+        quarantine_store: PostgresQuarantineStore = None,
+        max_bad_rows: int = 0,
     ):
         self.reader = reader
         self.writer = writer
-        self.converter = converter
+        self.plan = plan
         self.job_manager = job_manager
+        self.load_mode = load_mode
+        self.commit_policy = commit_policy or CommitPolicy()
+        self.partitioner = partitioner or RangePartitioner(workers=1)
+        self.prefetch_depth = prefetch_depth
+        self.checkpoint_store = checkpoint_store
+        self.batch_sizer_factory = batch_sizer_factory
+        self.memory_budget = memory_budget
+        # None = carga normal; dict = fast-load con estos ajustes de sesión
+        self.fast_load_settings = fast_load_settings
+        # None = un lote fallido falla el job; store = modo tolerante con presupuesto
+        self.quarantine_store = quarantine_store
+        self.max_bad_rows = max_bad_rows
         self.schema_validator = SchemaValidator()
 
     # =====================================================
     # PUBLIC – MIGRATE SINGLE TABLE
     # =====================================================
-    def migrate(self, job, table: str, batch_size: int) -> None:
-        sqlite_schema = self._get_sqlite_schema(table)
-        postgres_schema = self._get_postgres_schema(table)
+    def migrate(
+        self,
+        job,
+        table: str,
+        batch_size: int,
+        row_count: int = 0,
+    ) -> None:
+        table_plan = self.plan.tables[table]
+        # Snapshot del catálogo: vacío = la tabla aún no existía al compilar el plan
+        postgres_schema = table_plan.postgres_schema
+        fast = False
 
-        self._validate_schema(sqlite_schema, postgres_schema, table)
-        self._create_table_if_needed(table, sqlite_schema)
+        # Una sola conexión (y transacción por intervalo) para toda la tabla
+        with self.writer.session(self.commit_policy) as session:
+            started = time.perf_counter()
+            fast = self._use_fast_load(session, table, postgres_schema)
 
-        self._insert_batches(
-            job=job,
-            table=table,
-            schema=sqlite_schema,
-            batch_size=batch_size,
-        )
+            if postgres_schema and not fast:
+                self._validate_schema(table_plan.sqlite_schema, postgres_schema, table)
+            self._create_table_if_needed(session, table_plan, fast)
+
+            # Una tabla UNLOGGED a medias (p.ej. tras un crash) no es fiable
+            restart = fast and bool(postgres_schema)
+            units = self._plan_work(session, job, table_plan, row_count, restart)
+            job.record_phase("create", time.perf_counter() - started)
+
+        started = time.perf_counter()
+        if len(units) == 1:
+            with self._load_session(fast) as session:
+                self._copy_unit(
+                    session=session,
+                    job=job,
+                    table_plan=table_plan,
+                    batch_size=batch_size,
+                    unit=units[0],
+                )
+        elif units:
+            self._insert_ranges(
+                job=job,
+                table_plan=table_plan,
+                batch_size=batch_size,
+                units=units,
+                fast=fast,
+            )
+        job.record_phase("load", time.perf_counter() - started)
+
+        if fast and not job.is_stopped:
+            self._finalize_fast_load(job, table_plan)
+
+        if not job.is_stopped:
+            job.record_table_done(table)
+            self.job_manager.update(job)
 
     # =====================================================
     # INTERNAL – SCHEMA
     # =====================================================
-    def _get_sqlite_schema(self, table: str):
-        return self.reader.get_table_schema(table)
-
-    def _get_postgres_schema(self, table: str):
-        return self.writer.get_table_schema(table)
-
     def _validate_schema(self, sqlite_schema, postgres_schema, table: str):
         result = self.schema_validator.validate(
             sqlite_schema=sqlite_schema,
@@ -56,43 +129,353 @@ class TableMigrator:
     # =====================================================
     # INTERNAL – TABLE CREATION
     # =====================================================
-    def _create_table_if_needed(self, table: str, schema):
-        sql = SQLBuilder.build_create_table(
-            table=table,
-            schema=schema,
-            converter=self.converter,
+    def _create_table_if_needed(self, session, table_plan: TablePlan, fast: bool = False):
+        session.execute_sql(table_plan.fast_create_sql if fast else table_plan.create_sql)
+
+    # =====================================================
+    # INTERNAL – FAST LOAD
+    # =====================================================
+    def _use_fast_load(self, session, table: str, postgres_schema) -> bool:
+        """
+        Fast-load only touches tables this job owns: new ones, or an
+        UNLOGGED staging table left behind by an earlier attempt.
+        """
+        if self.fast_load_settings is None:
+            return False
+        if not postgres_schema:
+            return True
+        return bool(session.is_unlogged(table))
+
+    def _load_session(self, fast: bool):
+        return self.writer.session(
+            self.commit_policy,
+            settings=self.fast_load_settings if fast else None,
+        )
+
+    def _finalize_fast_load(self, job, table_plan: TablePlan):
+        table = table_plan.table
+
+        # maintenance_work_mem alto: el PK se construye con un único sort
+        with self.writer.session(settings=self.fast_load_settings) as session:
+            started = time.perf_counter()
+            pk_sql = table_plan.add_primary_key_sql
+            if pk_sql and not session.has_primary_key(table):
+                session.execute_sql(pk_sql)
+                session.commit()
+            job.record_phase("primary_key", time.perf_counter() - started)
+
+            started = time.perf_counter()
+            session.execute_sql(table_plan.set_logged_sql)
+            session.commit()
+            job.record_phase("set_logged", time.perf_counter() - started)
+
+    # =====================================================
+    # INTERNAL – WORK PLAN / CHECKPOINTS
+    # =====================================================
+    def _plan_work(self, session, job, table_plan: TablePlan, row_count: int, restart: bool = False):
+        """
+        Units of work (one RangeCheckpoint each) still to copy for ``table``.
+
+        On a resumed job the stored checkpoints are reused as the plan, so
+        ranges line up with what was committed before. Completed units are
+        skipped; a keyless table that was cut mid-way is truncated and
+        reloaded since there is no key to continue from. ``restart``
+        truncates the table and replays every stored unit from scratch.
+        """
+        table = table_plan.table
+
+        if restart:
+            self._truncate(session, job, table)
+
+        if self.checkpoint_store is not None:
+            with session.cursor() as cursor:
+                stored = self.checkpoint_store.load(cursor, job.job_id, table)
+
+            if stored and restart:
+                with session.cursor() as cursor:
+                    for cp in stored:
+                        job.record_progress(-cp.rows_copied)
+                        cp.last_key, cp.rows_copied, cp.completed = None, 0, False
+                        self.checkpoint_store.save(cursor, cp)
+                return stored
+
+            if stored:
+                pending = [cp for cp in stored if not cp.completed]
+                for cp in pending:
+                    if not cp.keyed and cp.rows_copied:
+                        self._truncate(session, job, table)
+                        job.record_progress(-cp.rows_copied)
+                        cp.rows_copied = 0
+                return pending
+
+        units = self._plan_ranges(job, table, table_plan.key_column, row_count)
+
+        if self.checkpoint_store is not None:
+            with session.cursor() as cursor:
+                self.checkpoint_store.create(cursor, units)
+
+        return units
+
+    def _truncate(self, session, job, table: str):
+        session.execute_sql(f'TRUNCATE "{table}"')
+        # Sus filas se recargan (y las malas vuelven a la cuarentena)
+        if self.quarantine_store is not None:
+            with session.cursor() as cursor:
+                cleared = self.quarantine_store.clear(cursor, job.job_id, table)
+            if cleared:
+                job.record_quarantined(-cleared)
+
+    def _plan_ranges(self, job, table: str, column, row_count: int):
+        whole_table = [RangeCheckpoint(job.job_id, table, None, 0, 0)]
+
+        if self.checkpoint_store is None and self.partitioner.workers <= 1:
+            return whole_table
+
+        if column is None:
+            return whole_table
+
+        min_key, max_key = self.reader.get_key_bounds(table, column)
+        if min_key is None:
+            return whole_table
+
+        ranges = self.partitioner.plan(column, min_key, max_key, row_count)
+        if not ranges:
+            ranges = [KeyRange(column, min_key, max_key + 1)]
+
+        return [
+            RangeCheckpoint(job.job_id, table, r.column, r.start, r.end)
+            for r in ranges
+        ]
+
+    # =====================================================
+    # INTERNAL – KEY RANGES
+    # =====================================================
+    def _insert_ranges(self, job, table_plan: TablePlan, batch_size: int, units, fast: bool = False):
+        stop = threading.Event()
+
+        def copy_range(unit):
+            # Cada rango: su propia conexión de lectura y de escritura
+            with self._load_session(fast) as session:
+                self._copy_unit(
+                    session=session,
+                    job=job,
+                    table_plan=table_plan,
+                    batch_size=batch_size,
+                    unit=unit,
+                    stop=stop,
+                )
+
+        with ThreadPoolExecutor(
+            max_workers=self.partitioner.workers,
+            thread_name_prefix=f"range-{table_plan.table[:16]}",
+        ) as executor:
+            futures = [executor.submit(copy_range, u) for u in units]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except Exception:
+                stop.set()
+                raise
+
+    def _copy_unit(self, session, job, table_plan: TablePlan, batch_size: int, unit, stop=None):
+        if self.checkpoint_store is not None:
+            session.before_commit.append(
+                lambda cursor: self.checkpoint_store.save(cursor, unit)
+            )
+
+        self._insert_batches(
+            session=session,
+            job=job,
+            table_plan=table_plan,
+            batch_size=batch_size,
+            unit=unit,
+            stop=stop,
         )
-        self.writer.execute_sql(sql)
+
+        # El commit final de la sesión persiste completed=True junto a los datos
+        if not job.is_stopped and not (stop is not None and stop.is_set()):
+            unit.completed = True
 
     # =====================================================
     # INTERNAL – DATA INSERTION
     # =====================================================
     def _insert_batches(
         self,
+        session,
         job,
-        table: str,
-        schema,
+        table_plan: TablePlan,
         batch_size: int,
+        unit,
+        stop=None,
     ):
-        for batch in self.reader.read_rows(table, batch_size):
-            if job.status == JobStatus.CANCELLED:
-                return
+        batches = self._tracked_batches(
+            job, table_plan.table, batch_size, unit, stop, table_plan.converter,
+            large=table_plan.large_columns,
+        )
+
+        if self.quarantine_store is not None:
+            self._tolerant_load(session, job, table_plan, batches)
+        elif self.load_mode == LoadMode.EXECUTE_BATCH:
+            self._execute_batch_load(session, table_plan, batches)
+        else:
+            self._copy_load(session, table_plan, batches)
 
-            self.writer.insert_rows(
-                table=table,
-                columns=[c["name"] for c in schema],
+    def _execute_batch_load(self, session, table_plan: TablePlan, batches):
+        for batch in batches:
+            session.insert_rows(
+                table=table_plan.table,
+                columns=table_plan.columns,
                 rows=batch,
+                sql=table_plan.insert_sql,
+                large=table_plan.large_columns,
+            )
+
+    def _copy_load(self, session, table_plan: TablePlan, batches):
+        session.copy_rows(
+            table=table_plan.table,
+            columns=table_plan.columns,
+            batches=batches,
+            copy_format=COPY_FORMATS[self.load_mode],
+            column_types=table_plan.column_types,
+            sql=table_plan.copy_sql,
+            large=table_plan.large_columns,
+        )
+
+    # =====================================================
+    # INTERNAL – TOLERANT LOAD (BAD-ROW QUARANTINE)
+    # =====================================================
+    def _tolerant_load(self, session, job, table_plan: TablePlan, batches):
+        """
+        One statement per batch, each inside a savepoint: a failing batch
+        is bisected, its good rows kept and each bad row quarantined in the
+        same transaction. Slower than the streamed COPY, so opt-in.
+        """
+        if self.load_mode == LoadMode.EXECUTE_BATCH:
+            write = insert_batch_writer(
+                table_plan.insert_sql,
+                table_plan.table,
+                table_plan.columns,
+                table_plan.large_columns,
+            )
+        else:
+            write = copy_batch_writer(
+                table_plan.copy_sql,
+                COPY_FORMATS[self.load_mode],
+                table_plan.column_types,
+                table_plan.large_columns,
             )
 
-            self._update_progress(job, len(batch))
+        key_index = None
+        if table_plan.key_column in table_plan.columns:
+            key_index = table_plan.columns.index(table_plan.key_column)
+
+        def reject(row, error):
+            with session.cursor() as cursor:
+                self.quarantine_store.add(
+                    cursor, job.job_id, table_plan.table, table_plan.columns,
+                    row, error, key_index,
+                )
+            total = job.record_quarantined(1)
+            if total > self.max_bad_rows:
+                raise ValueError(
+                    f"Bad-row budget exceeded: {total} rows quarantined "
+                    f"(max_bad_rows={self.max_bad_rows}); last in {table_plan.table}: {error}"
+                )
+
+        for batch in batches:
+            session.write_isolated(batch, write, reject)
+
+    def _tracked_batches(self, job, table: str, batch_size: int, unit, stop=None, convert=None, large=None):
+        def should_stop() -> bool:
+            return job.is_stopped or (stop is not None and stop.is_set())
+
+        # Un sizer por stream: cada tabla/rango tiene su propio ancho de fila
+        sizer = self.batch_sizer_factory() if self.batch_sizer_factory else None
+        fetch_size = sizer.next_size if sizer is not None else batch_size
+
+        keyed = unit.keyed and self.checkpoint_store is not None
+        if keyed:
+            source = self.reader.read_keyed_rows(
+                table,
+                fetch_size,
+                KeyRange(unit.key_column, unit.resume_start, unit.range_end),
+                large=large,
+            )
+        elif unit.keyed:
+            source = self.reader.read_rows(
+                table,
+                fetch_size,
+                key_range=KeyRange(unit.key_column, unit.range_start, unit.range_end),
+                large=large,
+            )
+        else:
+            source = self.reader.read_rows(table, fetch_size, large=large)
+
+        lease = self.memory_budget.lease() if self.memory_budget is not None else None
+
+        convert_stage = None
+        if convert is not None and not convert.is_identity:
+            def convert_stage(item):
+                nbytes, last_key, batch = item
+                return nbytes, last_key, convert(batch)
+
+        pipeline = BatchPipeline(
+            # El lector espera presupuesto hasta que el pipeline se para
+            source=self._reserved(source, lease, keyed, abort=lambda: pipeline.stopped()),
+            convert=convert_stage,
+            depth=self.prefetch_depth,
+            should_stop=should_stop,
+            observe=lambda stage, seconds: BATCH_SECONDS.observe(seconds, table, stage),
+            # Lotes leídos que nadie llegará a escribir: devolver su reserva
+            discard=(lambda item: lease.release(item[0])) if lease is not None else None,
+        )
+
+        batches = iter(pipeline)
+        try:
+            for nbytes, last_key, batch in batches:
+                # Antes de entregar el lote: todo lo entregado está escrito
+                # cuando la sesión hace commit
+                unit.advance(last_key, len(batch))
+
+                started = time.perf_counter()
+                yield batch
+                write_seconds = time.perf_counter() - started
+
+                if lease is not None:
+                    lease.release(nbytes)
+                if sizer is not None:
+                    sizer.observe(len(batch), nbytes, write_seconds)
+
+                ROWS_WRITTEN.inc(len(batch), table)
+                BYTES_WRITTEN.inc(nbytes, table)
+                job.record_batch(table, len(batch), nbytes)
+                self._update_progress(job, len(batch))
+        finally:
+            # El pipeline ya devolvió la reserva de lo que quedó en cola;
+            # close() suelta el lote que se estaba escribiendo, si lo había
+            batches.close()
+            if lease is not None:
+                lease.close()
+            job.record_stage_times(pipeline.timings, table=table)
+
+    @staticmethod
+    def _reserved(source, lease, keyed: bool, abort=None):
+        """
+        Runs on the reader stage: sizes each batch (sampled, for metrics and
+        the sizer) and reserves it against the memory budget before it is
+        queued, which is what blocks reads when too many bytes are in flight.
+        Stops reading if ``abort`` fires while waiting for the budget.
+        """
+        for item in source:
+            last_key, batch = item if keyed else (None, item)
+            nbytes = sample_batch_bytes(batch)
+            if lease is not None and not lease.acquire(nbytes, abort):
+                return
+            yield nbytes, last_key, batch
 
     # =====================================================
     # INTERNAL – JOB PROGRESS
     # =====================================================
     def _update_progress(self, job, processed_rows: int):
-        job.processed_rows += processed_rows
-        job.progress = round(
-            (job.processed_rows / job.total_rows) * 100, 2
-        )
+        job.record_progress(processed_rows)
         self.job_manager.update(job)
-
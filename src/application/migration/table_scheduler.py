@@ -0,0 +1,65 @@
+from typing import Dict, Iterable, List, Set
+
+
+class TableScheduler:
+    """
+    Decides which tables may start next.
+
+    A table becomes ready once every table it references through a foreign
+    key has finished. Among ready tables the largest go first so the big
+    ones do not end up as a single-threaded tail. Reference cycles (and
+    references to tables outside the job) cannot block the run: when
+    nothing is ready and nothing is running, the largest pending table is
+    released and its constraints are left to be checked after the load.
+    """
+
+    def __init__(
+        self,
+        tables: Iterable[str],
+        sizes: Dict[str, int],
+        dependencies: Dict[str, Set[str]],
+    ):
+        self.sizes = sizes
+        self.pending: Set[str] = set(tables)
+        self.running: Set[str] = set()
+        self.done: Set[str] = set()
+
+        self._waiting_on: Dict[str, Set[str]] = {
+            table: (set(dependencies.get(table, ())) & self.pending) - {table}
+            for table in self.pending
+        }
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def has_work(self) -> bool:
+        return bool(self.pending or self.running)
+
+    # ---------------------------
+    # Scheduling
+    # ---------------------------
+    def take_ready(self, limit: int) -> List[str]:
+        if limit <= 0 or not self.pending:
+            return []
+
+        ready = [t for t in self.pending if not self._waiting_on[t]]
+        if not ready and not self.running:
+            ready = [self._largest(self.pending)]
+
+        ready.sort(key=lambda t: (-self.sizes.get(t, 0), t))
+        selected = ready[:limit]
+
+        for table in selected:
+            self.pending.discard(table)
+            self.running.add(table)
+
+        return selected
+
+    def mark_done(self, table: str) -> None:
+        self.running.discard(table)
+        self.done.add(table)
+        for waiting in self._waiting_on.values():
+            waiting.discard(table)
+
+    def _largest(self, tables: Iterable[str]) -> str:
+        return max(tables, key=lambda t: (self.sizes.get(t, 0), t))
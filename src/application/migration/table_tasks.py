@@ -0,0 +1,346 @@
+"""
+Distributed table migration on Celery workers.
+
+The API process keeps the coordinator role: MigrationRunner compiles the
+plan, prepares checkpoints and walks the TableScheduler as usual, but
+instead of running TableMigrator on local threads it sends one
+``migrate_table`` task per ready table through RemoteTableDispatcher.
+Each worker compiles the plan of its table, loads it (with the request's
+range workers) and publishes its counters as the task's PROGRESS state;
+the dispatcher polls the result backend and folds them into the job.
+
+Workers need the SQLite file at the same path as the API (shared
+storage, or the snapshot directory when source_mode=snapshot) and run:
+
+    celery -A src.application.migration.table_tasks:celery_app worker
+
+Task messages carry the request with the postgres_url password redacted,
+so it never reaches the broker or the result backend. Each worker
+resolves it from its own configuration: MIGRATOR_POSTGRES_URL holds the
+full URL of the target it serves and must match the redacted one (same
+user, host, port and database). A URL without a password (peer auth,
+.pgpass, PGPASSWORD) is used as is.
+
+Retries are idempotent because the distributed path requires
+checkpoints: a retried or redelivered task resumes each range from its
+last committed key, and a keyless table cut mid-way is reloaded.
+"""
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+import psycopg2
+
+from src.application.dtos import StartMigrationRequest
+from src.application.migration.migration_plan import MigrationPlanner
+from src.application.migration.migration_runner import MigrationRunner
+from src.domain.models import JobStatus, MigrationJob, SourceMode, is_redacted, redact_password
+from src.infrastructure.adapters.checkpoint_store import PostgresCheckpointStore
+from src.infrastructure.adapters.postgres_writer import PostgreSQLWriter
+from src.infrastructure.adapters.sqlite_reader import SQLiteReader
+from src.infrastructure.celery_app import get_celery_app
+
+
+celery_app = get_celery_app()
+
+# Segundos mínimos entre publicaciones de progreso de una tarea
+PROGRESS_INTERVAL = 1.0
+# Espera antes de reintentar; crece con cada intento
+RETRY_DELAY_SECONDS = 5
+
+# URLs completas que conoce este proceso (coordinador), por su forma redactada:
+# las usa una tarea eager, que corre aquí mismo
+_local_credentials: Dict[str, str] = {}
+_credentials_lock = threading.Lock()
+
+
+# =====================================================
+# WORKER – TASK
+# =====================================================
+@celery_app.task(bind=True, name="migrator.migrate_table")
+def migrate_table(self, job_id: str, request: Dict[str, Any], table: str, row_count: int, source_path: str):
+    req = StartMigrationRequest(**dict(request, postgres_url=resolve_postgres_url(request["postgres_url"])))
+    # Job local del worker: TableMigrator acumula aquí y TaskProgress lo publica
+    job = MigrationJob(job_id=job_id, status=JobStatus.RUNNING, load_mode=req.load_mode)
+    progress = TaskProgress(self, table)
+
+    try:
+        run_table(job, progress, req, table, row_count, source_path)
+    except Exception as e:
+        if not _retryable(e):
+            raise
+        raise self.retry(
+            exc=e,
+            countdown=RETRY_DELAY_SECONDS * (self.request.retries + 1),
+            max_retries=req.task_max_retries,
+        )
+
+    return progress.meta(job)
+
+
+def run_table(job: MigrationJob, progress: "TaskProgress", req, table: str, row_count: int, source_path: str) -> None:
+    pool_size = max(req.pool_size, req.range_workers)
+    reader = SQLiteReader(
+        source_path,
+        pool_size=pool_size + 1,
+        immutable=req.source_mode != SourceMode.LIVE,
+        mmap_size=req.sqlite_mmap_bytes,
+        cache_size=req.sqlite_cache_kib,
+    )
+    writer = PostgreSQLWriter(req.postgres_url, pool_size=pool_size, schema=req.postgres_schema)
+
+    try:
+        plan = MigrationPlanner(reader, writer).compile(req, tables=[table])
+        checkpoint_store = PostgresCheckpointStore()
+
+        with writer.session() as session:
+            with session.cursor() as cursor:
+                checkpoint_store.ensure_table(cursor)
+                stored = checkpoint_store.load(cursor, job.job_id, table)
+        progress.committed = sum(cp.rows_copied for cp in stored)
+
+        table_migrator = MigrationRunner(progress).build_table_migrator(
+            req, reader, writer, plan, checkpoint_store
+        )
+        job.start_load()
+        table_migrator.migrate(
+            job=job,
+            table=table,
+            batch_size=req.batch_size,
+            row_count=row_count,
+        )
+    finally:
+        reader.close()
+        writer.close()
+
+
+def resolve_postgres_url(url: str) -> str:
+    """
+    The full connection URL for the redacted ``url`` of a task message,
+    from this process or the worker's MIGRATOR_POSTGRES_URL.
+    """
+    if not is_redacted(url):
+        return url
+
+    with _credentials_lock:
+        known = _local_credentials.get(url)
+    if known is not None:
+        return known
+
+    configured = os.environ.get("MIGRATOR_POSTGRES_URL")
+    if configured and redact_password(configured) == url:
+        return configured
+    raise ValueError(
+        f"No credentials for {url} on this worker: set MIGRATOR_POSTGRES_URL to its full URL"
+    )
+
+
+def _retryable(error: Exception) -> bool:
+    """Connection-level failures; schema or data errors would fail again."""
+    if isinstance(error, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+        return True
+    if isinstance(error, sqlite3.OperationalError):
+        message = str(error).lower()
+        return "locked" in message or "busy" in message
+    return False
+
+
+class TaskProgress:
+    """
+    JobManager stand-in on a worker.
+
+    TableMigrator calls ``update(job)`` after every batch; at most every
+    PROGRESS_INTERVAL seconds the local job's counters are stored as the
+    task's PROGRESS state. Each run carries its own id and the rows the
+    checkpoints held for the table when it started, which is what lets the
+    coordinator correct its count after a retry.
+    """
+
+    def __init__(self, task, table: str):
+        self.task = task
+        self.table = table
+        self.run_id = uuid.uuid4().hex
+        self.committed = 0
+        self._last_publish = 0.0
+
+    def update(self, job: MigrationJob) -> None:
+        # En modo eager la tarea corre dentro del coordinador: solo cuenta el resultado
+        if self.task.request.is_eager:
+            return
+        now = time.monotonic()
+        if now - self._last_publish < PROGRESS_INTERVAL:
+            return
+        self._last_publish = now
+        self.task.update_state(state="PROGRESS", meta=self.meta(job))
+
+    def meta(self, job: MigrationJob) -> Dict[str, Any]:
+        return {"run": self.run_id, "committed": self.committed, **job.counters()}
+
+
+# =====================================================
+# COORDINATOR – DISPATCH
+# =====================================================
+class RemoteTable:
+    """One table task in flight and the counters already folded into the job."""
+
+    def __init__(self, table: str, result):
+        self.table = table
+        self.result = result
+        self.run: Optional[str] = None
+        self.committed = 0
+        self.seen = _empty_counters()
+
+    def poll(self, job: MigrationJob) -> bool:
+        """Folds new progress into ``job``; True once the task succeeded, raises if it failed."""
+        state = self.result.state
+        if state == "SUCCESS":
+            self.fold(job, self.result.result)
+            return True
+        if state == "FAILURE":
+            raise RuntimeError(f"Table {self.table} failed on a worker: {self.result.result}")
+        if state == "REVOKED":
+            raise RuntimeError(f"Table {self.table} task was revoked")
+        if state == "PROGRESS" and isinstance(self.result.info, dict):
+            self.fold(job, self.result.info)
+        return False
+
+    def fold(self, job: MigrationJob, meta: Dict[str, Any]) -> None:
+        if meta["run"] != self.run:
+            if self.run is not None:
+                # Nueva ejecución (reintento o worker perdido): lo contado por la
+                # anterior que no llegó a confirmarse deja de contar
+                lost = self.committed + self.seen["rows"] - meta["committed"]
+                if lost:
+                    job.record_progress(-lost)
+            self.run = meta["run"]
+            self.committed = meta["committed"]
+            self.seen = _empty_counters()
+
+        rows = meta["rows"] - self.seen["rows"]
+        if rows:
+            job.record_progress(rows)
+
+        new = meta["table_metrics"].get(self.table, {})
+        old = self.seen["table_metrics"].get(self.table, {})
+        batches = new.get("batches", 0) - old.get("batches", 0)
+        if batches:
+            job.record_batch(
+                self.table,
+                rows=new.get("rows", 0) - old.get("rows", 0),
+                nbytes=new.get("bytes", 0) - old.get("bytes", 0),
+                batches=batches,
+            )
+
+        stages = _delta(meta["stage_seconds"], self.seen["stage_seconds"])
+        if stages:
+            job.record_stage_times(stages, table=self.table)
+        for phase, seconds in _delta(meta["phase_seconds"], self.seen["phase_seconds"]).items():
+            job.record_phase(phase, seconds)
+
+        quarantined = meta.get("quarantined", 0) - self.seen.get("quarantined", 0)
+        if quarantined:
+            job.record_quarantined(quarantined)
+
+        self.seen = meta
+
+
+class RemoteTableDispatcher:
+    """
+    Runs the TableScheduler's tables as Celery tasks.
+
+    At most ``req.table_workers`` tables of the job are in flight; the
+    fleet's own concurrency bounds the rest. When the job stops (cancel or
+    a failed table), the tasks still in flight are revoked; a running task
+    is terminated and its open transaction rolled back, so its checkpoints
+    still describe committed data.
+    """
+
+    def __init__(self, job_manager, poll_interval: float = 0.5):
+        self.job_manager = job_manager
+        self.poll_interval = poll_interval
+
+    def run(self, job: MigrationJob, scheduler, req, source_path: str) -> None:
+        if not req.checkpoints:
+            raise ValueError("The celery executor requires checkpoints")
+
+        # Las tareas viajan con la URL redactada (ver resolve_postgres_url)
+        request = req.model_dump(mode="json")
+        request["postgres_url"] = redact_password(req.postgres_url)
+        with _credentials_lock:
+            _local_credentials[request["postgres_url"]] = req.postgres_url
+
+        running: Dict[str, RemoteTable] = {}
+        try:
+            while scheduler.has_work():
+                if job.is_stopped:
+                    self._revoke(running)
+                    return
+
+                for table in scheduler.take_ready(req.table_workers - len(running)):
+                    running[table] = self._submit(
+                        job, req, request, table, scheduler.sizes.get(table, 0), source_path
+                    )
+
+                finished = [table for table, remote in running.items() if remote.poll(job)]
+                for table in finished:
+                    del running[table]
+                    scheduler.mark_done(table)
+                    job.record_table_done(table)
+                self.job_manager.update(job)
+
+                # Cada worker aplica el presupuesto a su tabla; aquí, al job entero
+                if req.quarantine_bad_rows and job.quarantined_rows > req.max_bad_rows:
+                    raise ValueError(
+                        f"Bad-row budget exceeded: {job.quarantined_rows} rows quarantined "
+                        f"(max_bad_rows={req.max_bad_rows})"
+                    )
+
+                if running and not finished:
+                    time.sleep(self.poll_interval)
+
+        except Exception:
+            self._revoke(running)
+            raise
+
+    def _submit(
+        self, job: MigrationJob, req, request: Dict[str, Any], table: str, row_count: int, source_path: str
+    ) -> RemoteTable:
+        options = {"queue": req.task_queue} if req.task_queue else {}
+        result = migrate_table.apply_async(
+            kwargs={
+                "job_id": job.job_id,
+                "request": request,
+                "table": table,
+                "row_count": row_count,
+                "source_path": source_path,
+            },
+            task_id=f"{job.job_id}:{table}:{uuid.uuid4().hex[:8]}",
+            **options,
+        )
+        return RemoteTable(table, result)
+
+    def _revoke(self, running: Dict[str, RemoteTable]) -> None:
+        for remote in running.values():
+            remote.result.revoke(terminate=True)
+
+
+def _empty_counters() -> Dict[str, Any]:
+    return {
+        "rows": 0,
+        "bytes": 0,
+        "table_metrics": {},
+        "stage_seconds": {},
+        "phase_seconds": {},
+        "quarantined": 0,
+    }
+
+
+def _delta(new: Dict[str, float], old: Dict[str, float]) -> Dict[str, float]:
+    return {
+        key: value - old.get(key, 0.0)
+        for key, value in new.items()
+        if value != old.get(key, 0.0)
+    }
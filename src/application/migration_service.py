@@ -1,63 +1,387 @@
+import os
 import uuid
-import threading
+from typing import Optional
+from urllib.parse import urlsplit
+
+import psycopg2
 
 from src.application.dtos import (
     StartMigrationRequest,
     StartMigrationResponse,
+    PlanMigrationRequest,
+    MigrationPlanResponse,
+    StartSyncRequest,
+    StartVerificationRequest,
+    StartExportRequest,
+    StartSpoolLoadRequest,
+    ResumeJobRequest,
     JobStatusResponse,
     JobErrorResponse,
 )
+from src.application.jobs.job_events import JobEventStream
 from src.application.jobs.job_manager import JobManager
+from src.application.jobs.job_store import JobStore
+from src.application.jobs.job_scheduler import JobScheduler
+from src.application.migration.delta_sync import DeltaSyncRunner
+from src.application.migration.migration_plan import MigrationPlanner
 from src.application.migration.migration_runner import MigrationRunner
-from src.domain.models import MigrationJob
+from src.application.migration.spool_export import SpoolExportRunner
+from src.application.migration.spool_load import SpoolLoadRunner
+from src.application.verification.verification_runner import VerificationRunner
+from src.domain.models import (
+    JobExecutor,
+    JobStatus,
+    JobType,
+    LoadMode,
+    MigrationJob,
+    is_redacted,
+    redact_password,
+)
+from src.infrastructure.adapters.sqlite_reader import SQLiteReader
+from src.infrastructure.adapters.postgres_writer import PostgreSQLWriter
+from src.infrastructure.adapters.quarantine_store import PostgresQuarantineStore
+from src.infrastructure.metrics import metrics
+
+
+# Jobs que se reanudan desde sus checkpoints: request y runner de cada tipo
+RESUMABLE_JOBS = {
+    JobType.MIGRATION: (StartMigrationRequest, MigrationRunner),
+    JobType.LOAD: (StartSpoolLoadRequest, SpoolLoadRunner),
+}
 
 
 class MigrationService:
-    def __init__(self):
-        self.job_manager = JobManager()
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_per_target: int = 2,
+        max_per_source: int = 2,
+        job_store: Optional[JobStore] = None,
+    ):
+        self.job_manager = JobManager(store=job_store)
+        self.scheduler = JobScheduler(
+            max_workers=max_workers,
+            max_per_target=max_per_target,
+            max_per_source=max_per_source,
+        )
+        metrics.register_collector(self._collect_job_metrics)
 
     def start_migration(self, req: StartMigrationRequest) -> StartMigrationResponse:
+        if req.executor == JobExecutor.CELERY and not req.checkpoints:
+            # Sin checkpoints un reintento de tarea duplicaría filas
+            raise ValueError("The celery executor requires checkpoints")
+
         job_id = str(uuid.uuid4())
-        job = MigrationJob(job_id=job_id)
+        job = MigrationJob(
+            job_id=job_id,
+            load_mode=req.load_mode,
+            request=req.model_dump(mode="json"),
+        )
 
         self.job_manager.create(job)
+        self._launch(job, req, MigrationRunner)
 
-        thread = threading.Thread(
-            target=self._run_async,
-            args=(job_id, req),
-            daemon=True,
+        return StartMigrationResponse(
+            job_id=job_id,
+            status=job.status,
+            message="Migration job queued",
         )
-        thread.start()
 
-        job.mark_running()
-        self.job_manager.update(job)
+    def plan_migration(self, req: PlanMigrationRequest) -> MigrationPlanResponse:
+        """Dry run: compiles the plan a migration job would execute, without loading data."""
+        reader = SQLiteReader(
+            req.sqlite_path,
+            pool_size=1,
+            read_only=True,
+            mmap_size=req.sqlite_mmap_bytes,
+            cache_size=req.sqlite_cache_kib,
+        )
+        writer = PostgreSQLWriter(req.postgres_url, pool_size=1, schema=req.postgres_schema)
+
+        try:
+            planner = MigrationPlanner(reader, writer)
+            plan = planner.compile(req)
+            if req.measure_throughput:
+                planner.estimate_duration(plan, req.sample_rows)
+            return MigrationPlanResponse(**plan.describe())
+        finally:
+            reader.close()
+            writer.close()
+
+    def start_sync(self, req: StartSyncRequest) -> StartMigrationResponse:
+        job_id = str(uuid.uuid4())
+        job = MigrationJob(
+            job_id=job_id,
+            job_type=JobType.SYNC,
+            request=req.model_dump(mode="json"),
+        )
+
+        self.job_manager.create(job)
+        self._launch(job, req, DeltaSyncRunner)
+
+        return StartMigrationResponse(
+            job_id=job_id,
+            status=job.status,
+            message="Delta sync job queued",
+        )
+
+    def start_verification(self, req: StartVerificationRequest) -> StartMigrationResponse:
+        job_id = str(uuid.uuid4())
+        job = MigrationJob(
+            job_id=job_id,
+            job_type=JobType.VERIFY,
+            request=req.model_dump(mode="json"),
+        )
+
+        self.job_manager.create(job)
+        self._launch(job, req, VerificationRunner)
+
+        return StartMigrationResponse(
+            job_id=job_id,
+            status=job.status,
+            message="Verification job queued",
+        )
+
+    def start_export(self, req: StartExportRequest) -> StartMigrationResponse:
+        if req.load_mode == LoadMode.EXECUTE_BATCH:
+            raise ValueError("Spool files are COPY payloads: use copy_csv or copy_binary")
+
+        job_id = str(uuid.uuid4())
+        job = MigrationJob(
+            job_id=job_id,
+            job_type=JobType.EXPORT,
+            load_mode=req.load_mode,
+            request=req.model_dump(mode="json"),
+        )
+
+        self.job_manager.create(job)
+        self._launch(job, req, SpoolExportRunner)
+
+        return StartMigrationResponse(
+            job_id=job_id,
+            status=job.status,
+            message="Export job queued",
+        )
+
+    def start_load(self, req: StartSpoolLoadRequest) -> StartMigrationResponse:
+        job_id = str(uuid.uuid4())
+        job = MigrationJob(
+            job_id=job_id,
+            job_type=JobType.LOAD,
+            request=req.model_dump(mode="json"),
+        )
+
+        self.job_manager.create(job)
+        self._launch(job, req, SpoolLoadRunner)
+
+        return StartMigrationResponse(
+            job_id=job_id,
+            status=job.status,
+            message="Spool load job queued",
+        )
+
+    def resume_migration(self, job_id: str, resume: Optional[ResumeJobRequest] = None) -> StartMigrationResponse:
+        job = self.job_manager.get(job_id)
+
+        if job.status in (JobStatus.PENDING, JobStatus.RUNNING):
+            raise ValueError(f"Job {job_id} is still running")
+        if job.job_type not in RESUMABLE_JOBS:
+            raise ValueError(f"Job {job_id} is not a migration or load job; start a new one instead")
+        if job.request is None:
+            raise ValueError(f"Job {job_id} has no stored request to resume from")
+
+        job.request = self._resume_request(job, resume.postgres_url if resume else None)
+        request_cls, runner_cls = RESUMABLE_JOBS[job.job_type]
+        req = request_cls(**job.request)
+        if not req.checkpoints:
+            raise ValueError(f"Job {job_id} was started without checkpoints")
+
+        self._launch(job, req, runner_cls)
 
         return StartMigrationResponse(
             job_id=job_id,
             status=job.status,
-            message="Migration job started successfully",
+            message=f"{job.job_type.value.capitalize()} job queued to resume from last checkpoint",
+        )
+
+    def _resume_request(self, job: MigrationJob, postgres_url: Optional[str]) -> dict:
+        """
+        The stored request with a usable postgres_url: jobs restored from the
+        job store only have it with the password redacted.
+        """
+        stored = job.request["postgres_url"]
+        if postgres_url is None:
+            if is_redacted(stored):
+                raise ValueError(
+                    f"Job {job.job_id} was restored without its database password; "
+                    "supply postgres_url to resume it"
+                )
+            return job.request
+
+        # Misma base de datos y usuario: solo cambia la contraseña
+        if redact_password(postgres_url) != redact_password(stored):
+            raise ValueError(f"postgres_url does not match the target of job {job.job_id}")
+        return dict(job.request, postgres_url=postgres_url)
+
+    def _launch(self, job: MigrationJob, req, runner_cls):
+        # En cola como PENDING; el scheduler lo arranca cuando hay hueco
+        job.mark_queued()
+        self.job_manager.update(job)
+
+        self.scheduler.submit(
+            job.job_id,
+            lambda: self._run_job(runner_cls, job.job_id, req),
+            priority=req.priority,
+            **_job_resources(req),
         )
 
-    def _run_async(self, job_id: str, req: StartMigrationRequest):
-        runner = MigrationRunner(self.job_manager)
+    def _run_job(self, runner_cls, job_id: str, req):
+        job = self.job_manager.get(job_id)
+        if job.status == JobStatus.CANCELLED:
+            return
+
+        # Marcar RUNNING antes de arrancar el runner: si falla rápido,
+        # su FAILED no debe quedar pisado
+        job.mark_running()
+        self.job_manager.update(job)
+
+        runner = runner_cls(self.job_manager)
         runner.run(job_id, req)
 
     def get_job_status(self, job_id: str) -> JobStatusResponse:
-        job = self.job_manager.get(job_id)
+        return self._status_response(self.job_manager.get(job_id))
+
+    def stream_job_events(self, job_id: str, interval: float):
+        """Async iterator of ``(event, data)`` for the job; raises ValueError right away if unknown."""
+        self.job_manager.get(job_id)
+        stream = JobEventStream(
+            self.job_manager,
+            job_id,
+            snapshot=lambda job: self._status_response(job).model_dump(mode="json"),
+            interval=interval,
+        )
+        return stream.events()
+
+    def _status_response(self, job: MigrationJob) -> JobStatusResponse:
         return JobStatusResponse(
             job_id=job.job_id,
+            job_type=job.job_type,
             status=job.status,
             progress=job.progress,
             processed_rows=job.processed_rows,
             total_rows=job.total_rows,
+            total_rows_exact=job.total_rows_exact,
+            load_mode=job.load_mode,
+            rows_per_second=job.rows_per_second,
+            processed_bytes=job.processed_bytes,
+            bytes_per_second=job.bytes_per_second,
+            eta_seconds=job.eta_seconds,
+            connection_stats=job.connection_stats or None,
+            stage_seconds=job.stage_seconds or None,
+            phase_seconds=job.phase_seconds or None,
+            table_metrics=job.table_metrics or None,
+            completed_tables=job.completed_tables or None,
+            queue_position=self.scheduler.position(job.job_id),
+            verification=job.verification or None,
+            post_load=job.post_load or None,
+            quarantined_rows=job.quarantined_rows or None,
             error=job.errors[-1] if job.errors else None,
         )
 
-    def get_job_errors(self, job_id: str) -> JobErrorResponse:
+    def _collect_job_metrics(self):
+        jobs = self.job_manager.list()
+
+        by_status = {}
+        for job in jobs:
+            by_status[job.status.value] = by_status.get(job.status.value, 0) + 1
+        yield (
+            "migrator_jobs", "gauge", "Jobs known to this process by status",
+            [("migrator_jobs", {"status": status}, n) for status, n in by_status.items()],
+        )
+
+        # Solo los jobs en curso: acotan la cardinalidad por job_id
+        running = [j for j in jobs if j.status == JobStatus.RUNNING]
+        gauges = {
+            "migrator_job_progress_percent": ("Progress of running jobs", lambda j: j.progress),
+            "migrator_job_rows_per_second": ("Throughput of running jobs", lambda j: j.rows_per_second),
+            "migrator_job_bytes_per_second": ("Payload throughput of running jobs", lambda j: j.bytes_per_second),
+            "migrator_job_eta_seconds": ("Estimated seconds left for running jobs", lambda j: j.eta_seconds),
+        }
+        for name, (help_text, value) in gauges.items():
+            samples = []
+            for job in running:
+                v = value(job)
+                if v is not None:
+                    samples.append((name, {"job_id": job.job_id, "job_type": job.job_type.value}, v))
+            yield name, "gauge", help_text, samples
+
+    def get_job_errors(
+        self,
+        job_id: str,
+        offset: int = 0,
+        limit: int = 100,
+        table: Optional[str] = None,
+    ) -> JobErrorResponse:
         job = self.job_manager.get(job_id)
-        return JobErrorResponse(job_id=job.job_id, errors=job.errors)
+
+        quarantine = []
+        note = None
+        if job.quarantined_rows and job.request:
+            try:
+                quarantine = self._quarantined_rows(job, offset, limit, table)
+            except psycopg2.OperationalError as e:
+                # Los errores del job están en memoria: se devuelven igualmente
+                note = f"Quarantined rows unavailable, target database unreachable: {str(e).strip().splitlines()[0]}"
+
+        return JobErrorResponse(
+            job_id=job.job_id,
+            errors=job.errors,
+            errors_dropped=job.errors_dropped,
+            quarantined_rows=job.quarantined_rows,
+            quarantine=quarantine,
+            offset=offset,
+            limit=limit,
+            note=note,
+        )
+
+    def _quarantined_rows(self, job: MigrationJob, offset: int, limit: int, table: Optional[str]):
+        """A page of the job's dead-letter rows, read from its target database."""
+        writer = PostgreSQLWriter(
+            job.request["postgres_url"],
+            pool_size=1,
+            schema=job.request.get("postgres_schema", "public"),
+        )
+        store = PostgresQuarantineStore()
+        try:
+            with writer.session() as session:
+                with session.cursor() as cursor:
+                    return store.page(cursor, job.job_id, offset=offset, limit=limit, table=table)
+        finally:
+            writer.close()
 
     def cancel_job(self, job_id: str):
         job = self.job_manager.get(job_id)
+        # Si aún estaba en cola no llega a arrancar; si corre, el runner para
+        self.scheduler.cancel(job_id)
         job.cancel()
         self.job_manager.update(job)
+
+
+def _job_resources(req) -> dict:
+    """
+    Scheduler limits per resource: exports have no target database (their
+    spool directory stands in), loads read their spool directory.
+    """
+    postgres_url = getattr(req, "postgres_url", None)
+    sqlite_path = getattr(req, "sqlite_path", None)
+    spool = getattr(req, "spool_dir", None)
+    return {
+        "target": _target_key(postgres_url) if postgres_url else f"spool:{os.path.realpath(spool)}",
+        "source": os.path.realpath(sqlite_path or spool),
+    }
+
+
+def _target_key(postgres_url: str) -> str:
+    """Target database identity for the per-target limit (no credentials)."""
+    parts = urlsplit(postgres_url)
+    return f"{parts.hostname or 'localhost'}:{parts.port or 5432}{parts.path or '/'}"
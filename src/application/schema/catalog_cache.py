@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.infrastructure.metrics import CATALOG_SECONDS
+
+
+TableSchemas = Dict[str, List[Dict[str, Any]]]
+
+
+class CatalogCache:
+    """
+    Process-wide cache of bulk catalog snapshots.
+
+    Entries are keyed by the source (SQLite file / PostgreSQL URL + schema)
+    and validated against a cheap version token on every lookup: the SQLite
+    ``schema_version`` pragma and the PostgreSQL catalog token. A changed
+    token reloads the snapshot; ``ttl_seconds`` is only a safety net.
+    """
+
+    def __init__(self, ttl_seconds: float = 600.0):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple, Tuple[Any, TableSchemas, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ---------------------------
+    # Sources
+    # ---------------------------
+    def sqlite_schemas(self, reader) -> TableSchemas:
+        return self._get(
+            key=("sqlite", os.path.realpath(reader.sqlite_path)),
+            version=reader.get_schema_version,
+            load=reader.get_all_table_schemas,
+        )
+
+    def sqlite_foreign_keys(self, reader) -> TableSchemas:
+        return self._get(
+            key=("sqlite-fk", os.path.realpath(reader.sqlite_path)),
+            version=reader.get_schema_version,
+            load=reader.get_all_foreign_keys,
+        )
+
+    def sqlite_indexes(self, reader) -> TableSchemas:
+        return self._get(
+            key=("sqlite-index", os.path.realpath(reader.sqlite_path)),
+            version=reader.get_schema_version,
+            load=reader.get_all_indexes,
+        )
+
+    def postgres_schemas(self, writer) -> TableSchemas:
+        return self._get(
+            key=("postgres", writer.postgres_url, writer.schema),
+            version=writer.get_catalog_version,
+            load=writer.get_all_table_schemas,
+        )
+
+    # ---------------------------
+    # Maintenance
+    # ---------------------------
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    # ---------------------------
+    # Internal
+    # ---------------------------
+    def _get(
+        self,
+        key: Tuple,
+        version: Callable[[], Any],
+        load: Callable[[], TableSchemas],
+    ) -> TableSchemas:
+        current = version()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if (
+                entry is not None
+                and entry[0] == current
+                and now - entry[2] < self.ttl_seconds
+            ):
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        started = time.perf_counter()
+        snapshot = load()
+        CATALOG_SECONDS.observe(time.perf_counter() - started, key[0])
+
+        with self._lock:
+            self._entries[key] = (current, snapshot, now)
+        return snapshot
+
+
+catalog_cache = CatalogCache()
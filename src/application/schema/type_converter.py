@@ -3,6 +3,7 @@ class TypeConverter:
         "INTEGER": "BIGINT",
         "INT": "BIGINT",
         "TEXT": "TEXT",
+        "BLOB": "BYTEA",
         "NUMERIC": "NUMERIC",
         "REAL": "DOUBLE PRECISION",
         "DOUBLE": "DOUBLE PRECISION",
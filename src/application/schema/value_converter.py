@@ -0,0 +1,179 @@
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Optional, Tuple
+
+
+# ---------------------------
+# Column converters
+# ---------------------------
+# Each one is specialised for a single target type. SQLite is dynamically
+# typed, so a converter may still see a few storage classes; it checks the
+# value's class once and otherwise returns the value untouched, leaving
+# anything it does not recognise for PostgreSQL to accept or reject.
+
+_BOOLEANS = {
+    0: False, 1: True,
+    "0": False, "1": True,
+    "f": False, "t": True, "F": False, "T": True,
+    "false": False, "true": True, "FALSE": False, "TRUE": True,
+    "False": False, "True": True,
+    "n": False, "y": True, "no": False, "yes": True,
+}
+
+
+def to_bool(value: Any) -> Any:
+    return _BOOLEANS.get(value, value)
+
+
+def parse_timestamp(value: Any) -> Any:
+    """ISO strings and epoch seconds to datetime; anything else unchanged."""
+    cls = value.__class__
+    if cls is str:
+        try:
+            return datetime.fromisoformat(value.strip())
+        except ValueError:
+            return value
+    if cls is int or cls is float:
+        # Epoch en segundos
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    return value
+
+
+def _is_plain_iso(value: str) -> bool:
+    # 'YYYY-MM-DD[ T]HH:MM:SS[.ffffff]' sin zona: PostgreSQL lo lee igual sin parsear
+    return len(value) <= 26 and value.count("-") == 2 and "+" not in value and "Z" not in value
+
+
+def to_timestamp(value: Any) -> Any:
+    """Naive UTC datetime (offsets are applied, like the COPY BINARY encoder)."""
+    if value.__class__ is str and _is_plain_iso(value):
+        return value
+    parsed = parse_timestamp(value)
+    if parsed.__class__ is datetime and parsed.tzinfo is not None:
+        return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def to_timestamptz(value: Any) -> Any:
+    """Aware UTC datetime; naive inputs are taken as UTC."""
+    parsed = parse_timestamp(value)
+    if parsed.__class__ is datetime:
+        if parsed.tzinfo is None:
+            return parsed.replace(tzinfo=timezone.utc)
+        return parsed.astimezone(timezone.utc)
+    return parsed
+
+
+def to_date(value: Any) -> Any:
+    if value.__class__ is str and _is_plain_iso(value):
+        return value
+    parsed = to_timestamp(value)
+    if parsed.__class__ is datetime:
+        return parsed.date()
+    return parsed
+
+
+def to_bytea(value: Any) -> Any:
+    """Bytes pass through untouched; text and numbers become their UTF-8 text."""
+    cls = value.__class__
+    if cls is bytes:
+        return value
+    if cls is str:
+        return value.encode("utf-8")
+    if cls is int or cls is float:
+        return str(value).encode("utf-8")
+    return value
+
+
+def to_text(value: Any) -> Any:
+    # PostgreSQL no admite NUL en text
+    cls = value.__class__
+    if cls is str:
+        return value.replace("\x00", "") if "\x00" in value else value
+    if cls is bytes:
+        # Estricto: un blob que no es UTF-8 hace fallar la fila, no se altera
+        return value.decode("utf-8").replace("\x00", "")
+    return value
+
+
+def converter_for(pg_type: Optional[str]) -> Optional[Callable[[Any], Any]]:
+    """Converter for a target column type, or None for identity passthrough."""
+    pg_type = (pg_type or "").upper()
+
+    if pg_type == "BOOLEAN":
+        return to_bool
+    if pg_type.startswith("TIMESTAMP"):
+        return to_timestamptz if "WITH TIME ZONE" in pg_type else to_timestamp
+    if pg_type == "DATE":
+        return to_date
+    if pg_type == "BYTEA":
+        return to_bytea
+    if pg_type == "TEXT" or pg_type.startswith("CHARACTER") or pg_type.startswith("VARCHAR"):
+        return to_text
+    return None
+
+
+# ---------------------------
+# Column-level fast paths
+# ---------------------------
+def _bool_column(column: Tuple) -> Tuple:
+    # dict.get(valor, valor) en C: sin llamada Python por valor
+    return tuple(map(_BOOLEANS.get, column, column))
+
+
+def _text_column(column: Tuple) -> Tuple:
+    # Caso común: sólo str/None y sin NUL → la columna sale tal cual
+    try:
+        if "\x00" not in "".join(filter(None, column)):
+            return column
+    except TypeError:
+        pass
+    return tuple(map(to_text, column))
+
+
+def _map_column(convert: Callable[[Any], Any]) -> Callable[[Tuple], Tuple]:
+    def convert_column(column: Tuple) -> Tuple:
+        return tuple(map(convert, column))
+
+    return convert_column
+
+
+_COLUMN_FAST_PATHS = {
+    to_bool: _bool_column,
+    to_text: _text_column,
+}
+
+
+# ---------------------------
+# Per-table plan
+# ---------------------------
+class BatchConverter:
+    """
+    Conversion plan for one table, built once from its target column types.
+
+    Only columns that need a conversion are in the plan, each with a
+    function that converts a whole column. A batch is transposed, each
+    planned column is converted in one call, and the columns are zipped
+    back into rows; a table whose plan is empty gets its batches back
+    untouched. All converters pass NULL through.
+    """
+
+    def __init__(self, column_types: List[Optional[str]]):
+        self.plan: List[Tuple[int, Callable[[Tuple], Tuple]]] = []
+        for index, pg_type in enumerate(column_types):
+            convert = converter_for(pg_type)
+            if convert is not None:
+                column_fn = _COLUMN_FAST_PATHS.get(convert) or _map_column(convert)
+                self.plan.append((index, column_fn))
+
+    @property
+    def is_identity(self) -> bool:
+        return not self.plan
+
+    def __call__(self, rows: List[Tuple]) -> List[Tuple]:
+        if not self.plan or not rows:
+            return rows
+
+        columns = list(zip(*rows))
+        for index, convert_column in self.plan:
+            columns[index] = convert_column(columns[index])
+        return list(zip(*columns))
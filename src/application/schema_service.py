@@ -0,0 +1,39 @@
+from src.application.migration.sql_builder import SQLBuilder
+from src.application.schema.catalog_cache import catalog_cache
+from src.application.schema.type_converter import TypeConverter
+from src.infrastructure.adapters.postgres_writer import PostgreSQLWriter
+from src.infrastructure.adapters.sqlite_reader import SQLiteReader
+
+
+class SchemaService:
+    def __init__(self):
+        self.converter = TypeConverter()
+
+    def generate_schema(self, sqlite_path: str) -> str:
+        reader = SQLiteReader(sqlite_path, pool_size=1)
+        try:
+            schemas = catalog_cache.sqlite_schemas(reader)
+        finally:
+            reader.close()
+
+        if not schemas:
+            raise ValueError(f"No tables found in {sqlite_path}")
+
+        return "\n".join(
+            SQLBuilder.build_create_table(
+                table=table,
+                schema=schema,
+                converter=self.converter,
+            )
+            for table, schema in schemas.items()
+        )
+
+    def apply_schema(self, postgres_url: str, schema_sql: str) -> None:
+        if not schema_sql.strip():
+            raise ValueError("schema_sql is empty")
+
+        writer = PostgreSQLWriter(postgres_url, pool_size=1)
+        try:
+            writer.execute_sql(schema_sql)
+        finally:
+            writer.close()
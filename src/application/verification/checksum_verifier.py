@@ -0,0 +1,234 @@
+import math
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.application.migration.range_partitioner import KeyRange
+from src.application.verification.row_hasher import RowHasher
+
+
+INTEGER_TYPES = ("SMALLINT", "INTEGER", "BIGINT")
+MAX_TOP_RANGES = 4096
+READ_BATCH = 10_000
+
+# Los hashes de timestamptz se calculan en UTC (ver RowHasher)
+HASH_SETTINGS = {"TimeZone": "UTC"}
+
+Digest = Tuple[int, int]
+
+
+class ChecksumVerifier:
+    """
+    Compares a table on both sides without shipping its rows.
+
+    The integer primary key space is cut into ranges of ~``chunk_rows``
+    keys; each range is reduced to ``(count, sum of row hashes)`` on both
+    sides (streamed in Python for SQLite, one aggregate in PostgreSQL) and
+    the ranges are compared in parallel. Only ranges that differ are split
+    ``fanout`` ways and compared again, down to ``leaf_rows``, where the
+    individual row hashes are diffed to name the missing, extra and
+    changed keys. Tables without a single integer key get one whole-table
+    digest.
+    """
+
+    def __init__(
+        self,
+        reader,
+        writer,
+        workers: int = 4,
+        chunk_rows: int = 100_000,
+        leaf_rows: int = 1_000,
+        fanout: int = 16,
+        max_reported_keys: int = 100,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ):
+        self.reader = reader
+        self.writer = writer
+        self.workers = workers
+        self.chunk_rows = chunk_rows
+        self.leaf_rows = leaf_rows
+        self.fanout = max(2, fanout)
+        self.max_reported_keys = max_reported_keys
+        self.should_stop = should_stop or (lambda: False)
+
+    # ---------------------------
+    # Table
+    # ---------------------------
+    def verify_table(
+        self,
+        table: str,
+        sqlite_schema: List[Dict],
+        postgres_schema: List[Dict],
+        on_rows: Callable[[int], None] = lambda rows: None,
+    ) -> Dict[str, Any]:
+        report: Dict[str, Any] = {
+            "status": "match",
+            "key_column": None,
+            "rows_source": 0,
+            "rows_target": 0,
+            "ranges_checked": 0,
+            "ranges_mismatched": 0,
+            "missing_rows": 0,
+            "extra_rows": 0,
+            "changed_rows": 0,
+            "missing_keys": [],
+            "extra_keys": [],
+            "changed_keys": [],
+        }
+
+        if not postgres_schema:
+            report.update(status="mismatch", error="table missing in PostgreSQL")
+            return report
+
+        columns = [c["name"] for c in sqlite_schema]
+        pg_types = {c["name"]: c["type"] for c in postgres_schema}
+        absent = [c for c in columns if c not in pg_types]
+        if absent:
+            report.update(
+                status="mismatch",
+                error=f"columns missing in PostgreSQL: {', '.join(absent)}",
+            )
+            return report
+
+        hasher = RowHasher(columns, pg_types)
+        key = self._key_column(sqlite_schema, pg_types)
+
+        if key is None:
+            source, target = self._compare(table, hasher, None)
+            report.update(rows_source=source[0], rows_target=target[0], ranges_checked=1)
+            on_rows(source[0])
+            if source != target:
+                report.update(status="mismatch", ranges_mismatched=1)
+            return report
+
+        report["key_column"] = key
+        self._verify_ranges(table, hasher, key, columns.index(key), report, on_rows)
+
+        if report["ranges_mismatched"]:
+            report["status"] = "mismatch"
+        if self.should_stop():
+            report["status"] = "incomplete"
+        return report
+
+    def _key_column(self, sqlite_schema: List[Dict], pg_types: Dict[str, str]) -> Optional[str]:
+        pk = [c for c in sqlite_schema if c["pk"]]
+        if len(pk) != 1:
+            return None
+        column = pk[0]
+        if "INT" not in (column["type"] or "").upper():
+            return None
+        if pg_types[column["name"]].upper() not in INTEGER_TYPES:
+            return None
+        return column["name"]
+
+    # ---------------------------
+    # Range comparison / drill-down
+    # ---------------------------
+    def _verify_ranges(self, table: str, hasher: RowHasher, key: str, key_index: int, report, on_rows):
+        bounds = self._key_bounds(table, key)
+        if bounds is None:
+            return
+
+        top = self._split(key, bounds[0], bounds[1], self._top_parts(bounds))
+
+        with ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix=f"verify-{table[:16]}",
+        ) as executor:
+            pending = {
+                executor.submit(self._compare, table, hasher, key_range): ("range", key_range, True)
+                for key_range in top
+            }
+
+            while pending:
+                if self.should_stop():
+                    for future in pending:
+                        future.cancel()
+                    return
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, key_range, is_top = pending.pop(future)
+
+                    if kind == "rows":
+                        self._record_row_diff(report, future.result())
+                        continue
+
+                    source, target = future.result()
+                    report["ranges_checked"] += 1
+                    if is_top:
+                        report["rows_source"] += source[0]
+                        report["rows_target"] += target[0]
+                        on_rows(source[0])
+
+                    if source == target:
+                        continue
+                    report["ranges_mismatched"] += 1
+
+                    if max(source[0], target[0]) <= self.leaf_rows or key_range.end - key_range.start <= 1:
+                        task = executor.submit(self._diff_rows, table, hasher, key_index, key_range)
+                        pending[task] = ("rows", key_range, False)
+                        continue
+
+                    for child in self._split(key, key_range.start, key_range.end, self.fanout):
+                        task = executor.submit(self._compare, table, hasher, child)
+                        pending[task] = ("range", child, False)
+
+    def _compare(self, table: str, hasher: RowHasher, key_range) -> Tuple[Digest, Digest]:
+        count = 0
+        total = 0
+        for rows in self.reader.read_rows(table, READ_BATCH, key_range):
+            count += len(rows)
+            total += sum(hasher.hash_row(row) for row in rows)
+
+        with self.writer.session(settings=HASH_SETTINGS) as session:
+            target = session.range_digest(table, hasher.sql, key_range)
+
+        return (count, total), target
+
+    def _diff_rows(self, table: str, hasher: RowHasher, key_index: int, key_range) -> Tuple[List, List, List]:
+        source = {}
+        for rows in self.reader.read_rows(table, READ_BATCH, key_range):
+            for row in rows:
+                source[row[key_index]] = hasher.hash_row(row)
+
+        with self.writer.session(settings=HASH_SETTINGS) as session:
+            target = session.range_row_hashes(table, hasher.sql, key_range)
+
+        missing = sorted(k for k in source if k not in target)
+        extra = sorted(k for k in target if k not in source)
+        changed = sorted(k for k in source if k in target and source[k] != target[k])
+        return missing, extra, changed
+
+    def _record_row_diff(self, report, diff) -> None:
+        for name, keys in zip(("missing", "extra", "changed"), diff):
+            report[f"{name}_rows"] += len(keys)
+            listed = report[f"{name}_keys"]
+            listed.extend(keys[: max(0, self.max_reported_keys - len(listed))])
+
+    # ---------------------------
+    # Key space
+    # ---------------------------
+    def _key_bounds(self, table: str, key: str) -> Optional[Tuple[int, int]]:
+        """[lo, hi) covering the keys present on either side, None if both are empty."""
+        source = self.reader.get_key_bounds(table, key)
+        with self.writer.session() as session:
+            target = session.get_key_bounds(table, key)
+
+        lows = [b[0] for b in (source, target) if b[0] is not None]
+        highs = [b[1] for b in (source, target) if b[1] is not None]
+        if not lows:
+            return None
+        return int(min(lows)), int(max(highs)) + 1
+
+    def _top_parts(self, bounds: Tuple[int, int]) -> int:
+        span = bounds[1] - bounds[0]
+        return max(1, min(math.ceil(span / self.chunk_rows), MAX_TOP_RANGES))
+
+    @staticmethod
+    def _split(column: str, start: int, end: int, parts: int) -> List[KeyRange]:
+        parts = max(1, min(parts, end - start))
+        step = math.ceil((end - start) / parts)
+        return [
+            KeyRange(column, lo, min(lo + step, end))
+            for lo in range(start, end, step)
+        ]
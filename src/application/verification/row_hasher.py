@@ -0,0 +1,179 @@
+import hashlib
+import re
+from datetime import date, datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.application.schema.value_converter import parse_timestamp
+
+
+NULL_MARKER = "\\N"
+SEPARATOR = "\x1f"
+FLOAT_PLACES = Decimal("0.000001")
+
+_SCALE = re.compile(r"\(\s*\d+\s*,\s*(\d+)\s*\)")
+
+
+class RowHasher:
+    """
+    Hashes a row to a signed 64-bit integer identically on both sides.
+
+    Every column is rendered to a canonical text — in Python for SQLite
+    rows, and by an equivalent SQL expression in PostgreSQL — chosen by the
+    target column type (booleans as 1/0, floats rounded to 6 places,
+    timestamps as ``YYYY-MM-DD HH:MI:SS.US`` in UTC, bytea as hex). The
+    texts are joined, md5-hashed and truncated to 64 bits, so a range
+    checksum is just ``count`` and ``sum`` of row hashes: order-independent
+    and computable with one aggregate in PostgreSQL.
+
+    PostgreSQL sessions computing hashes must run with ``TimeZone=UTC``.
+    """
+
+    def __init__(self, columns: List[str], pg_types: Dict[str, str]):
+        self.columns = columns
+        self._canonical: List[Callable[[Any], str]] = []
+        parts = []
+
+        for column in columns:
+            pg_type = pg_types[column].upper()
+            to_text, sql = _column_rules(pg_type, f'"{column}"')
+            self._canonical.append(to_text)
+            parts.append(f"coalesce({sql}, '{NULL_MARKER}')")
+
+        row_text = f"concat_ws(chr(31), {', '.join(parts)})"
+        self.sql = f"('x' || substr(md5({row_text}), 1, 16))::bit(64)::bigint"
+
+    def hash_row(self, row: Tuple) -> int:
+        text = SEPARATOR.join(
+            NULL_MARKER if value is None else to_text(value)
+            for to_text, value in zip(self._canonical, row)
+        )
+        digest = hashlib.md5(text.encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big", signed=True)
+
+
+# ---------------------------
+# Canonical text per PostgreSQL type
+# ---------------------------
+def _column_rules(pg_type: str, col: str) -> Tuple[Callable[[Any], str], str]:
+    if pg_type == "BOOLEAN":
+        return _bool_text, f"CASE WHEN {col} THEN '1' ELSE '0' END"
+
+    if pg_type in ("SMALLINT", "INTEGER", "BIGINT"):
+        return _int_text, f"{col}::text"
+
+    if pg_type == "DOUBLE PRECISION":
+        return _float_text(15), f"round({col}::numeric, 6)::text"
+
+    if pg_type == "REAL":
+        return _float_text(6), f"round({col}::numeric, 6)::text"
+
+    if pg_type.startswith("NUMERIC") or pg_type.startswith("DECIMAL"):
+        match = _SCALE.search(pg_type)
+        scale = int(match.group(1)) if match else None
+        return _numeric_text(scale), f"round({col}, 6)::text"
+
+    if pg_type == "DATE":
+        return _date_text, f"to_char({col}, 'YYYY-MM-DD')"
+
+    if pg_type.startswith("TIMESTAMP") and "WITH TIME ZONE" in pg_type:
+        return (
+            _timestamp_text,
+            f"to_char({col} AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI:SS.US')",
+        )
+
+    if pg_type.startswith("TIMESTAMP"):
+        return _timestamp_text, f"to_char({col}, 'YYYY-MM-DD HH24:MI:SS.US')"
+
+    if pg_type == "BYTEA":
+        return _bytes_text, f"encode({col}, 'hex')"
+
+    if pg_type.startswith("CHARACTER(") or pg_type == "CHARACTER":
+        # bpchar::text descarta el relleno de espacios
+        return lambda value: _plain_text(value).rstrip(" "), f"{col}::text"
+
+    return _plain_text, f"{col}::text"
+
+
+def _plain_text(value: Any) -> str:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode("utf-8", errors="replace")
+    return str(value)
+
+
+def _bool_text(value: Any) -> str:
+    if isinstance(value, str):
+        return "1" if value.strip().lower() in ("1", "t", "true", "y", "yes", "on") else "0"
+    return "1" if value else "0"
+
+
+def _int_text(value: Any) -> str:
+    try:
+        return str(int(Decimal(str(value))))
+    except (InvalidOperation, ValueError):
+        return str(value)
+
+
+def _quantize(value: Decimal) -> str:
+    value = value.quantize(FLOAT_PLACES, rounding=ROUND_HALF_UP)
+    if value == 0:
+        value = abs(value)
+    return format(value, "f")
+
+
+def _float_text(digits: int) -> Callable[[Any], str]:
+    # PostgreSQL convierte float a numeric con DBL_DIG / FLT_DIG dígitos
+    def to_text(value: Any) -> str:
+        try:
+            return _quantize(Decimal(format(float(value), f".{digits}g")))
+        except (InvalidOperation, ValueError):
+            return str(value)
+
+    return to_text
+
+
+def _numeric_text(scale) -> Callable[[Any], str]:
+    def to_text(value: Any) -> str:
+        try:
+            number = Decimal(str(value))
+        except InvalidOperation:
+            return str(value)
+        if scale is not None:
+            # El destino ya redondeó al escribir numeric(p, s)
+            number = number.quantize(Decimal(1).scaleb(-scale), rounding=ROUND_HALF_UP)
+        return _quantize(number)
+
+    return to_text
+
+
+def _as_utc_naive(value: Any) -> Any:
+    # Mismo parseo que el BatchConverter usado al cargar
+    parsed = parse_timestamp(value)
+    if parsed.__class__ is date:
+        parsed = datetime(parsed.year, parsed.month, parsed.day)
+    if isinstance(parsed, datetime) and parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _date_text(value: Any) -> str:
+    parsed = _as_utc_naive(value)
+    if isinstance(parsed, datetime):
+        return parsed.date().isoformat()
+    return str(value)
+
+
+def _timestamp_text(value: Any) -> str:
+    parsed = _as_utc_naive(value)
+    if not isinstance(parsed, datetime):
+        return str(value)
+    return (
+        f"{parsed.year:04d}-{parsed.month:02d}-{parsed.day:02d} "
+        f"{parsed.hour:02d}:{parsed.minute:02d}:{parsed.second:02d}.{parsed.microsecond:06d}"
+    )
+
+
+def _bytes_text(value: Any) -> str:
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return bytes(value).hex()
@@ -0,0 +1,96 @@
+from src.application.migration.row_estimator import RowEstimator
+from src.application.schema.catalog_cache import catalog_cache
+from src.application.verification.checksum_verifier import ChecksumVerifier
+from src.domain.models import JobStatus, RowEstimate
+
+from src.infrastructure.adapters.sqlite_reader import SQLiteReader
+from src.infrastructure.adapters.postgres_writer import PostgreSQLWriter
+
+
+class VerificationRunner:
+    def __init__(self, job_manager):
+        self.job_manager = job_manager
+
+    # =====================================================
+    # PUBLIC – RUN VERIFICATION
+    # =====================================================
+    def run(self, job_id: str, req) -> None:
+        job = self.job_manager.get(job_id)
+
+        # Cada comparación de rango usa una conexión por lado
+        reader = SQLiteReader(req.sqlite_path, pool_size=req.workers)
+        writer = PostgreSQLWriter(
+            req.postgres_url,
+            pool_size=req.workers,
+            schema=req.postgres_schema,
+        )
+
+        try:
+            sqlite_schemas = catalog_cache.sqlite_schemas(reader)
+            postgres_schemas = catalog_cache.postgres_schemas(writer)
+            tables = self._select_tables(req, sqlite_schemas)
+
+            estimator = RowEstimator(reader, RowEstimate.AUTO)
+            sizes = estimator.estimate(tables)
+            job.set_total_rows(sum(sizes.values()), exact=estimator.exact)
+            self.job_manager.update(job)
+
+            verifier = ChecksumVerifier(
+                reader=reader,
+                writer=writer,
+                workers=req.workers,
+                chunk_rows=req.chunk_rows,
+                leaf_rows=req.leaf_rows,
+                fanout=req.fanout,
+                max_reported_keys=req.max_reported_keys,
+                should_stop=lambda: job.is_stopped,
+            )
+
+            job.start_load()
+            for table in tables:
+                if job.is_stopped:
+                    break
+
+                report = verifier.verify_table(
+                    table,
+                    sqlite_schemas[table],
+                    postgres_schemas.get(table, []),
+                    on_rows=lambda rows: self._update_progress(job, rows),
+                )
+                job.record_verification(table, report)
+                self.job_manager.update(job)
+
+            if job.status == JobStatus.CANCELLED:
+                return
+
+            job.mark_completed()
+            self.job_manager.update(job)
+
+        except Exception as e:
+            job.mark_failed(str(e))
+            self.job_manager.update(job)
+
+        finally:
+            job.connection_stats = {
+                "sqlite": reader.pool.stats(),
+                "postgres": writer.pool.stats(),
+            }
+            self.job_manager.update(job)
+            reader.close()
+            writer.close()
+
+    # =====================================================
+    # INTERNAL
+    # =====================================================
+    def _select_tables(self, req, sqlite_schemas):
+        if not req.tables:
+            return list(sqlite_schemas)
+
+        unknown = [t for t in req.tables if t not in sqlite_schemas]
+        if unknown:
+            raise ValueError(f"Unknown tables: {', '.join(unknown)}")
+        return list(req.tables)
+
+    def _update_progress(self, job, rows: int):
+        job.record_progress(rows)
+        self.job_manager.update(job)
@@ -1,7 +1,11 @@
+import re
+import threading
+import time
 from enum import Enum
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class JobStatus(str, Enum):
@@ -12,8 +16,70 @@ class JobStatus(str, Enum):
     CANCELLED = "CANCELLED"
 
 
+class JobType(str, Enum):
+    MIGRATION = "migration"
+    SYNC = "sync"
+    VERIFY = "verify"
+    EXPORT = "export"
+    LOAD = "load"
+
+
+class LoadMode(str, Enum):
+    EXECUTE_BATCH = "execute_batch"
+    COPY_CSV = "copy_csv"
+    COPY_BINARY = "copy_binary"
+
+
+class SourceMode(str, Enum):
+    LIVE = "live"
+    SNAPSHOT = "snapshot"
+    IMMUTABLE = "immutable"
+
+
+class JobExecutor(str, Enum):
+    THREADS = "threads"
+    CELERY = "celery"
+
+
+class RowEstimate(str, Enum):
+    EXACT = "exact"
+    MAX_ROWID = "max_rowid"
+    STAT1 = "stat1"
+    AUTO = "auto"
+
+
+# Errores guardados por job: el primero (causa raíz) y los más recientes
+MAX_JOB_ERRORS = 50
+
+# Sustituye la contraseña de postgres_url en los snapshots persistidos
+REDACTED_PASSWORD = "***"
+
+_DSN_PASSWORD = re.compile(r"(\bpassword\s*=\s*)('(?:[^'\\]|\\.)*'|\S+)")
+_QUERY_PASSWORD = re.compile(r"(^|&)(password=)[^&]*")
+
+
+def redact_password(url: str) -> str:
+    """The connection URL (or key=value DSN) with its password replaced."""
+    if "://" not in url:
+        return _DSN_PASSWORD.sub(lambda m: m.group(1) + REDACTED_PASSWORD, url)
+
+    parts = urlsplit(url)
+    netloc = parts.netloc
+    if parts.password is not None:
+        userinfo, host = netloc.rsplit("@", 1)
+        netloc = f"{userinfo.split(':', 1)[0]}:{REDACTED_PASSWORD}@{host}"
+    query = _QUERY_PASSWORD.sub(lambda m: m.group(1) + m.group(2) + REDACTED_PASSWORD, parts.query)
+    return urlunsplit(parts._replace(netloc=netloc, query=query))
+
+
+def is_redacted(url: str) -> bool:
+    """Whether the URL came from a persisted snapshot and lacks its password."""
+    return REDACTED_PASSWORD in url and redact_password(url) == url
+
+
 class MigrationJob(BaseModel):
     job_id: str
+    job_type: JobType = JobType.MIGRATION
     status: JobStatus = JobStatus.PENDING
 
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -21,24 +87,195 @@ class MigrationJob(BaseModel):
 
     progress: float = 0.0
     processed_rows: int = 0
+    processed_bytes: int = 0
     total_rows: Optional[int] = None
+    total_rows_exact: bool = False
+
+    load_mode: LoadMode = LoadMode.COPY_CSV
+    load_seconds: float = 0.0
+
+    connection_stats: Dict[str, Dict[str, int]] = Field(default_factory=dict)
+    stage_seconds: Dict[str, float] = Field(default_factory=dict)
+    phase_seconds: Dict[str, float] = Field(default_factory=dict)
+
+    # Por tabla: rows, bytes, batches y segundos por etapa
+    table_metrics: Dict[str, Dict[str, float]] = Field(default_factory=dict)
+    completed_tables: List[str] = Field(default_factory=list)
+
+    # Informe por tabla de los jobs de verificación
+    verification: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+
+    # Índices y foreign keys creados tras la carga, por nombre
+    post_load: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
 
     errors: List[str] = Field(default_factory=list)
+    errors_dropped: int = 0
+
+    # Filas apartadas al dead-letter en modo tolerante
+    quarantined_rows: int = 0
+
+    # Request original, necesario para reanudar el job
+    request: Optional[Dict[str, Any]] = None
+
+    # Several table workers update the same job concurrently
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _load_started: Optional[float] = PrivateAttr(default=None)
+
+    @property
+    def is_stopped(self) -> bool:
+        return self.status in (JobStatus.CANCELLED, JobStatus.FAILED)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.COMPLETED, JobStatus.CANCELLED, JobStatus.FAILED)
+
+    def snapshot_json(self) -> str:
+        """
+        JSON for the job store. The password in the request's postgres_url
+        is redacted: the live URL stays only in this in-memory object.
+        """
+        # Bajo el lock: los workers mutan dicts/listas del job mientras se serializa
+        with self._lock:
+            job = self
+            if self.request and self.request.get("postgres_url"):
+                request = dict(self.request, postgres_url=redact_password(self.request["postgres_url"]))
+                job = self.model_copy(update={"request": request})
+            return job.model_dump_json()
+
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        if self.load_seconds <= 0:
+            return None
+        return round(self.processed_rows / self.load_seconds, 2)
+
+    @property
+    def bytes_per_second(self) -> Optional[float]:
+        if self.load_seconds <= 0:
+            return None
+        return round(self.processed_bytes / self.load_seconds, 2)
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Remaining rows at the throughput observed so far."""
+        rate = self.rows_per_second
+        if not rate or self.total_rows is None or self.status != JobStatus.RUNNING:
+            return None
+        return round(max(self.total_rows - self.processed_rows, 0) / rate, 1)
 
     # -------- Domain behavior (reglas) --------
+    def mark_queued(self):
+        self.status = JobStatus.PENDING
+        self.updated_at = datetime.utcnow()
+
     def mark_running(self):
         self.status = JobStatus.RUNNING
         self.updated_at = datetime.utcnow()
 
+    def start_load(self):
+        with self._lock:
+            self._load_started = time.monotonic()
+            self.load_seconds = 0.0
+
+    def set_total_rows(self, total: int, exact: bool):
+        with self._lock:
+            self.total_rows = total
+            self.total_rows_exact = exact
+            self._refresh_progress()
+
+    def record_progress(self, rows: int):
+        with self._lock:
+            self.processed_rows += rows
+            self._refresh_progress()
+            if self._load_started is not None:
+                self.load_seconds = time.monotonic() - self._load_started
+            self.updated_at = datetime.utcnow()
+
+    def record_stage_times(self, timings: Dict[str, float], table: Optional[str] = None):
+        with self._lock:
+            table_stats = self._table_stats(table) if table is not None else None
+            for stage, seconds in timings.items():
+                self.stage_seconds[stage] = round(
+                    self.stage_seconds.get(stage, 0.0) + seconds, 4
+                )
+                if table_stats is not None:
+                    key = f"{stage}_seconds"
+                    table_stats[key] = round(table_stats.get(key, 0.0) + seconds, 4)
+
+    def record_batch(self, table: str, rows: int, nbytes: int, batches: int = 1):
+        with self._lock:
+            self.processed_bytes += nbytes
+            table_stats = self._table_stats(table)
+            table_stats["rows"] += rows
+            table_stats["bytes"] += nbytes
+            table_stats["batches"] += batches
+
+    def counters(self) -> Dict[str, Any]:
+        """Copy of the additive counters, to fold a worker's progress into another job."""
+        with self._lock:
+            return {
+                "rows": self.processed_rows,
+                "bytes": self.processed_bytes,
+                "table_metrics": {t: dict(s) for t, s in self.table_metrics.items()},
+                "stage_seconds": dict(self.stage_seconds),
+                "phase_seconds": dict(self.phase_seconds),
+                "quarantined": self.quarantined_rows,
+            }
+
+    def _table_stats(self, table: str) -> Dict[str, float]:
+        stats = self.table_metrics.get(table)
+        if stats is None:
+            stats = self.table_metrics[table] = {"rows": 0, "bytes": 0, "batches": 0}
+        return stats
+
+    def _refresh_progress(self):
+        if self.total_rows:
+            self.progress = round(
+                min(self.processed_rows / self.total_rows, 1.0) * 100, 2
+            )
+
+    def record_phase(self, phase: str, seconds: float):
+        with self._lock:
+            self.phase_seconds[phase] = round(
+                self.phase_seconds.get(phase, 0.0) + seconds, 4
+            )
+
+    def record_quarantined(self, rows: int) -> int:
+        """Adds quarantined rows; returns the job's total."""
+        with self._lock:
+            self.quarantined_rows += rows
+            self.updated_at = datetime.utcnow()
+            return self.quarantined_rows
+
+    def record_table_done(self, table: str):
+        with self._lock:
+            if table not in self.completed_tables:
+                self.completed_tables.append(table)
+
+    def record_verification(self, table: str, report: Dict[str, Any]):
+        with self._lock:
+            self.verification[table] = report
+            if table not in self.completed_tables:
+                self.completed_tables.append(table)
+            self.updated_at = datetime.utcnow()
+
+    def record_post_load(self, name: str, report: Dict[str, Any]):
+        with self._lock:
+            self.post_load[name] = report
+            self.updated_at = datetime.utcnow()
+
     def mark_completed(self):
         self.status = JobStatus.COMPLETED
         self.progress = 100.0
         self.updated_at = datetime.utcnow()
 
     def mark_failed(self, error: str):
-        self.status = JobStatus.FAILED
-        self.errors.append(error)
-        self.updated_at = datetime.utcnow()
+        with self._lock:
+            self.status = JobStatus.FAILED
+            self.errors.append(error)
+            if len(self.errors) > MAX_JOB_ERRORS:
+                del self.errors[1]
+                self.errors_dropped += 1
+            self.updated_at = datetime.utcnow()
 
     def cancel(self):
         self.status = JobStatus.CANCELLED
@@ -0,0 +1,143 @@
+from typing import List, Optional
+
+
+CHECKPOINT_TABLE = "_migration_checkpoints"
+
+
+class RangeCheckpoint:
+    """
+    Progress of one key range (or of a whole keyless table) of a job.
+
+    ``last_key`` / ``rows_copied`` are advanced when a batch is handed to
+    the writer; the session persists them right before each commit, so the
+    stored values always describe exactly the committed data.
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        table: str,
+        key_column: Optional[str],
+        range_start: int,
+        range_end: int,
+        last_key: Optional[int] = None,
+        rows_copied: int = 0,
+        completed: bool = False,
+    ):
+        self.job_id = job_id
+        self.table = table
+        self.key_column = key_column
+        self.range_start = range_start
+        self.range_end = range_end
+        self.last_key = last_key
+        self.rows_copied = rows_copied
+        self.completed = completed
+
+    @property
+    def keyed(self) -> bool:
+        return self.key_column is not None
+
+    @property
+    def resume_start(self) -> int:
+        return self.range_start if self.last_key is None else self.last_key + 1
+
+    def advance(self, last_key: Optional[int], rows: int) -> None:
+        if last_key is not None:
+            self.last_key = last_key
+        self.rows_copied += rows
+
+
+class PostgresCheckpointStore:
+    """
+    Durable checkpoints kept in the target database, next to the data.
+
+    Every method works on the caller's cursor so checkpoint writes share the
+    transaction of the rows they describe.
+    """
+
+    def ensure_table(self, cursor) -> None:
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS "{CHECKPOINT_TABLE}" (
+                job_id TEXT NOT NULL,
+                table_name TEXT NOT NULL,
+                range_start BIGINT NOT NULL,
+                range_end BIGINT NOT NULL,
+                key_column TEXT,
+                last_key BIGINT,
+                rows_copied BIGINT NOT NULL DEFAULT 0,
+                completed BOOLEAN NOT NULL DEFAULT FALSE,
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                PRIMARY KEY (job_id, table_name, range_start)
+            );
+            """
+        )
+
+    def load(self, cursor, job_id: str, table: str) -> List[RangeCheckpoint]:
+        cursor.execute(
+            f"""
+            SELECT key_column, range_start, range_end, last_key,
+                   rows_copied, completed
+            FROM "{CHECKPOINT_TABLE}"
+            WHERE job_id = %s AND table_name = %s
+            ORDER BY range_start;
+            """,
+            (job_id, table),
+        )
+
+        return [
+            RangeCheckpoint(
+                job_id=job_id,
+                table=table,
+                key_column=row[0],
+                range_start=row[1],
+                range_end=row[2],
+                last_key=row[3],
+                rows_copied=row[4],
+                completed=row[5],
+            )
+            for row in cursor.fetchall()
+        ]
+
+    def create(self, cursor, checkpoints: List[RangeCheckpoint]) -> None:
+        for cp in checkpoints:
+            cursor.execute(
+                f"""
+                INSERT INTO "{CHECKPOINT_TABLE}"
+                    (job_id, table_name, range_start, range_end, key_column)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT (job_id, table_name, range_start) DO NOTHING;
+                """,
+                (cp.job_id, cp.table, cp.range_start, cp.range_end, cp.key_column),
+            )
+
+    def save(self, cursor, checkpoint: RangeCheckpoint) -> None:
+        cursor.execute(
+            f"""
+            UPDATE "{CHECKPOINT_TABLE}"
+            SET last_key = %s,
+                rows_copied = %s,
+                completed = %s,
+                updated_at = now()
+            WHERE job_id = %s AND table_name = %s AND range_start = %s;
+            """,
+            (
+                checkpoint.last_key,
+                checkpoint.rows_copied,
+                checkpoint.completed,
+                checkpoint.job_id,
+                checkpoint.table,
+                checkpoint.range_start,
+            ),
+        )
+
+    def rows_copied(self, cursor, job_id: str) -> int:
+        cursor.execute(
+            f"""
+            SELECT COALESCE(SUM(rows_copied), 0)
+            FROM "{CHECKPOINT_TABLE}"
+            WHERE job_id = %s;
+            """,
+            (job_id,),
+        )
+        return int(cursor.fetchone()[0])
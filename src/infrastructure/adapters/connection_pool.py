@@ -0,0 +1,150 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from src.infrastructure.metrics import CONNECTIONS_OPENED
+
+
+class ConnectionPool:
+    """
+    Small thread-safe pool of reusable DB-API connections.
+
+    The adapters hand it a ``factory`` that opens a new connection and an
+    optional ``reset`` hook that leaves a returned connection clean (for
+    example rolling back an open transaction). A connection whose reset
+    fails is discarded instead of being handed out again. ``name`` labels
+    the pool's connection opens in the process metrics.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        max_size: int = 4,
+        reset: Optional[Callable[[Any], None]] = None,
+        name: Optional[str] = None,
+    ):
+        if max_size < 1:
+            raise ValueError("Pool max_size must be at least 1")
+
+        self._factory = factory
+        self._reset = reset
+        self.name = name
+        self.max_size = max_size
+
+        self._idle: List[Any] = []
+        self._cond = threading.Condition()
+        self._open = 0
+        self._in_use = 0
+        self._closed = False
+
+        self._opened = 0
+        self._reused = 0
+        self._discarded = 0
+        self._waits = 0
+
+    # ---------------------------
+    # Acquire / release
+    # ---------------------------
+    def acquire(self, timeout: Optional[float] = None):
+        with self._cond:
+            while not self._idle and self._open >= self.max_size:
+                self._waits += 1
+                if not self._cond.wait(timeout):
+                    raise TimeoutError("Timed out waiting for a pooled connection")
+
+            if self._idle:
+                self._reused += 1
+                self._in_use += 1
+                return self._idle.pop()
+
+            self._open += 1
+            self._in_use += 1
+
+        try:
+            conn = self._factory()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._opened += 1
+        if self.name is not None:
+            CONNECTIONS_OPENED.inc(1, self.name)
+        return conn
+
+    def release(self, conn, discard: bool = False) -> None:
+        if not discard and self._reset is not None:
+            try:
+                self._reset(conn)
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            # Devuelta tras close(): nadie la volverá a cerrar
+            discard = discard or self._closed
+            if discard:
+                self._open -= 1
+                self._discarded += 1
+                self._close_quietly(conn)
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        discard = False
+        try:
+            yield conn
+        except BaseException:
+            discard = self._is_closed(conn)
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    # ---------------------------
+    # Shutdown
+    # ---------------------------
+    def close(self) -> None:
+        """Closes idle connections now and those still in use when they are released."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+
+        for conn in idle:
+            self._close_quietly(conn)
+
+    # ---------------------------
+    # Stats
+    # ---------------------------
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "open": self._open,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "opened": self._opened,
+                "reused": self._reused,
+                "discarded": self._discarded,
+                "waits": self._waits,
+            }
+
+    # ---------------------------
+    # Helpers
+    # ---------------------------
+    @staticmethod
+    def _is_closed(conn) -> bool:
+        return bool(getattr(conn, "closed", False))
+
+    @staticmethod
+    def _close_quietly(conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
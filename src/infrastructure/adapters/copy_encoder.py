@@ -0,0 +1,332 @@
+import struct
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from src.infrastructure.adapters.large_value import LargeColumns, LargeValue
+
+
+PG_EPOCH = datetime(2000, 1, 1)
+PG_EPOCH_DATE = date(2000, 1, 1)
+
+BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+BINARY_TRAILER = struct.pack("!h", -1)
+BINARY_NULL = struct.pack("!i", -1)
+
+
+# ---------------------------
+# File-like adapter for COPY FROM STDIN
+# ---------------------------
+class CopyStream:
+    """
+    Minimal read-only file object fed by an iterator of encoded chunks.
+    psycopg2's copy_expert pulls from it, so rows are encoded on demand
+    and never accumulated for the whole table.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = bytearray()
+        self._exhausted = False
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._exhausted and (size < 0 or len(self._buffer) < size):
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                self._exhausted = True
+
+        if size < 0 or size >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        return data
+
+    readline = read
+
+
+# ---------------------------
+# CSV encoder
+# ---------------------------
+class CsvCopyEncoder:
+    """
+    Encodes rows for COPY ... (FORMAT csv).
+
+    NULL is written as an unquoted empty field and every string is quoted,
+    so empty strings and NULLs never collide.
+    """
+
+    copy_options = "FORMAT csv"
+
+    def header(self) -> bytes:
+        return b""
+
+    def trailer(self) -> bytes:
+        return b""
+
+    def encode_batch(self, rows: Iterable[Tuple]) -> bytes:
+        field = self._field
+        lines = [",".join([field(v) for v in row]) for row in rows]
+        lines.append("")
+        return "\n".join(lines).encode("utf-8")
+
+    def encode_streamed_row(self, row: Tuple, large: LargeColumns) -> Iterator[bytes]:
+        """One row whose LargeValue fields are streamed chunk by chunk."""
+        field = self._field
+        for index, value in enumerate(row):
+            if index:
+                yield b","
+            if value.__class__ is not LargeValue:
+                yield field(value).encode("utf-8")
+            elif large.indexes[index]:
+                yield b"\\x"
+                for chunk in value.chunks(large.chunk_size):
+                    yield chunk.hex().encode("ascii")
+            else:
+                yield b'"'
+                for chunk in value.chunks(large.chunk_size, as_bytes=False):
+                    yield chunk.replace(b'"', b'""')
+                yield b'"'
+        yield b"\n"
+
+    @staticmethod
+    def _field(value) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, str):
+            return '"' + value.replace('"', '""') + '"'
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return "\\x" + bytes(value).hex()
+        if isinstance(value, (int, float, Decimal)):
+            return str(value)
+        return '"' + str(value).replace('"', '""') + '"'
+
+
+# ---------------------------
+# Binary encoder
+# ---------------------------
+def _encode_int8(value) -> bytes:
+    # int() truncaría 1.5 a 1; en CSV PostgreSQL rechaza ese valor, aquí también
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"Non-integral value {value!r} for a BIGINT column")
+    return struct.pack("!iq", 8, int(value))
+
+
+def _encode_float8(value) -> bytes:
+    return struct.pack("!id", 8, float(value))
+
+
+def _encode_bool(value) -> bytes:
+    if isinstance(value, str):
+        value = value.strip().lower() in ("1", "t", "true", "y", "yes")
+    return struct.pack("!ib", 1, 1 if value else 0)
+
+
+def _encode_text(value) -> bytes:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+    else:
+        data = str(value).encode("utf-8")
+    return struct.pack("!i", len(data)) + data
+
+
+def _encode_bytea(value) -> bytes:
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    data = bytes(value)
+    return struct.pack("!i", len(data)) + data
+
+
+def _to_datetime(value) -> datetime:
+    if isinstance(value, datetime):
+        dt = value
+    elif isinstance(value, (int, float)):
+        dt = datetime.fromtimestamp(value, tz=timezone.utc)
+    else:
+        dt = datetime.fromisoformat(str(value).strip())
+
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _encode_timestamp(value) -> bytes:
+    delta: timedelta = _to_datetime(value) - PG_EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return struct.pack("!iq", 8, micros)
+
+
+def _encode_date(value) -> bytes:
+    if isinstance(value, datetime):
+        d = value.date()
+    elif isinstance(value, date):
+        d = value
+    elif isinstance(value, (int, float)):
+        d = _to_datetime(value).date()
+    else:
+        d = date.fromisoformat(str(value).strip()[:10])
+    return struct.pack("!ii", 4, (d - PG_EPOCH_DATE).days)
+
+
+def _encode_numeric(value) -> bytes:
+    number = value if isinstance(value, Decimal) else Decimal(str(value))
+
+    if number.is_nan():
+        body = struct.pack("!hhHH", 0, 0, 0xC000, 0)
+        return struct.pack("!i", len(body)) + body
+    if number.is_infinite():
+        raise ValueError("Infinite NUMERIC values are not supported by COPY BINARY")
+
+    sign, digits, exponent = number.as_tuple()
+    digit_str = "".join(str(d) for d in digits)
+    if exponent > 0:
+        digit_str += "0" * exponent
+        exponent = 0
+
+    dscale = -exponent
+    int_part = digit_str[:-dscale] if dscale else digit_str
+    frac_part = digit_str[-dscale:] if dscale else ""
+    if len(frac_part) < dscale:
+        frac_part = frac_part.zfill(dscale)
+
+    int_part = int_part.lstrip("0")
+    int_part = int_part.zfill((len(int_part) + 3) // 4 * 4)
+    frac_part = frac_part.ljust((len(frac_part) + 3) // 4 * 4, "0")
+
+    groups = [int(int_part[i:i + 4]) for i in range(0, len(int_part), 4)]
+    weight = len(groups) - 1
+    groups += [int(frac_part[i:i + 4]) for i in range(0, len(frac_part), 4)]
+
+    while groups and groups[0] == 0:
+        groups.pop(0)
+        weight -= 1
+    while groups and groups[-1] == 0:
+        groups.pop()
+    if not groups:
+        weight = 0
+
+    body = struct.pack(
+        "!hhHH",
+        len(groups),
+        weight,
+        0x4000 if sign else 0x0000,
+        dscale,
+    )
+    body += struct.pack(f"!{len(groups)}h", *groups)
+    return struct.pack("!i", len(body)) + body
+
+
+BINARY_ENCODERS = {
+    "BIGINT": _encode_int8,
+    "DOUBLE PRECISION": _encode_float8,
+    "BOOLEAN": _encode_bool,
+    "TEXT": _encode_text,
+    "BYTEA": _encode_bytea,
+    "NUMERIC": _encode_numeric,
+    "TIMESTAMP": _encode_timestamp,
+    "DATE": _encode_date,
+}
+
+
+class BinaryCopyEncoder:
+    """
+    Encodes rows for COPY ... (FORMAT binary).
+
+    Each column gets a fixed encoder chosen from its PostgreSQL type,
+    so the row loop never inspects type names.
+    """
+
+    copy_options = "FORMAT binary"
+
+    def __init__(self, column_types: List[str]):
+        self._encoders: List[Callable] = [
+            BINARY_ENCODERS.get(t.upper(), _encode_text) for t in column_types
+        ]
+        self._field_count = struct.pack("!h", len(column_types))
+
+    def header(self) -> bytes:
+        return BINARY_HEADER
+
+    def trailer(self) -> bytes:
+        return BINARY_TRAILER
+
+    def encode_batch(self, rows: Iterable[Tuple]) -> bytes:
+        out = bytearray()
+        encoders = self._encoders
+        field_count = self._field_count
+
+        for row in rows:
+            out += field_count
+            for encode, value in zip(encoders, row):
+                out += BINARY_NULL if value is None else encode(value)
+
+        return bytes(out)
+
+    def encode_streamed_row(self, row: Tuple, large: LargeColumns) -> Iterator[bytes]:
+        """One row whose LargeValue fields are streamed chunk by chunk."""
+        yield self._field_count
+        for index, (encode, value) in enumerate(zip(self._encoders, row)):
+            if value is None:
+                yield BINARY_NULL
+            elif value.__class__ is LargeValue:
+                yield from value.binary_field(large.chunk_size, large.indexes[index])
+            else:
+                yield encode(value)
+
+
+# ---------------------------
+# Factory
+# ---------------------------
+def build_copy_encoder(copy_format: str, column_types: Optional[List[str]] = None):
+    if copy_format == "csv":
+        return CsvCopyEncoder()
+    if copy_format == "binary":
+        if column_types is None:
+            raise ValueError("COPY BINARY requires the PostgreSQL column types")
+        return BinaryCopyEncoder(column_types)
+    raise ValueError(f"Unsupported COPY format: {copy_format}")
+
+
+def iter_copy_chunks(
+    encoder,
+    batches: Iterable[List[Tuple]],
+    large: Optional[LargeColumns] = None,
+) -> Iterator[bytes]:
+    header = encoder.header()
+    if header:
+        yield header
+
+    for batch in batches:
+        if not batch:
+            continue
+        if large is None:
+            yield encoder.encode_batch(batch)
+        else:
+            yield from _iter_streamed_batch(encoder, batch, large)
+
+    trailer = encoder.trailer()
+    if trailer:
+        yield trailer
+
+
+def _iter_streamed_batch(encoder, batch: List[Tuple], large: LargeColumns) -> Iterator[bytes]:
+    # Las filas normales se siguen codificando en bloque; solo las que llevan
+    # un LargeValue se emiten por partes
+    plain = []
+    for row in batch:
+        if large.has_large(row):
+            if plain:
+                yield encoder.encode_batch(plain)
+                plain = []
+            yield from encoder.encode_streamed_row(row, large)
+        else:
+            plain.append(row)
+    if plain:
+        yield encoder.encode_batch(plain)
@@ -0,0 +1,102 @@
+import codecs
+import struct
+from typing import Callable, Dict, Iterator, List
+
+
+DEFAULT_CHUNK_BYTES = 1024 * 1024
+
+
+class LargeColumns:
+    """
+    Columns of one table whose oversized values are streamed, not fetched.
+
+    ``indexes`` maps a column position to True when its target is BYTEA
+    (raw bytes; every declared BLOB column) and False for text (strict
+    UTF-8, NUL removed, like the value converter does). Values longer
+    than ``threshold`` bytes are left in SQLite by the reader and written
+    ``chunk_size`` bytes at a time.
+    """
+
+    def __init__(
+        self,
+        columns: List[str],
+        indexes: Dict[int, bool],
+        threshold: int,
+        chunk_size: int = DEFAULT_CHUNK_BYTES,
+    ):
+        self.columns = columns
+        self.indexes = indexes
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+
+    def has_large(self, row) -> bool:
+        for index in self.indexes:
+            if row[index].__class__ is LargeValue:
+                return True
+        return False
+
+    def describe(self) -> Dict[str, int]:
+        return {self.columns[i]: self.threshold for i in self.indexes}
+
+
+class LargeValue:
+    """
+    Reference to one oversized TEXT/BLOB value still in SQLite.
+
+    The reader puts it in the row in place of the value; writers read it
+    through SQLite's incremental blob I/O, so a single chunk is in memory
+    at a time however large the value is. It can be read any number of
+    times (e.g. when a failing batch is bisected).
+    """
+
+    __slots__ = ("opener", "table", "column", "rowid")
+
+    def __init__(self, opener: Callable, table: str, column: str, rowid: int):
+        self.opener = opener
+        self.table = table
+        self.column = column
+        self.rowid = rowid
+
+    def __repr__(self) -> str:
+        return f"<large value {self.table}.{self.column} rowid={self.rowid}>"
+
+    def chunks(self, chunk_size: int, as_bytes: bool = True) -> Iterator[bytes]:
+        """
+        The value's bytes; ``as_bytes=False`` yields it as UTF-8 text with
+        NULs removed, raising UnicodeDecodeError if it is not valid UTF-8.
+        """
+        raw = self._raw_chunks(chunk_size)
+        return raw if as_bytes else _text_chunks(raw)
+
+    def binary_field(self, chunk_size: int, as_bytes: bool = True) -> Iterator[bytes]:
+        """The value as a COPY BINARY field: int32 length, then the data."""
+        if as_bytes:
+            with self.opener(self.table, self.column, self.rowid) as blob:
+                size = len(blob)
+            yield struct.pack("!i", size)
+        else:
+            # El texto limpio puede medir menos que el blob: primera pasada para medirlo
+            size = sum(len(chunk) for chunk in self.chunks(chunk_size, as_bytes=False))
+            yield struct.pack("!i", size)
+        yield from self.chunks(chunk_size, as_bytes)
+
+    def _raw_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        with self.opener(self.table, self.column, self.rowid) as blob:
+            while True:
+                chunk = blob.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+
+def _text_chunks(raw: Iterator[bytes]) -> Iterator[bytes]:
+    # Decodificador incremental: un carácter multibyte puede quedar partido entre chunks.
+    # Estricto: bytes que no son UTF-8 hacen fallar la fila en vez de alterarla
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in raw:
+        text = decoder.decode(chunk)
+        if text:
+            yield text.replace("\x00", "").encode("utf-8")
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail.replace("\x00", "").encode("utf-8")
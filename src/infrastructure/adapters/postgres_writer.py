@@ -1,32 +1,425 @@
-from typing import List, Dict, Tuple
+import struct
+import time
+from typing import Callable, List, Dict, Tuple, Iterable, Iterator, Optional
 import psycopg2
 from psycopg2.extras import execute_batch
 
+from src.infrastructure.adapters.connection_pool import ConnectionPool
+from src.infrastructure.adapters.copy_encoder import (
+    BinaryCopyEncoder,
+    CopyStream,
+    CsvCopyEncoder,
+    build_copy_encoder,
+    iter_copy_chunks,
+)
+from src.infrastructure.adapters.large_value import LargeColumns, LargeValue
+from src.infrastructure.metrics import COMMIT_SECONDS
+
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+COPY_OPTIONS = {
+    "csv": CsvCopyEncoder.copy_options,
+    "binary": BinaryCopyEncoder.copy_options,
+}
+
+# Fallos atribuibles a las filas (tipo, constraint, valor no codificable);
+# los de conexión o sintaxis no se aíslan por bisección
+ROW_ERRORS = (
+    psycopg2.DataError,
+    psycopg2.IntegrityError,
+    ValueError,
+    TypeError,
+    OverflowError,
+    struct.error,
+)
+
+
+# ---------------------------
+# Statement builders (precomputed by the migration plan)
+# ---------------------------
+def build_insert_sql(table: str, columns: List[str]) -> str:
+    col_names = ", ".join(f'"{c}"' for c in columns)
+    placeholders = ", ".join(["%s"] * len(columns))
+    return f'INSERT INTO "{table}" ({col_names}) VALUES ({placeholders})'
+
+
+def build_copy_sql(table: str, columns: List[str], copy_format: str = "csv") -> str:
+    col_names = ", ".join(f'"{c}"' for c in columns)
+    return f'COPY "{table}" ({col_names}) FROM STDIN WITH ({COPY_OPTIONS[copy_format]})'
+
+
+def insert_batch_writer(sql: str, table: str, columns: List[str], large: Optional[LargeColumns] = None) -> Callable:
+    """``write(cursor, rows)`` for PostgresSession.write_isolated, via execute_batch."""
+    def write(cursor, rows: List[Tuple]) -> None:
+        _insert_batch(cursor, sql, table, columns, rows, large)
+    return write
+
+
+def copy_batch_writer(
+    sql: str,
+    copy_format: str = "csv",
+    column_types: Optional[List[str]] = None,
+    large: Optional[LargeColumns] = None,
+) -> Callable:
+    """``write(cursor, rows)`` for PostgresSession.write_isolated: one COPY per call."""
+    encoder = build_copy_encoder(copy_format, column_types)
+
+    def write(cursor, rows: List[Tuple]) -> None:
+        stream = CopyStream(iter_copy_chunks(encoder, [rows], large))
+        cursor.copy_expert(sql, stream, size=COPY_BUFFER_SIZE)
+    return write
+
+
+def _insert_batch(cursor, sql: str, table: str, columns: List[str], rows: List[Tuple], large: Optional[LargeColumns]) -> None:
+    if large is not None:
+        streamed = [row for row in rows if large.has_large(row)]
+        if streamed:
+            rows = [row for row in rows if not large.has_large(row)]
+            for row in streamed:
+                _insert_streamed_row(cursor, table, columns, row, large)
+
+    if rows:
+        execute_batch(cursor, sql, rows, page_size=1000)
+
+
+def _insert_streamed_row(cursor, table: str, columns: List[str], row: Tuple, large: LargeColumns) -> None:
+    """
+    INSERT path for a row with LargeValues: each one is written in chunks
+    to a temporary large object, the row is inserted reading it back with
+    lo_get() on the server, and the large objects are unlinked. The client
+    never holds more than one chunk.
+    """
+    placeholders = []
+    params = []
+    oids = []
+    for index, value in enumerate(row):
+        if value.__class__ is not LargeValue:
+            placeholders.append("%s")
+            params.append(value)
+            continue
+
+        as_bytes = large.indexes[index]
+        lob = cursor.connection.lobject(0, "wb")
+        try:
+            for chunk in value.chunks(large.chunk_size, as_bytes):
+                lob.write(chunk)
+        finally:
+            lob.close()
+        oids.append(lob.oid)
+        placeholders.append("lo_get(%s)" if as_bytes else "convert_from(lo_get(%s), 'UTF8')")
+        params.append(lob.oid)
+
+    col_names = ", ".join(f'"{c}"' for c in columns)
+    cursor.execute(
+        f'INSERT INTO "{table}" ({col_names}) VALUES ({", ".join(placeholders)})',
+        params,
+    )
+    cursor.execute("SELECT lo_unlink(oid) FROM unnest(%s::oid[]) AS oid", (oids,))
+
+
+def search_path_option(schema: str) -> str:
+    """
+    libpq ``options`` setting search_path to ``schema``. The name is
+    quoted as an identifier and its spaces/backslashes escaped, so it
+    cannot add further ``-c`` settings to the connection.
+    """
+    identifier = '"' + schema.replace('"', '""') + '"'
+    return "-c search_path=" + identifier.replace("\\", "\\\\").replace(" ", "\\ ")
+
+
+def estimate_batch_bytes(rows: List[Tuple]) -> int:
+    """Cheap payload estimate used by commit intervals (not exact wire size)."""
+    total = 0
+    for row in rows:
+        for value in row:
+            if isinstance(value, (str, bytes, bytearray, memoryview)):
+                total += len(value)
+            else:
+                total += 8
+    return total
+
+
+class CommitPolicy:
+    """
+    When a session commits: after ``every_batches`` batches or
+    ``every_bytes`` estimated bytes, whichever comes first.
+    With neither set, the session commits only when it is closed.
+    """
+
+    def __init__(
+        self,
+        every_batches: Optional[int] = None,
+        every_bytes: Optional[int] = None,
+    ):
+        self.every_batches = every_batches
+        self.every_bytes = every_bytes
+
+    def measure(self, rows: List[Tuple]) -> int:
+        return estimate_batch_bytes(rows) if self.every_bytes else 0
+
+    def reached(self, batches: int, nbytes: int) -> bool:
+        if self.every_batches and batches >= self.every_batches:
+            return True
+        if self.every_bytes and nbytes >= self.every_bytes:
+            return True
+        return False
+
 
 class PostgreSQLWriter:
-    def __init__(self, postgres_url: str):
+    def __init__(self, postgres_url: str, pool_size: int = 4, schema: str = "public"):
         self.postgres_url = postgres_url
+        self.schema = schema
+        self.pool = ConnectionPool(
+            factory=self.connect,
+            max_size=pool_size,
+            reset=lambda conn: conn.rollback(),
+            name="postgres",
+        )
 
     # ---------------------------
     # Connect
     # ---------------------------
     def connect(self):
+        if self.schema != "public":
+            # Las sentencias sin calificar (DDL, COPY) caen en el schema destino
+            return psycopg2.connect(
+                self.postgres_url,
+                options=search_path_option(self.schema),
+            )
         return psycopg2.connect(self.postgres_url)
 
+    def close(self) -> None:
+        self.pool.close()
+
+    # ---------------------------
+    # Long-lived session
+    # ---------------------------
+    def session(
+        self,
+        commit_policy: Optional[CommitPolicy] = None,
+        settings: Optional[Dict[str, str]] = None,
+    ) -> "PostgresSession":
+        return PostgresSession(self, commit_policy or CommitPolicy(), settings)
+
     # ---------------------------
     # Execute DDL / generic SQL
     # ---------------------------
     def execute_sql(self, sql: str) -> None:
-        conn = self.connect()
-        try:
+        with self.session() as session:
+            session.execute_sql(sql)
+
+    # ---------------------------
+    # Insert rows (batch)
+    # ---------------------------
+    def insert_rows(
+        self,
+        table: str,
+        columns: List[str],
+        rows: List[Tuple],
+    ) -> None:
+        with self.session() as session:
+            session.insert_rows(table, columns, rows)
+
+    # ---------------------------
+    # Bulk load rows (COPY FROM STDIN)
+    # ---------------------------
+    def copy_rows(
+        self,
+        table: str,
+        columns: List[str],
+        batches: Iterable[List[Tuple]],
+        copy_format: str = "csv",
+        column_types: Optional[List[str]] = None,
+    ) -> None:
+        with self.session() as session:
+            session.copy_rows(table, columns, batches, copy_format, column_types)
+
+    # ---------------------------
+    # Read table schema (for validation)
+    # ---------------------------
+    def get_table_schema(self, table: str) -> List[Dict]:
+        with self.pool.connection() as conn:
+            with conn.cursor() as cursor:
+                return self._read_table_schema(cursor, self.schema, table)
+
+    @staticmethod
+    def _read_table_schema(cursor, schema: str, table: str) -> List[Dict]:
+        return PostgreSQLWriter._read_catalog(cursor, schema, table).get(table, [])
+
+    # ---------------------------
+    # Bulk catalog (all tables, one query)
+    # ---------------------------
+    def get_all_table_schemas(self) -> Dict[str, List[Dict]]:
+        with self.pool.connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute(sql)
-            conn.commit()
+                return self._read_catalog(cursor, self.schema)
+
+    def get_catalog_version(self) -> Tuple:
+        """
+        Cheap token that changes whenever tables or columns in the schema
+        are created, altered or dropped (row counts and newest xmin of the
+        catalog rows involved).
+        """
+        with self.pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT
+                        count(*),
+                        max(c.xmin::text::bigint),
+                        (
+                            SELECT max(a.xmin::text::bigint)
+                            FROM pg_attribute a
+                            JOIN pg_class c2 ON a.attrelid = c2.oid
+                            WHERE c2.relnamespace = n.oid
+                        )
+                    FROM pg_namespace n
+                    LEFT JOIN pg_class c
+                        ON c.relnamespace = n.oid
+                        AND c.relkind IN ('r', 'p')
+                    WHERE n.nspname = %s
+                    GROUP BY n.oid;
+                    """,
+                    (self.schema,),
+                )
+                return tuple(cursor.fetchone() or ())
+
+    @staticmethod
+    def _read_catalog(cursor, schema: str, table: Optional[str] = None) -> Dict[str, List[Dict]]:
+        cursor.execute(
+            """
+            SELECT
+                c.relname AS table_name,
+                a.attname AS column_name,
+                format_type(a.atttypid, a.atttypmod) AS data_type,
+                EXISTS (
+                    SELECT 1
+                    FROM pg_index i
+                    WHERE i.indrelid = c.oid
+                      AND i.indisprimary
+                      AND a.attnum = ANY(i.indkey)
+                ) AS is_primary
+            FROM pg_class c
+            JOIN pg_namespace n ON c.relnamespace = n.oid
+            JOIN pg_attribute a ON a.attrelid = c.oid
+            WHERE n.nspname = %s
+              AND c.relkind IN ('r', 'p')
+              AND (%s::text IS NULL OR c.relname = %s)
+              AND a.attnum > 0
+              AND NOT a.attisdropped
+            ORDER BY c.relname, a.attnum;
+            """,
+            (schema, table, table),
+        )
+
+        catalog: Dict[str, List[Dict]] = {}
+        for row in cursor.fetchall():
+            catalog.setdefault(row[0], []).append(
+                {
+                    "name": row[1],
+                    "type": row[2].upper(),
+                    "pk": bool(row[3]),
+                }
+            )
+        return catalog
+
+
+class PostgresSession:
+    """
+    One pooled connection held for a whole table (or job).
+
+    Writes accumulate in a single transaction that is committed according
+    to the session's CommitPolicy and once more on close. An exception
+    inside the ``with`` block rolls back the uncommitted tail.
+
+    ``before_commit`` hooks run on the session's cursor right before every
+    commit, so bookkeeping (e.g. checkpoints) lands in the same transaction.
+
+    ``settings`` are applied with SET when the session starts and reset
+    before the connection goes back to the pool.
+    """
+
+    def __init__(
+        self,
+        writer: PostgreSQLWriter,
+        commit_policy: CommitPolicy,
+        settings: Optional[Dict[str, str]] = None,
+    ):
+        self.writer = writer
+        self.commit_policy = commit_policy
+        self.settings = settings or {}
+        self.conn = None
+
+        self.before_commit: List[Callable] = []
+
+        self.commits = 0
+        self._pending_batches = 0
+        self._pending_bytes = 0
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+    def __enter__(self) -> "PostgresSession":
+        self.conn = self.writer.pool.acquire()
+        if self.settings:
+            with self.conn.cursor() as cursor:
+                for name, value in self.settings.items():
+                    cursor.execute("SELECT set_config(%s, %s, false)", (name, str(value)))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        discard = False
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.conn.rollback()
+
+            if self.settings:
+                with self.conn.cursor() as cursor:
+                    cursor.execute("RESET ALL")
+                self.conn.commit()
         except Exception:
-            conn.rollback()
-            raise
+            discard = True
+            if exc_type is None:
+                raise
         finally:
-            conn.close()
+            self.writer.pool.release(self.conn, discard=discard or bool(self.conn.closed))
+            self.conn = None
+
+    def cursor(self):
+        return self.conn.cursor()
+
+    def commit(self) -> None:
+        if self.before_commit:
+            with self.conn.cursor() as cursor:
+                for hook in self.before_commit:
+                    hook(cursor)
+        started = time.perf_counter()
+        self.conn.commit()
+        COMMIT_SECONDS.observe(time.perf_counter() - started)
+        self.commits += 1
+        self._pending_batches = 0
+        self._pending_bytes = 0
+
+    def rollback(self) -> None:
+        self.conn.rollback()
+        self._pending_batches = 0
+        self._pending_bytes = 0
+
+    def _written(self, batches: int, nbytes: int) -> None:
+        self._pending_batches += batches
+        self._pending_bytes += nbytes
+        if self.commit_policy.reached(self._pending_batches, self._pending_bytes):
+            self.commit()
+
+    # ---------------------------
+    # Execute DDL / generic SQL
+    # ---------------------------
+    def execute_sql(self, sql: str) -> None:
+        with self.conn.cursor() as cursor:
+            cursor.execute(sql)
 
     # ---------------------------
     # Insert rows (batch)
@@ -36,65 +429,319 @@ class PostgreSQLWriter:
         table: str,
         columns: List[str],
         rows: List[Tuple],
+        sql: Optional[str] = None,
+        large: Optional[LargeColumns] = None,
     ) -> None:
         if not rows:
             return
 
-        conn = self.connect()
-        try:
-            with conn.cursor() as cursor:
-                col_names = ", ".join(f'"{c}"' for c in columns)
-                placeholders = ", ".join(["%s"] * len(columns))
+        with self.conn.cursor() as cursor:
+            _insert_batch(cursor, sql or build_insert_sql(table, columns), table, columns, rows, large)
+
+        self._written(1, self.commit_policy.measure(rows))
+
+    # ---------------------------
+    # Bulk load rows (COPY FROM STDIN)
+    # ---------------------------
+    def copy_rows(
+        self,
+        table: str,
+        columns: List[str],
+        batches: Iterable[List[Tuple]],
+        copy_format: str = "csv",
+        column_types: Optional[List[str]] = None,
+        sql: Optional[str] = None,
+        large: Optional[LargeColumns] = None,
+    ) -> None:
+        """
+        Streams ``batches`` through COPY. When the commit policy has an
+        interval, the stream is cut into one COPY statement per interval
+        so each committed chunk is a complete statement. LargeValues in
+        the ``large`` columns are streamed from SQLite inside the COPY.
+        """
+        encoder = build_copy_encoder(copy_format, column_types)
+        sql = sql or build_copy_sql(table, columns, copy_format)
+
+        source = iter(batches)
+        while True:
+            segment = _CommitSegment(source, self.commit_policy)
+            stream = CopyStream(iter_copy_chunks(encoder, segment, large))
+
+            with self.conn.cursor() as cursor:
+                cursor.copy_expert(sql, stream, size=COPY_BUFFER_SIZE)
+
+            if segment.exhausted:
+                self._pending_batches += segment.batches
+                self._pending_bytes += segment.nbytes
+                return
+
+            self._written(segment.batches, segment.nbytes)
+
+    # ---------------------------
+    # Replay an encoded COPY payload (spool file)
+    # ---------------------------
+    def copy_file(self, sql: str, source, nbytes: int = 0) -> None:
+        """COPYs an already encoded payload read from the file object ``source``."""
+        with self.conn.cursor() as cursor:
+            cursor.copy_expert(sql, source, size=COPY_BUFFER_SIZE)
+
+        self._written(1, nbytes)
+
+    # ---------------------------
+    # Tolerant write (bad-row isolation)
+    # ---------------------------
+    def write_isolated(
+        self,
+        rows: List[Tuple],
+        write: Callable,
+        reject: Callable[[Tuple, Exception], None],
+    ) -> int:
+        """
+        Writes ``rows`` with ``write(cursor, rows)`` inside a SAVEPOINT. If
+        the rows are at fault (ROW_ERRORS), rolls back to the savepoint and
+        bisects: halves are retried the same way until each failing row is
+        alone, and ``reject(row, error)`` gets it. Good rows stay in the
+        transaction, in their original order; k bad rows in a batch of n
+        cost about k * log2(n) extra statements. Returns rows written.
+        """
+        if not rows:
+            return 0
+
+        written = 0
+        pending = [rows]
+        with self.conn.cursor() as cursor:
+            while pending:
+                chunk = pending.pop()
+                cursor.execute("SAVEPOINT isolate_rows")
+                try:
+                    write(cursor, chunk)
+                except ROW_ERRORS as e:
+                    # ROLLBACK TO deja el savepoint abierto: sin RELEASE el
+                    # siguiente se anidaría y las subtransacciones se acumularían
+                    cursor.execute("ROLLBACK TO SAVEPOINT isolate_rows")
+                    cursor.execute("RELEASE SAVEPOINT isolate_rows")
+                    if len(chunk) == 1:
+                        reject(chunk[0], e)
+                    else:
+                        middle = len(chunk) // 2
+                        pending.append(chunk[middle:])
+                        pending.append(chunk[:middle])
+                    continue
+                cursor.execute("RELEASE SAVEPOINT isolate_rows")
+                written += len(chunk)
+
+        # Después de soltar el savepoint: un commit dentro de él no es posible
+        self._written(1, self.commit_policy.measure(rows))
+        return written
+
+    # ---------------------------
+    # Staged upsert / delete (incremental sync)
+    # ---------------------------
+    def upsert_rows(
+        self,
+        table: str,
+        columns: List[str],
+        pk_columns: List[str],
+        batches: Iterable[List[Tuple]],
+    ) -> int:
+        """
+        COPYs ``batches`` into a temporary staging table and merges it with
+        a single INSERT ... ON CONFLICT (pk) DO UPDATE. The staging table is
+        dropped on commit, so the merge and anything else written before the
+        next commit (e.g. watermarks) land atomically. Returns rows merged.
+        """
+        stage = _stage_name("upsert", table)
+        col_names = ", ".join(f'"{c}"' for c in columns)
+        conflict = ", ".join(f'"{c}"' for c in pk_columns)
+        updates = [c for c in columns if c not in pk_columns]
 
-                sql = f"""
-                    INSERT INTO "{table}" ({col_names})
-                    VALUES ({placeholders})
+        if updates:
+            action = "DO UPDATE SET " + ", ".join(f'"{c}" = EXCLUDED."{c}"' for c in updates)
+        else:
+            action = "DO NOTHING"
+
+        with self.conn.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TEMP TABLE "{stage}" '
+                f'(LIKE "{table}" INCLUDING DEFAULTS) ON COMMIT DROP'
+            )
+
+        self._copy_into(stage, columns, batches)
+
+        with self.conn.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO "{table}" ({col_names}) '
+                f'SELECT {col_names} FROM "{stage}" '
+                f"ON CONFLICT ({conflict}) {action}"
+            )
+            return cursor.rowcount
+
+    def delete_keys(
+        self,
+        table: str,
+        pk_columns: List[str],
+        keys: List[Tuple],
+    ) -> int:
+        """Deletes rows by primary key through a staged join. Returns rows deleted."""
+        if not keys:
+            return 0
+
+        stage = _stage_name("delete", table)
+        key_cols = ", ".join(f'"{c}"' for c in pk_columns)
+        match = " AND ".join(f't."{c}" = s."{c}"' for c in pk_columns)
+
+        with self.conn.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TEMP TABLE "{stage}" ON COMMIT DROP AS '
+                f'SELECT {key_cols} FROM "{table}" WITH NO DATA'
+            )
+
+        self._copy_into(stage, pk_columns, [keys])
+
+        with self.conn.cursor() as cursor:
+            cursor.execute(f'DELETE FROM "{table}" t USING "{stage}" s WHERE {match}')
+            return cursor.rowcount
+
+    def _copy_into(self, table: str, columns: List[str], batches: Iterable[List[Tuple]]) -> None:
+        encoder = build_copy_encoder("csv")
+        stream = CopyStream(iter_copy_chunks(encoder, batches))
+
+        with self.conn.cursor() as cursor:
+            cursor.copy_expert(build_copy_sql(table, columns), stream, size=COPY_BUFFER_SIZE)
+
+    # ---------------------------
+    # Range checksums (verification)
+    # ---------------------------
+    def get_key_bounds(self, table: str, column: str) -> Tuple[Optional[int], Optional[int]]:
+        with self.conn.cursor() as cursor:
+            cursor.execute(f'SELECT MIN("{column}"), MAX("{column}") FROM "{table}"')
+            return cursor.fetchone()
+
+    def range_digest(self, table: str, hash_sql: str, key_range=None) -> Tuple[int, int]:
+        """``(row count, sum of row hashes)`` over ``key_range`` (whole table if None)."""
+        where, params = _range_filter(key_range)
+        with self.conn.cursor() as cursor:
+            cursor.execute(
+                f'SELECT count(*), coalesce(sum({hash_sql}), 0) FROM "{table}"{where}',
+                params,
+            )
+            count, total = cursor.fetchone()
+            return int(count), int(total)
+
+    def range_row_hashes(self, table: str, hash_sql: str, key_range) -> Dict[int, int]:
+        where, params = _range_filter(key_range)
+        with self.conn.cursor() as cursor:
+            cursor.execute(
+                f'SELECT "{key_range.column}", {hash_sql} FROM "{table}"{where}',
+                params,
+            )
+            return dict(cursor.fetchall())
+
+    # ---------------------------
+    # Table state
+    # ---------------------------
+    def is_unlogged(self, table: str) -> Optional[bool]:
+        """True/False for an existing table in the writer's schema, None if absent."""
+        with self.conn.cursor() as cursor:
+            cursor.execute(
                 """
+                SELECT c.relpersistence = 'u'
+                FROM pg_class c
+                JOIN pg_namespace n ON c.relnamespace = n.oid
+                WHERE n.nspname = %s AND c.relname = %s;
+                """,
+                (self.writer.schema, table),
+            )
+            row = cursor.fetchone()
+            return None if row is None else bool(row[0])
 
-                execute_batch(cursor, sql, rows, page_size=1000)
+    def has_primary_key(self, table: str) -> bool:
+        with self.conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT EXISTS (
+                    SELECT 1
+                    FROM pg_index i
+                    JOIN pg_class c ON i.indrelid = c.oid
+                    JOIN pg_namespace n ON c.relnamespace = n.oid
+                    WHERE n.nspname = %s AND c.relname = %s AND i.indisprimary
+                );
+                """,
+                (self.writer.schema, table),
+            )
+            return bool(cursor.fetchone()[0])
 
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+    def relation_exists(self, name: str) -> bool:
+        """Whether a table or index called ``name`` exists in the writer's schema."""
+        with self.conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT EXISTS (
+                    SELECT 1
+                    FROM pg_class c
+                    JOIN pg_namespace n ON c.relnamespace = n.oid
+                    WHERE n.nspname = %s AND c.relname = %s
+                );
+                """,
+                (self.writer.schema, name),
+            )
+            return bool(cursor.fetchone()[0])
+
+    def constraint_state(self, table: str, name: str) -> Optional[bool]:
+        """True if the constraint is validated, False if NOT VALID, None if absent."""
+        with self.conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT con.convalidated
+                FROM pg_constraint con
+                JOIN pg_class c ON con.conrelid = c.oid
+                JOIN pg_namespace n ON c.relnamespace = n.oid
+                WHERE n.nspname = %s AND c.relname = %s AND con.conname = %s;
+                """,
+                (self.writer.schema, table, name),
+            )
+            row = cursor.fetchone()
+            return None if row is None else bool(row[0])
 
     # ---------------------------
-    # Read table schema (for validation)
+    # Read table schema
     # ---------------------------
     def get_table_schema(self, table: str) -> List[Dict]:
-        conn = self.connect()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    """
-                    SELECT
-                        a.attname AS column_name,
-                        t.typname AS data_type,
-                        COALESCE(i.indisprimary, false) AS is_primary
-                    FROM pg_attribute a
-                    JOIN pg_class c ON a.attrelid = c.oid
-                    JOIN pg_type t ON a.atttypid = t.oid
-                    LEFT JOIN pg_index i
-                        ON c.oid = i.indrelid
-                        AND a.attnum = ANY(i.indkey)
-                    WHERE c.relname = %s
-                      AND a.attnum > 0
-                      AND NOT a.attisdropped;
-                    """,
-                    (table,),
-                )
+        with self.conn.cursor() as cursor:
+            return PostgreSQLWriter._read_table_schema(cursor, self.writer.schema, table)
 
-                rows = cursor.fetchall()
 
-                return [
-                    {
-                        "name": row[0],
-                        "type": row[1].upper(),
-                        "pk": bool(row[2]),
-                    }
-                    for row in rows
-                ]
-        finally:
-            conn.close()
+class _CommitSegment:
+    """Yields batches from ``source`` until the commit policy is reached."""
+
+    def __init__(self, source: Iterator[List[Tuple]], policy: CommitPolicy):
+        self._source = source
+        self._policy = policy
+        self.batches = 0
+        self.nbytes = 0
+        self.exhausted = False
+
+    def __iter__(self):
+        for batch in self._source:
+            self.batches += 1
+            self.nbytes += self._policy.measure(batch)
+            yield batch
+
+            if self._policy.reached(self.batches, self.nbytes):
+                return
+
+        self.exhausted = True
+
+
+def _stage_name(kind: str, table: str) -> str:
+    # Los identificadores de PostgreSQL se truncan a 63 bytes
+    return f"_{kind}_{table}"[:63]
+
+
+def _range_filter(key_range) -> Tuple[str, Tuple]:
+    if key_range is None:
+        return "", ()
+    return (
+        f' WHERE "{key_range.column}" >= %s AND "{key_range.column}" < %s',
+        (key_range.start, key_range.end),
+    )
@@ -0,0 +1,134 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+
+QUARANTINE_TABLE = "_migration_quarantine"
+
+# Los mensajes de PostgreSQL pueden incluir el valor entero de la fila
+MAX_ERROR_CHARS = 2000
+
+
+def _json_value(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + bytes(value).hex()
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return repr(value)
+
+
+class PostgresQuarantineStore:
+    """
+    Dead-letter rows kept in the target database, next to the data.
+
+    Like the checkpoint store, every method works on the caller's cursor:
+    a quarantined row is written in the transaction of the good rows of
+    its batch, so a resumed job neither loses nor repeats it. Rows are
+    stored as JSON text (a column -> value object) rather than JSONB,
+    which would reject the NUL characters that often made them fail.
+    """
+
+    def ensure_table(self, cursor) -> None:
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS "{QUARANTINE_TABLE}" (
+                id BIGSERIAL PRIMARY KEY,
+                job_id TEXT NOT NULL,
+                table_name TEXT NOT NULL,
+                row_key TEXT,
+                row_data TEXT NOT NULL,
+                error TEXT NOT NULL,
+                sqlstate TEXT,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+            CREATE INDEX IF NOT EXISTS "{QUARANTINE_TABLE}_job_idx"
+                ON "{QUARANTINE_TABLE}" (job_id, table_name, id);
+            """
+        )
+
+    def add(
+        self,
+        cursor,
+        job_id: str,
+        table: str,
+        columns: List[str],
+        row: Tuple,
+        error: Exception,
+        key_index: Optional[int] = None,
+    ) -> None:
+        row_key = None
+        if key_index is not None and row[key_index] is not None:
+            row_key = str(row[key_index])
+
+        cursor.execute(
+            f"""
+            INSERT INTO "{QUARANTINE_TABLE}"
+                (job_id, table_name, row_key, row_data, error, sqlstate)
+            VALUES (%s, %s, %s, %s, %s, %s);
+            """,
+            (
+                job_id,
+                table,
+                row_key,
+                json.dumps(dict(zip(columns, row)), default=_json_value),
+                str(error).strip().replace("\x00", "")[:MAX_ERROR_CHARS],
+                getattr(error, "pgcode", None),
+            ),
+        )
+
+    def clear(self, cursor, job_id: str, table: str) -> int:
+        """Drops a table's quarantined rows (the table is being reloaded); returns how many."""
+        cursor.execute(
+            f'DELETE FROM "{QUARANTINE_TABLE}" WHERE job_id = %s AND table_name = %s;',
+            (job_id, table),
+        )
+        return cursor.rowcount
+
+    def count(self, cursor, job_id: str, table: Optional[str] = None) -> int:
+        cursor.execute(
+            f"""
+            SELECT count(*)
+            FROM "{QUARANTINE_TABLE}"
+            WHERE job_id = %s AND (%s::text IS NULL OR table_name = %s);
+            """,
+            (job_id, table, table),
+        )
+        return int(cursor.fetchone()[0])
+
+    def page(
+        self,
+        cursor,
+        job_id: str,
+        offset: int = 0,
+        limit: int = 100,
+        table: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        cursor.execute(
+            f"""
+            SELECT table_name, row_key, row_data, error, sqlstate, created_at
+            FROM "{QUARANTINE_TABLE}"
+            WHERE job_id = %s AND (%s::text IS NULL OR table_name = %s)
+            ORDER BY id
+            OFFSET %s LIMIT %s;
+            """,
+            (job_id, table, table, offset, limit),
+        )
+
+        return [
+            {
+                "table": row[0],
+                "row_key": row[1],
+                "row": json.loads(row[2]),
+                "error": row[3],
+                "sqlstate": row[4],
+                "created_at": row[5],
+            }
+            for row in cursor.fetchall()
+        ]
+
+    def exists(self, cursor) -> bool:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (f'"{QUARANTINE_TABLE}"',))
+        return bool(cursor.fetchone()[0])
@@ -0,0 +1,167 @@
+import gzip
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+SPOOL_COMPRESSION = "gzip"
+
+SPOOL_EXTENSIONS = {
+    "csv": "csv.gz",
+    "binary": "bin.gz",
+}
+
+
+# ---------------------------
+# Spool file (write)
+# ---------------------------
+class SpoolFileWriter:
+    """
+    Writes one gzip-compressed COPY payload.
+
+    Data goes to ``<path>.part`` and is renamed into place, after fsync,
+    only when the ``with`` block ends cleanly, so a spool directory never
+    holds a truncated file under its final name. ``sha256`` and ``bytes``
+    describe the uncompressed payload, which is what the load replays.
+    """
+
+    def __init__(self, path: str, compress_level: int = 3):
+        self.path = path
+        self.compress_level = compress_level
+        self.bytes = 0
+        self.sha256: Optional[str] = None
+        self._hash = hashlib.sha256()
+        self._raw = None
+        self._gzip = None
+        self._discarded = False
+
+    def __enter__(self) -> "SpoolFileWriter":
+        self._raw = open(self.path + ".part", "wb")
+        self._gzip = gzip.GzipFile(
+            filename="",
+            mode="wb",
+            fileobj=self._raw,
+            compresslevel=self.compress_level,
+            mtime=0,
+        )
+        return self
+
+    def write(self, chunk: bytes) -> None:
+        self._gzip.write(chunk)
+        self._hash.update(chunk)
+        self.bytes += len(chunk)
+
+    def discard(self) -> None:
+        """The payload is incomplete (job stopped): drop it on exit."""
+        self._discarded = True
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self._gzip.close()
+            self._raw.flush()
+            if exc_type is None and not self._discarded:
+                os.fsync(self._raw.fileno())
+        finally:
+            self._raw.close()
+
+        if exc_type is not None or self._discarded:
+            _remove(self.path + ".part")
+            return
+
+        os.replace(self.path + ".part", self.path)
+        self.sha256 = self._hash.hexdigest()
+
+
+# ---------------------------
+# Spool file (read)
+# ---------------------------
+class SpoolFileReader:
+    """
+    Read-only file object over a spool file, decompressed on the fly for
+    copy_expert. It hashes what it hands out; ``verify`` then compares
+    the payload with the manifest before the load commits it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.bytes = 0
+        self._hash = hashlib.sha256()
+        self._file = None
+
+    def __enter__(self) -> "SpoolFileReader":
+        self._file = gzip.open(self.path, "rb")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._file.close()
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._file.read(size)
+        self._hash.update(data)
+        self.bytes += len(data)
+        return data
+
+    readline = read
+
+    def verify(self, expected_bytes: int, expected_sha256: Optional[str]) -> None:
+        # COPY puede parar antes del final (trailer binario): lo que quede también cuenta
+        while self.read(1024 * 1024):
+            pass
+        name = os.path.basename(self.path)
+        if self.bytes != expected_bytes:
+            raise ValueError(
+                f"Spool file {name} does not match the manifest "
+                f"({self.bytes} bytes read, {expected_bytes} expected)"
+            )
+        if expected_sha256 is not None and self._hash.hexdigest() != expected_sha256:
+            raise ValueError(f"Spool file {name} does not match the manifest (sha256 differs)")
+
+
+# ---------------------------
+# Manifest
+# ---------------------------
+def read_manifest(directory: str) -> Dict[str, Any]:
+    path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(path):
+        raise ValueError(f"No spool manifest in {directory}")
+
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported spool manifest version: {manifest.get('version')}")
+    if manifest.get("format") not in SPOOL_EXTENSIONS:
+        raise ValueError(f"Unsupported spool format: {manifest.get('format')}")
+    return manifest
+
+
+def write_manifest(directory: str, manifest: Dict[str, Any]) -> str:
+    """Atomic replace: a reader sees the previous manifest or the new one, never half."""
+    path = os.path.join(directory, MANIFEST_FILE)
+    with open(path + ".part", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, default=str)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".part", path)
+    return path
+
+
+def remove_spool(directory: str, manifest: Dict[str, Any]) -> None:
+    """Deletes an export's files and its manifest (the directory itself stays)."""
+    for table in manifest.get("tables", {}).values():
+        for entry in table.get("files", []):
+            _remove(os.path.join(directory, entry["file"]))
+    _remove(os.path.join(directory, MANIFEST_FILE))
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
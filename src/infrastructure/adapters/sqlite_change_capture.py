@@ -0,0 +1,118 @@
+import json
+from typing import Dict, List, Optional, Tuple
+
+
+CHANGES_TABLE = "_migrator_changes"
+
+
+class SQLiteChangeCapture:
+    """
+    Trigger-based change capture inside the source SQLite file.
+
+    Every INSERT/UPDATE/DELETE on a captured table appends the affected
+    primary key (as a JSON array) to ``_migrator_changes``. Updates log the
+    old key as a delete and the new key as an upsert, so primary-key
+    changes replay correctly. Uses the reader's connection pool; this is the
+    only component that writes to the source database.
+    """
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    # ---------------------------
+    # Install
+    # ---------------------------
+    def install(self, table: str, pk_columns: List[str]) -> None:
+        if not pk_columns:
+            raise ValueError(f"Table '{table}' has no primary key; change capture needs one")
+
+        def keys(prefix: str) -> str:
+            return "json_array(" + ", ".join(f'{prefix}."{c}"' for c in pk_columns) + ")"
+
+        name = table.replace('"', "")
+        quoted_table = table.replace("'", "''")
+        log = (
+            f"INSERT INTO {CHANGES_TABLE} (table_name, op, pk) "
+            f"VALUES ('{quoted_table}', '{{op}}', {{keys}});"
+        )
+
+        with self.reader.pool.connection() as conn:
+            conn.executescript(
+                f"""
+                CREATE TABLE IF NOT EXISTS {CHANGES_TABLE} (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    table_name TEXT NOT NULL,
+                    op TEXT NOT NULL,
+                    pk TEXT NOT NULL,
+                    changed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                );
+
+                CREATE TRIGGER IF NOT EXISTS "_migrator_ins_{name}"
+                AFTER INSERT ON "{table}" BEGIN
+                    {log.format(op="U", keys=keys("NEW"))}
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS "_migrator_upd_{name}"
+                AFTER UPDATE ON "{table}" BEGIN
+                    {log.format(op="D", keys=keys("OLD"))}
+                    {log.format(op="U", keys=keys("NEW"))}
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS "_migrator_del_{name}"
+                AFTER DELETE ON "{table}" BEGIN
+                    {log.format(op="D", keys=keys("OLD"))}
+                END;
+                """
+            )
+            conn.commit()
+
+    # ---------------------------
+    # Read / prune
+    # ---------------------------
+    def max_seq(self) -> int:
+        with self.reader.pool.connection() as conn:
+            row = conn.execute(f"SELECT MAX(seq) FROM {CHANGES_TABLE}").fetchone()
+            return row[0] or 0
+
+    def pending_changes(
+        self,
+        after_seq: Dict[str, int],
+        upto_seq: int,
+    ) -> Dict[str, Dict[Tuple, str]]:
+        """
+        Net changes in ``(after_seq[table], upto_seq]`` for each table of
+        ``after_seq``: the last op ('U' upsert / 'D' delete) recorded for
+        each primary key. Other tables' entries are left alone.
+        """
+        changes: Dict[str, Dict[Tuple, str]] = {table: {} for table in after_seq}
+        if not after_seq:
+            return changes
+
+        with self.reader.pool.connection() as conn:
+            cursor = conn.execute(
+                f"SELECT seq, table_name, op, pk FROM {CHANGES_TABLE} "
+                "WHERE seq > ? AND seq <= ? ORDER BY seq",
+                (min(after_seq.values()), upto_seq),
+            )
+            while True:
+                rows = cursor.fetchmany(10_000)
+                if not rows:
+                    break
+                for seq, table, op, pk in rows:
+                    after = after_seq.get(table)
+                    if after is not None and seq > after:
+                        changes[table][tuple(json.loads(pk))] = op
+
+        return {table: ops for table, ops in changes.items() if ops}
+
+    def prune(self, upto_seq: Optional[int], tables: List[str]) -> None:
+        """Deletes the log entries of ``tables`` up to ``upto_seq``."""
+        if not upto_seq or not tables:
+            return
+        placeholders = ", ".join("?" * len(tables))
+        with self.reader.pool.connection() as conn:
+            conn.execute(
+                f"DELETE FROM {CHANGES_TABLE} WHERE seq <= ? AND table_name IN ({placeholders})",
+                (upto_seq, *tables),
+            )
+            conn.commit()
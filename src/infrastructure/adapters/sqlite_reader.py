@@ -1,37 +1,147 @@
+import os
 import sqlite3
-from typing import List, Dict, Generator, Any, Tuple
+import threading
+from typing import List, Dict, Generator, Any, Tuple, Optional, Union, Callable
+from urllib.parse import quote
+
+from src.infrastructure.adapters.connection_pool import ConnectionPool
+from src.infrastructure.adapters.large_value import LargeColumns, LargeValue
+
+
+# Tablas internas de SQLite y del migrador (log de cambios)
+INTERNAL_TABLES_FILTER = (
+    "{col} NOT LIKE 'sqlite\\_%' ESCAPE '\\' "
+    "AND {col} NOT LIKE '\\_migrator\\_%' ESCAPE '\\'"
+)
 
 
 class SQLiteReader:
-    def __init__(self, sqlite_path: str):
+    """
+    Pooled reads from a SQLite file.
+
+    ``read_only`` opens connections with ``mode=ro``; ``immutable`` also
+    tells SQLite the file cannot change (no locking, no change detection),
+    which is only safe on a file nobody writes, e.g. a snapshot.
+    ``mmap_size`` (bytes) and ``cache_size`` (KiB) are applied per
+    connection; None keeps SQLite's defaults.
+    """
+
+    def __init__(
+        self,
+        sqlite_path: str,
+        pool_size: int = 4,
+        read_only: bool = False,
+        immutable: bool = False,
+        mmap_size: Optional[int] = None,
+        cache_size: Optional[int] = None,
+    ):
         self.sqlite_path = sqlite_path
+        self.read_only = read_only or immutable
+        self.immutable = immutable
+        self.mmap_size = mmap_size
+        self.cache_size = cache_size
+        self.pool = ConnectionPool(
+            factory=self.connect,
+            max_size=pool_size,
+            name="sqlite",
+        )
+        # Conexiones por hilo para blob I/O, fuera del pool: el hilo que
+        # escribe un LargeValue no debe esperar a las conexiones de lectura
+        self._blob_local = threading.local()
+        self._blob_connections: List[sqlite3.Connection] = []
+        self._blob_lock = threading.Lock()
 
     # ---------------------------
     # Connect
     # ---------------------------
     def connect(self):
-        return sqlite3.connect(self.sqlite_path)
+        # Pooled connections may be handed to a different thread than the
+        # one that opened them; the pool guarantees a single user at a time.
+        if self.read_only:
+            uri = f"file:{quote(os.path.abspath(self.sqlite_path))}?mode=ro"
+            if self.immutable:
+                uri += "&immutable=1"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+
+        if self.mmap_size is not None:
+            conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        if self.cache_size is not None:
+            # Negativo = tamaño en KiB en vez de páginas
+            conn.execute(f"PRAGMA cache_size = {-int(self.cache_size)}")
+        return conn
+
+    def close(self) -> None:
+        self.pool.close()
+        with self._blob_lock:
+            for conn in self._blob_connections:
+                conn.close()
+            self._blob_connections.clear()
+        self._blob_local = threading.local()
+
+    # ---------------------------
+    # Incremental blob I/O
+    # ---------------------------
+    def open_blob(self, table: str, column: str, rowid: int):
+        """Read-only ``sqlite3.Blob`` over one value (context manager)."""
+        conn = getattr(self._blob_local, "conn", None)
+        if conn is None:
+            conn = self.connect()
+            self._blob_local.conn = conn
+            with self._blob_lock:
+                self._blob_connections.append(conn)
+        return conn.blobopen(table, column, rowid, readonly=True)
+
+    def get_column_sizes(self, table: str, columns: List[str], sample_rows: int) -> Tuple[int, Dict[str, int]]:
+        """
+        ``(average row bytes, max bytes per column)`` over the first
+        ``sample_rows`` rows, computed by SQLite so wide values are never
+        fetched into Python.
+        """
+        if not columns:
+            return 0, {}
+        sums = " + ".join(f"coalesce({_byte_length(c)}, 0)" for c in columns)
+        maxima = ", ".join(f"max({_byte_length(c)})" for c in columns)
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                f'SELECT count(*), sum({sums}), {maxima} '
+                f'FROM (SELECT * FROM "{table}" LIMIT ?)',
+                (sample_rows,),
+            ).fetchone()
+        count, total = row[0], row[1] or 0
+        average = total // count if count else 0
+        return average, {c: m or 0 for c, m in zip(columns, row[2:])}
+
+    def get_blob_columns(self, table: str, columns: List[str]) -> List[str]:
+        """The given columns that hold at least one BLOB value."""
+        if not columns:
+            return []
+        checks = ", ".join(
+            f'EXISTS (SELECT 1 FROM "{table}" WHERE typeof("{c}") = \'blob\')' for c in columns
+        )
+        with self.pool.connection() as conn:
+            row = conn.execute(f"SELECT {checks}").fetchone()
+        return [c for c, found in zip(columns, row) if found]
 
     # ---------------------------
     # List tables
     # ---------------------------
     def get_tables(self) -> List[str]:
-        conn = self.connect()
-        try:
+        with self.pool.connection() as conn:
             cursor = conn.cursor()
+            # sqlite_stat1 / sqlite_sequence y el log de cambios son internas, no se migran
             cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='table'"
+                "SELECT name FROM sqlite_master "
+                f"WHERE type='table' AND {INTERNAL_TABLES_FILTER.format(col='name')}"
             )
             return [row[0] for row in cursor.fetchall()]
-        finally:
-            conn.close()
 
     # ---------------------------
     # Read table schema
     # ---------------------------
     def get_table_schema(self, table: str) -> List[Dict[str, Any]]:
-        conn = self.connect()
-        try:
+        with self.pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(f'PRAGMA table_info("{table}")')
             cols = cursor.fetchall()
@@ -47,8 +157,194 @@ class SQLiteReader:
                 }
                 for col in cols
             ]
-        finally:
-            conn.close()
+
+    # ---------------------------
+    # Bulk catalog (all tables, one query)
+    # ---------------------------
+    def get_schema_version(self) -> int:
+        with self.pool.connection() as conn:
+            return conn.execute("PRAGMA schema_version").fetchone()[0]
+
+    def get_all_table_schemas(self) -> Dict[str, List[Dict[str, Any]]]:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT m.name, p.cid, p.name, p.type, p.\"notnull\", p.dflt_value, p.pk "
+                "FROM sqlite_master m "
+                "JOIN pragma_table_info(m.name) p "
+                f"WHERE m.type='table' AND {INTERNAL_TABLES_FILTER.format(col='m.name')} "
+                "ORDER BY m.name, p.cid"
+            )
+
+            schemas: Dict[str, List[Dict[str, Any]]] = {}
+            for row in cursor.fetchall():
+                schemas.setdefault(row[0], []).append(
+                    {
+                        "cid": row[1],
+                        "name": row[2],
+                        "type": row[3],
+                        "notnull": bool(row[4]),
+                        "default": row[5],
+                        "pk": bool(row[6]),
+                    }
+                )
+            return schemas
+
+    def get_all_foreign_keys(self) -> Dict[str, List[Dict[str, Any]]]:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT m.name, f.id, f.seq, f.\"table\", f.\"from\", f.\"to\", "
+                "f.on_update, f.on_delete "
+                "FROM sqlite_master m "
+                "JOIN pragma_foreign_key_list(m.name) f "
+                f"WHERE m.type='table' AND {INTERNAL_TABLES_FILTER.format(col='m.name')}"
+            )
+
+            fks: Dict[str, List[Dict[str, Any]]] = {}
+            for row in cursor.fetchall():
+                fks.setdefault(row[0], []).append(
+                    {
+                        "id": row[1],
+                        "seq": row[2],
+                        "table": row[3],
+                        "from": row[4],
+                        "to": row[5],
+                        "on_update": row[6],
+                        "on_delete": row[7],
+                    }
+                )
+            return fks
+
+    def get_all_indexes(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Indexes per table with their key columns in order. ``origin`` is
+        'c' (CREATE INDEX), 'u' (UNIQUE constraint) or 'pk'; a column
+        name of None is an expression.
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT m.name, il.name, il.\"unique\", il.origin, il.partial, "
+                "ix.name, ix.\"desc\" "
+                "FROM sqlite_master m "
+                "JOIN pragma_index_list(m.name) il "
+                "JOIN pragma_index_xinfo(il.name) ix "
+                f"WHERE m.type='table' AND {INTERNAL_TABLES_FILTER.format(col='m.name')} "
+                "AND ix.key = 1 "
+                "ORDER BY m.name, il.name, ix.seqno"
+            )
+
+            indexes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            for row in cursor.fetchall():
+                index = indexes.setdefault(row[0], {}).setdefault(
+                    row[1],
+                    {
+                        "name": row[1],
+                        "unique": bool(row[2]),
+                        "origin": row[3],
+                        "partial": bool(row[4]),
+                        "columns": [],
+                        "descending": [],
+                    },
+                )
+                index["columns"].append(row[5])
+                index["descending"].append(bool(row[6]))
+            return {table: list(by_name.values()) for table, by_name in indexes.items()}
+
+    # ---------------------------
+    # Foreign keys
+    # ---------------------------
+    def get_foreign_keys(self, table: str) -> List[Dict[str, Any]]:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'PRAGMA foreign_key_list("{table}")')
+
+            return [
+                {
+                    "id": fk[0],
+                    "seq": fk[1],
+                    "table": fk[2],
+                    "from": fk[3],
+                    "to": fk[4],
+                    "on_update": fk[5],
+                    "on_delete": fk[6],
+                }
+                for fk in cursor.fetchall()
+            ]
+
+    # ---------------------------
+    # Integer key (rowid / INTEGER PRIMARY KEY)
+    # ---------------------------
+    def get_key_column(self, table: str) -> Optional[str]:
+        """
+        Column usable for range scans: ``rowid`` for ordinary tables, the
+        single INTEGER primary key for WITHOUT ROWID tables, else None.
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(f'SELECT rowid FROM "{table}" LIMIT 0')
+                return "rowid"
+            except sqlite3.OperationalError:
+                pass
+
+            cursor.execute(f'PRAGMA table_info("{table}")')
+            pk = [col for col in cursor.fetchall() if col[5]]
+            if len(pk) == 1 and "INT" in (pk[0][2] or "").upper():
+                return pk[0][1]
+            return None
+
+    def get_key_bounds(self, table: str, column: str) -> Tuple[Optional[int], Optional[int]]:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'SELECT MIN("{column}"), MAX("{column}") FROM "{table}"')
+            return cursor.fetchone()
+
+    # ---------------------------
+    # Count rows
+    # ---------------------------
+    def count_rows(self, table: str, conn: Optional[sqlite3.Connection] = None) -> int:
+        """COUNT(*) on a pooled connection, or on ``conn`` when the caller holds one."""
+        if conn is not None:
+            return conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'SELECT COUNT(*) FROM "{table}"')
+            return cursor.fetchone()[0]
+
+    # ---------------------------
+    # Cheap row estimates
+    # ---------------------------
+    def estimate_rows_from_rowid(self, table: str) -> Optional[int]:
+        """MAX(rowid) - MIN(rowid) + 1: two b-tree seeks, an upper bound if there are gaps."""
+        column = self.get_key_column(table)
+        if column is None:
+            return None
+
+        min_key, max_key = self.get_key_bounds(table, column)
+        if min_key is None:
+            return 0
+        return int(max_key) - int(min_key) + 1
+
+    def get_stat1_row_counts(self) -> Dict[str, int]:
+        """Row counts recorded by ANALYZE in sqlite_stat1 (empty if never analyzed)."""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master "
+                "WHERE type='table' AND name='sqlite_stat1'"
+            )
+            if cursor.fetchone() is None:
+                return {}
+
+            cursor.execute("SELECT tbl, stat FROM sqlite_stat1")
+            counts: Dict[str, int] = {}
+            for tbl, stat in cursor.fetchall():
+                head = (stat or "").split(" ", 1)[0]
+                if head.isdigit():
+                    counts[tbl] = max(counts.get(tbl, 0), int(head))
+            return counts
 
     # ---------------------------
     # Read rows in batches (safe generator)
@@ -56,18 +352,221 @@ class SQLiteReader:
     def read_rows(
         self,
         table: str,
-        batch_size: int = 1000
+        batch_size: Union[int, Callable[[], int]] = 1000,
+        key_range=None,
+        large: Optional[LargeColumns] = None,
+    ) -> Generator[List[Tuple], None, None]:
+        """
+        ``batch_size`` may be a callable, asked before every fetch, so an
+        adaptive sizer can change the batch size mid-scan. With ``large``,
+        values of those columns over its threshold are not fetched: the
+        row carries a LargeValue to stream them from instead.
+        """
+        next_size = batch_size if callable(batch_size) else (lambda: batch_size)
+
+        if large is not None:
+            select, restore = self._large_select(table, large)
+            sql = f'SELECT {select} FROM "{table}"'
+        else:
+            sql = f'SELECT * FROM "{table}"'
+            restore = None
+
+        params: Tuple = ()
+        if key_range is not None:
+            sql += (
+                f' WHERE "{key_range.column}" >= ? AND "{key_range.column}" < ?'
+                f' ORDER BY "{key_range.column}"'
+            )
+            params = (key_range.start, key_range.end)
+
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params)
+
+                while True:
+                    rows = cursor.fetchmany(next_size())
+                    if not rows:
+                        break
+                    yield rows if restore is None else restore(rows)
+            finally:
+                cursor.close()
+
+    # ---------------------------
+    # Read rows with their key (for checkpoints)
+    # ---------------------------
+    def read_keyed_rows(
+        self,
+        table: str,
+        batch_size: Union[int, Callable[[], int]],
+        key_range,
+        large: Optional[LargeColumns] = None,
+    ) -> Generator[Tuple[int, List[Tuple]], None, None]:
+        """
+        Like ``read_rows`` over ``key_range`` in key order, but yields
+        ``(last_key, rows)`` so callers know exactly how far each batch got.
+        """
+        next_size = batch_size if callable(batch_size) else (lambda: batch_size)
+        column = key_range.column
+
+        if large is not None:
+            # La primera columna del select es el rowid, que aquí es la clave
+            select, restore = self._large_select(table, large)
+            sql = (
+                f'SELECT {select} FROM "{table}"'
+                f' WHERE "{column}" >= ? AND "{column}" < ?'
+                f' ORDER BY "{column}"'
+            )
+            with self.pool.connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(sql, (key_range.start, key_range.end))
+                    while True:
+                        rows = cursor.fetchmany(next_size())
+                        if not rows:
+                            break
+                        yield rows[-1][0], restore(rows)
+                finally:
+                    cursor.close()
+            return
+
+        sql = (
+            f'SELECT "{column}", * FROM "{table}"'
+            f' WHERE "{column}" >= ? AND "{column}" < ?'
+            f' ORDER BY "{column}"'
+        )
+
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, (key_range.start, key_range.end))
+
+                while True:
+                    rows = cursor.fetchmany(next_size())
+                    if not rows:
+                        break
+                    yield rows[-1][0], [row[1:] for row in rows]
+            finally:
+                cursor.close()
+
+    def _large_select(self, table: str, large: LargeColumns):
+        """
+        Select list that leaves values over the threshold in SQLite, and
+        the function that turns its rows back into table rows with a
+        LargeValue where a value was left behind.
+
+        Fetched row: rowid, then per column its value (NULL when too large)
+        and, for large columns, a flag telling a left-behind value from a
+        real NULL.
+        """
+        limit = int(large.threshold)
+        parts = ["rowid"]
+        value_at = []
+        flags = []
+        for index, name in enumerate(large.columns):
+            if index in large.indexes:
+                value_at.append(len(parts))
+                parts.append(f'CASE WHEN {_byte_length(name)} > {limit} THEN NULL ELSE "{name}" END')
+                flags.append((index, len(parts), name))
+                parts.append(f"{_byte_length(name)} > {limit}")
+            else:
+                value_at.append(len(parts))
+                parts.append(f'"{name}"')
+
+        opener = self.open_blob
+
+        def restore(rows: List[Tuple]) -> List[Tuple]:
+            out = []
+            for row in rows:
+                values = [row[i] for i in value_at]
+                for index, flag_at, name in flags:
+                    if row[flag_at]:
+                        values[index] = LargeValue(opener, table, name, row[0])
+                out.append(tuple(values))
+            return out
+
+        return ", ".join(parts), restore
+
+    # ---------------------------
+    # Delta reads (incremental sync)
+    # ---------------------------
+    def get_primary_key(self, table: str) -> List[str]:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'PRAGMA table_info("{table}")')
+            pk = sorted((col[5], col[1]) for col in cursor.fetchall() if col[5])
+            return [name for _, name in pk]
+
+    def get_max_value(self, table: str, column: str) -> Any:
+        with self.pool.connection() as conn:
+            return conn.execute(f'SELECT MAX("{column}") FROM "{table}"').fetchone()[0]
+
+    def read_rows_since(
+        self,
+        table: str,
+        column: str,
+        after: Any,
+        batch_size: Union[int, Callable[[], int]] = 1000,
+    ) -> Generator[Tuple[Any, List[Tuple]], None, None]:
+        """
+        Rows whose ``column`` is at least ``after`` (all rows if None), in
+        ``column`` order, as ``(last_value, rows)``. Rows equal to ``after``
+        are read again: on a non-unique column (``updated_at``) a later
+        write may share the watermark, and upserting a row twice is harmless.
+        """
+        next_size = batch_size if callable(batch_size) else (lambda: batch_size)
+
+        sql = f'SELECT "{column}", * FROM "{table}"'
+        params: Tuple = ()
+        if after is not None:
+            sql += f' WHERE "{column}" >= ?'
+            params = (after,)
+        sql += f' ORDER BY "{column}"'
+
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params)
+
+                while True:
+                    rows = cursor.fetchmany(next_size())
+                    if not rows:
+                        break
+                    yield rows[-1][0], [row[1:] for row in rows]
+            finally:
+                cursor.close()
+
+    def read_rows_by_keys(
+        self,
+        table: str,
+        pk_columns: List[str],
+        keys: List[Tuple],
+        chunk_size: int = 500,
     ) -> Generator[List[Tuple], None, None]:
+        """Current rows for the given primary keys (missing keys are skipped)."""
+        key_cols = ", ".join(f'"{c}"' for c in pk_columns)
+        row_params = "(" + ", ".join(["?"] * len(pk_columns)) + ")"
+
+        with self.pool.connection() as conn:
+            for i in range(0, len(keys), chunk_size):
+                chunk = keys[i:i + chunk_size]
+                values = ", ".join([row_params] * len(chunk))
+                params = [value for key in chunk for value in key]
+
+                if len(pk_columns) == 1:
+                    sql = f'SELECT * FROM "{table}" WHERE {key_cols} IN (VALUES {values})'
+                else:
+                    sql = f'SELECT * FROM "{table}" WHERE ({key_cols}) IN (VALUES {values})'
+
+                rows = conn.execute(sql, params).fetchall()
+                if rows:
+                    yield rows
+
 
-        conn = self.connect()
-        cursor = conn.cursor()
-        try:
-            cursor.execute(f'SELECT * FROM "{table}"')
-
-            while True:
-                rows = cursor.fetchmany(batch_size)
-                if not rows:
-                    break
-                yield rows
-        finally:
-            conn.close()
+def _byte_length(column: str) -> str:
+    # length() cuenta caracteres en TEXT y se detiene en el primer NUL;
+    # como BLOB mide los bytes que leerá blobopen
+    return (
+        f'CASE WHEN typeof("{column}") = \'text\' '
+        f'THEN length(CAST("{column}" AS BLOB)) ELSE length("{column}") END'
+    )
@@ -0,0 +1,62 @@
+import os
+import sqlite3
+from typing import Optional
+from urllib.parse import quote
+
+
+class SQLiteSnapshot:
+    """
+    Point-in-time copy of a live SQLite file, made with the online backup API.
+
+    Separate SQLite connections cannot share one read transaction, so the
+    runner's parallel readers would otherwise each see whatever the
+    application had committed when they started. The backup copies every
+    page in a single step, under one read lock, which yields a consistent
+    file; writers on the source are only blocked for the copy in rollback
+    journal mode (in WAL mode they keep going). Readers then open the copy
+    read-only and immutable.
+    """
+
+    def __init__(self, source_path: str, directory: Optional[str] = None, tag: str = "snapshot"):
+        self.source_path = source_path
+        source = os.path.abspath(source_path)
+        self.path = os.path.join(
+            directory or os.path.dirname(source),
+            f".{os.path.basename(source)}.{tag}",
+        )
+
+    # ---------------------------
+    # Create / remove
+    # ---------------------------
+    def create(self) -> str:
+        self.remove()
+
+        source = sqlite3.connect(
+            f"file:{quote(os.path.abspath(self.source_path))}?mode=ro", uri=True
+        )
+        target = sqlite3.connect(self.path)
+        try:
+            # pages=-1: todo en un paso, así la copia no se reinicia ni mezcla versiones
+            source.backup(target, pages=-1)
+            # Sin WAL: la copia se abre inmutable y no debe depender de ficheros -wal/-shm
+            target.execute("PRAGMA journal_mode = DELETE")
+        except Exception:
+            target.close()
+            self.remove()
+            raise
+        finally:
+            source.close()
+
+        target.close()
+        return self.path
+
+    def remove(self) -> None:
+        for path in (self.path, f"{self.path}-journal", f"{self.path}-wal", f"{self.path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def __enter__(self) -> str:
+        return self.create()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.remove()
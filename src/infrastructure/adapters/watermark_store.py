@@ -0,0 +1,74 @@
+from typing import Any, Optional
+
+
+WATERMARK_TABLE = "_migration_watermarks"
+
+# Prefix of the pseudo-tables holding each table's change-capture log position
+CHANGES_SCOPE = "__changes__"
+
+
+def changes_scope(table: str) -> str:
+    return f"{CHANGES_SCOPE}:{table}"
+
+
+class PostgresWatermarkStore:
+    """
+    Per-source, per-table sync watermarks kept in the target database.
+
+    Values are stored as text together with their kind ('int' or 'text') so
+    rowid watermarks compare numerically and ``updated_at``-style columns
+    compare as the strings SQLite stores. Methods take the caller's cursor
+    so a watermark commits with the rows it covers.
+    """
+
+    def ensure_table(self, cursor) -> None:
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS "{WATERMARK_TABLE}" (
+                source TEXT NOT NULL,
+                table_name TEXT NOT NULL,
+                column_name TEXT,
+                kind TEXT NOT NULL,
+                watermark TEXT,
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                PRIMARY KEY (source, table_name)
+            );
+            """
+        )
+
+    def get(self, cursor, source: str, table: str) -> Optional[Any]:
+        cursor.execute(
+            f"""
+            SELECT kind, watermark
+            FROM "{WATERMARK_TABLE}"
+            WHERE source = %s AND table_name = %s;
+            """,
+            (source, table),
+        )
+        row = cursor.fetchone()
+        if row is None or row[1] is None:
+            return None
+        return int(row[1]) if row[0] == "int" else row[1]
+
+    def save(
+        self,
+        cursor,
+        source: str,
+        table: str,
+        column: Optional[str],
+        value: Any,
+    ) -> None:
+        kind = "int" if isinstance(value, int) else "text"
+        cursor.execute(
+            f"""
+            INSERT INTO "{WATERMARK_TABLE}"
+                (source, table_name, column_name, kind, watermark, updated_at)
+            VALUES (%s, %s, %s, %s, %s, now())
+            ON CONFLICT (source, table_name) DO UPDATE
+            SET column_name = EXCLUDED.column_name,
+                kind = EXCLUDED.kind,
+                watermark = EXCLUDED.watermark,
+                updated_at = now();
+            """,
+            (source, table, column, kind, None if value is None else str(value)),
+        )
@@ -0,0 +1,64 @@
+import os
+import threading
+from typing import Optional
+
+
+DEFAULT_BROKER_URL = "redis://localhost:6379/0"
+
+_app = None
+_app_lock = threading.Lock()
+
+
+def create_celery_app(
+    broker_url: Optional[str] = None,
+    result_backend: Optional[str] = None,
+    eager: bool = False,
+):
+    """
+    Celery app for table tasks.
+
+    Tasks are acknowledged after they finish and re-queued if the worker
+    dies, one task is prefetched per worker process (tables are long and
+    uneven), and results go to a backend the coordinator polls for
+    progress. ``eager=True`` runs tasks inline in the caller's thread; with
+    ``memory://`` / ``cache+memory://`` it needs neither a broker nor
+    workers, which is how tests exercise the distributed path.
+    """
+    from celery import Celery
+
+    broker_url = broker_url or DEFAULT_BROKER_URL
+    app = Celery(
+        "migrator",
+        broker=broker_url,
+        backend=result_backend or broker_url,
+    )
+    app.conf.update(
+        task_serializer="json",
+        result_serializer="json",
+        accept_content=["json"],
+        task_acks_late=True,
+        task_reject_on_worker_lost=True,
+        task_track_started=True,
+        worker_prefetch_multiplier=1,
+        result_expires=24 * 3600,
+        task_always_eager=eager,
+        task_eager_propagates=False,
+    )
+    return app
+
+
+def get_celery_app():
+    """
+    Process-wide app, configured from the environment on first use:
+    MIGRATOR_CELERY_BROKER, MIGRATOR_CELERY_BACKEND (default: the broker)
+    and MIGRATOR_CELERY_EAGER=1 for the in-process test mode.
+    """
+    global _app
+    with _app_lock:
+        if _app is None:
+            _app = create_celery_app(
+                broker_url=os.environ.get("MIGRATOR_CELERY_BROKER"),
+                result_backend=os.environ.get("MIGRATOR_CELERY_BACKEND"),
+                eager=os.environ.get("MIGRATOR_CELERY_EAGER") == "1",
+            )
+        return _app
@@ -0,0 +1,186 @@
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Segundos: de una lectura en caché a un COPY de lote grande
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# (nombre, etiquetas, valor) de una muestra ya calculada
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _labels(self, values: Tuple) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    @abstractmethod
+    def samples(self) -> List[Sample]:
+        ...
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, *labels) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, self._labels(k), v) for k, v in items]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram; ``observe`` is one bisect and three adds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # etiquetas -> [cuentas por bucket (+Inf al final), suma, total]
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = [(k, (list(s[0]), s[1], s[2])) for k, s in self._series.items()]
+
+        out: List[Sample] = []
+        for key, (counts, total, count) in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                out.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            out.append((f"{self.name}_sum", labels, total))
+            out.append((f"{self.name}_count", labels, count))
+        return out
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics in the Prometheus text format.
+
+    Counters and histograms are updated on the hot path (one lock per
+    metric, no allocation after the first sample of a label set).
+    Collectors are callables run at scrape time for values that are
+    cheaper to read on demand, such as the state of live jobs.
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Optional[Iterable[float]] = None,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets or DEFAULT_BUCKETS))
+
+    def register_collector(self, collector) -> None:
+        """``collector()`` yields ``(name, type, help, samples)`` per metric family."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+
+        families = [(m.name, m.kind, m.help, m.samples()) for m in metrics]
+        for collector in collectors:
+            families.extend(collector())
+
+        lines = []
+        for name, kind, help_text, samples in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+
+metrics = MetricsRegistry()
+
+# ---------------------------
+# Hot-path metrics
+# ---------------------------
+ROWS_WRITTEN = metrics.counter(
+    "migrator_rows_total", "Rows handed to PostgreSQL", ("table",)
+)
+BYTES_WRITTEN = metrics.counter(
+    "migrator_bytes_total", "Estimated payload bytes handed to PostgreSQL", ("table",)
+)
+BATCH_SECONDS = metrics.histogram(
+    "migrator_batch_seconds", "Per-batch latency by pipeline stage (read, convert, write)", ("table", "stage")
+)
+COMMIT_SECONDS = metrics.histogram(
+    "migrator_commit_seconds", "PostgreSQL commit latency"
+)
+CONNECTIONS_OPENED = metrics.counter(
+    "migrator_connections_opened_total", "New pooled connections", ("side",)
+)
+CATALOG_SECONDS = metrics.histogram(
+    "migrator_catalog_load_seconds", "Schema introspection (catalog cache misses)", ("catalog",)
+)
@@ -0,0 +1,120 @@
+import threading
+
+import pytest
+
+from src.application.migration.batch_pipeline import BatchPipeline
+
+
+def _batches(n: int):
+    return [[(i, f"row-{i}")] for i in range(n)]
+
+
+def _double(batch):
+    return [(i * 2, text) for i, text in batch]
+
+
+def _consume(pipeline, seconds: float = 5.0):
+    # Si el pipeline se cuelga, que falle el test en vez de la suite entera
+    out, errors = [], []
+
+    def run():
+        try:
+            out.extend(pipeline)
+        except BaseException as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), "pipeline hung"
+    if errors:
+        raise errors[0]
+    return out
+
+
+# ---------------------------
+# Ordering
+# ---------------------------
+@pytest.mark.parametrize("convert", [None, _double])
+def test_threaded_output_matches_inline(convert):
+    inline = list(BatchPipeline(_batches(50), convert=convert, depth=0))
+    threaded = _consume(BatchPipeline(_batches(50), convert=convert, depth=2))
+
+    assert threaded == inline
+    assert len(inline) == 50
+
+
+def test_timings_cover_every_stage():
+    pipeline = BatchPipeline(_batches(3), convert=_double, depth=1)
+    _consume(pipeline)
+    assert set(pipeline.timings) >= {"read", "convert", "write", "read_blocked", "convert_blocked", "write_starved"}
+
+
+# ---------------------------
+# Stage failures
+# ---------------------------
+def _failing_source():
+    yield [(1,)]
+    raise RuntimeError("read failed")
+
+
+def test_read_failure_reaches_the_consumer():
+    with pytest.raises(RuntimeError, match="read failed"):
+        _consume(BatchPipeline(_failing_source(), depth=2))
+
+
+def test_convert_failure_reaches_the_consumer():
+    def convert(batch):
+        if batch[0][0] == 3:
+            raise ValueError("convert failed")
+        return batch
+
+    discarded = []
+    pipeline = BatchPipeline(_batches(10), convert=convert, depth=2, discard=discarded.append)
+    with pytest.raises(ValueError, match="convert failed"):
+        _consume(pipeline)
+    assert [(3, "row-3")] in discarded
+
+
+# ---------------------------
+# Cancellation
+# ---------------------------
+def test_cancel_mid_stream_stops_and_discards_queued_batches():
+    stop = threading.Event()
+    read = []
+
+    def source():
+        for batch in _batches(1000):
+            read.append(batch)
+            yield batch
+
+    discarded = []
+    pipeline = BatchPipeline(source(), convert=_double, depth=2, should_stop=stop.is_set, discard=discarded.append)
+
+    received = []
+
+    def run():
+        for batch in pipeline:
+            received.append(batch)
+            if len(received) == 5:
+                stop.set()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
+
+    # Todo lo leído o se entregó o se descartó; nada se queda a medias
+    assert len(received) == 5
+    assert len(read) < 1000
+    assert len(received) + len(discarded) == len(read)
+
+
+def test_closing_the_consumer_joins_the_stages():
+    pipeline = BatchPipeline(iter(_batches(1000)), depth=2)
+    batches = iter(pipeline)
+    next(batches)
+    batches.close()
+
+    assert pipeline.stopped()
+    assert not [t for t in threading.enumerate() if t.name.startswith("pipeline-")]
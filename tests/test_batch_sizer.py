@@ -0,0 +1,36 @@
+from src.application.migration.batch_sizer import AdaptiveBatchSizer, sample_batch_bytes
+
+
+def test_sample_batch_bytes_scales_sample_to_batch():
+    rows = [("abcd", 1)] * 100
+    assert sample_batch_bytes(rows) == 100 * (4 + 8)
+    assert sample_batch_bytes([]) == 0
+
+
+def test_growth_is_limited_to_doubling():
+    sizer = AdaptiveBatchSizer(initial_rows=100, target_bytes=10**9, target_seconds=100)
+    sizer.observe(rows=100, nbytes=100, write_seconds=0.001)
+    assert sizer.next_size() == 200
+
+
+def test_byte_target_shrinks_wide_rows():
+    sizer = AdaptiveBatchSizer(initial_rows=1000, target_bytes=1000, target_seconds=100)
+    sizer.observe(rows=1000, nbytes=100_000, write_seconds=0.01)
+    assert sizer.next_size() == 10
+
+
+def test_latency_target_shrinks_slow_writes():
+    sizer = AdaptiveBatchSizer(initial_rows=1000, target_bytes=10**9, target_seconds=0.5)
+    sizer.observe(rows=1000, nbytes=1000, write_seconds=2.0)
+    assert sizer.next_size() == 250
+
+
+def test_size_is_clamped():
+    sizer = AdaptiveBatchSizer(initial_rows=5, min_rows=10, max_rows=50)
+    assert sizer.next_size() == 10
+    for _ in range(5):
+        sizer.observe(rows=sizer.next_size(), nbytes=1, write_seconds=0.0)
+    assert sizer.next_size() == 50
+
+    sizer.observe(rows=0, nbytes=0, write_seconds=0)
+    assert sizer.next_size() == 50
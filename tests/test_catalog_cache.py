@@ -0,0 +1,103 @@
+import sqlite3
+
+import pytest
+
+from src.application.schema.catalog_cache import CatalogCache
+from src.infrastructure.adapters.sqlite_reader import SQLiteReader
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = str(tmp_path / "catalog.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE parent (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE child (id INTEGER PRIMARY KEY, parent_id INTEGER REFERENCES parent(id));
+        """
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def reader(source):
+    reader = SQLiteReader(source, pool_size=1)
+    yield reader
+    reader.close()
+
+
+def _execute(path, sql):
+    conn = sqlite3.connect(path)
+    conn.executescript(sql)
+    conn.commit()
+    conn.close()
+
+
+# ---------------------------
+# Hits / misses
+# ---------------------------
+def test_repeated_lookups_hit_the_snapshot(reader):
+    cache = CatalogCache()
+    first = cache.sqlite_schemas(reader)
+    assert cache.sqlite_schemas(reader) is first
+    assert sorted(first) == ["child", "parent"]
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+def test_each_catalog_has_its_own_entry(reader):
+    cache = CatalogCache()
+    cache.sqlite_schemas(reader)
+    foreign_keys = cache.sqlite_foreign_keys(reader)
+    cache.sqlite_indexes(reader)
+
+    assert foreign_keys["child"][0]["table"] == "parent"
+    assert cache.stats() == {"entries": 3, "hits": 0, "misses": 3}
+
+
+def test_another_reader_on_the_same_file_shares_the_entry(source, reader):
+    cache = CatalogCache()
+    first = cache.sqlite_schemas(reader)
+
+    other = SQLiteReader(source, pool_size=1)
+    try:
+        assert cache.sqlite_schemas(other) is first
+    finally:
+        other.close()
+
+
+# ---------------------------
+# Invalidation
+# ---------------------------
+def test_schema_change_reloads_the_snapshot(source, reader):
+    cache = CatalogCache()
+    cache.sqlite_schemas(reader)
+
+    # Cambia el pragma schema_version: la entrada deja de ser válida
+    _execute(source, "ALTER TABLE parent ADD COLUMN code TEXT")
+    schemas = cache.sqlite_schemas(reader)
+
+    assert [c["name"] for c in schemas["parent"]] == ["id", "name", "code"]
+    assert cache.stats()["misses"] == 2
+
+    # Los datos no cambian el token
+    _execute(source, "INSERT INTO parent VALUES (1, 'a', 'x')")
+    assert cache.sqlite_schemas(reader) is schemas
+
+
+def test_expired_entries_are_reloaded(reader):
+    cache = CatalogCache(ttl_seconds=0)
+    cache.sqlite_schemas(reader)
+    cache.sqlite_schemas(reader)
+    assert cache.stats()["hits"] == 0
+
+
+def test_invalidate_drops_every_entry(reader):
+    cache = CatalogCache()
+    cache.sqlite_schemas(reader)
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0
+
+    cache.sqlite_schemas(reader)
+    assert cache.stats()["misses"] == 2
@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+
+from src.infrastructure.adapters.connection_pool import ConnectionPool
+
+
+class _Conn:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_released_connections_are_reused():
+    pool = ConnectionPool(_Conn, max_size=2)
+    first = pool.acquire()
+    pool.release(first)
+
+    assert pool.acquire() is first
+    stats = pool.stats()
+    assert (stats["opened"], stats["reused"], stats["in_use"], stats["idle"]) == (1, 1, 1, 0)
+
+
+def test_exhausted_pool_times_out():
+    pool = ConnectionPool(_Conn, max_size=1)
+    pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+    assert pool.stats()["waits"] == 1
+
+
+def test_waiter_gets_the_released_connection():
+    pool = ConnectionPool(_Conn, max_size=1)
+    held = pool.acquire()
+    got = []
+
+    thread = threading.Thread(target=lambda: got.append(pool.acquire(timeout=5)))
+    thread.start()
+    time.sleep(0.05)
+    assert not got
+
+    pool.release(held)
+    thread.join(5)
+    assert got == [held]
+    assert pool.stats()["open"] == 1
+
+
+def test_failed_reset_discards_the_connection():
+    def reset(conn):
+        raise RuntimeError("connection is broken")
+
+    pool = ConnectionPool(_Conn, max_size=1, reset=reset)
+    conn = pool.acquire()
+    pool.release(conn)
+
+    assert conn.closed
+    assert pool.stats()["discarded"] == 1
+    assert pool.acquire() is not conn
+
+
+def test_failed_factory_frees_its_slot():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError("could not connect")
+        return _Conn()
+
+    pool = ConnectionPool(factory, max_size=1)
+    with pytest.raises(OSError):
+        pool.acquire()
+    assert pool.acquire(timeout=0.05) is not None
+
+
+def test_closed_connection_is_discarded_after_an_error():
+    pool = ConnectionPool(_Conn, max_size=1)
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            conn.closed = True
+            raise RuntimeError("server went away")
+
+    stats = pool.stats()
+    assert (stats["open"], stats["idle"], stats["discarded"]) == (0, 0, 1)
+
+
+def test_max_size_must_be_positive():
+    with pytest.raises(ValueError):
+        ConnectionPool(_Conn, max_size=0)
+
+
+def test_connection_released_after_close_is_closed():
+    pool = ConnectionPool(_Conn, max_size=2)
+    idle = pool.acquire()
+    busy = pool.acquire()
+    pool.release(idle)
+
+    pool.close()
+    assert idle.closed and not busy.closed
+
+    # Un hilo que terminaba tarde devuelve su conexión: no debe quedar abierta
+    pool.release(busy)
+    assert busy.closed
+    assert pool.stats()["open"] == 0
@@ -0,0 +1,115 @@
+import struct
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from src.infrastructure.adapters.copy_encoder import (
+    BINARY_HEADER,
+    BINARY_NULL,
+    BINARY_TRAILER,
+    BinaryCopyEncoder,
+    CopyStream,
+    CsvCopyEncoder,
+    build_copy_encoder,
+    iter_copy_chunks,
+    _encode_date,
+    _encode_int8,
+    _encode_numeric,
+    _encode_timestamp,
+)
+
+
+def _numeric(body: bytes):
+    """(ndigits, weight, sign, dscale, digits) of an encoded NUMERIC field."""
+    length, ndigits, weight, sign, dscale = struct.unpack("!ihhHH", body[:12])
+    assert length == len(body) - 4
+    digits = struct.unpack(f"!{ndigits}h", body[12:])
+    return ndigits, weight, sign, dscale, list(digits)
+
+
+# ---------------------------
+# CSV
+# ---------------------------
+def test_csv_quotes_strings_and_leaves_null_unquoted():
+    data = CsvCopyEncoder().encode_batch([(1, 'say "hi"', None, "", True, b"\x00\xff")])
+    assert data == b'1,"say ""hi""",,"",t,\\x00ff\n'
+
+
+# ---------------------------
+# Binary scalars
+# ---------------------------
+def test_int8_packs_integers_and_integral_floats():
+    assert _encode_int8(-2) == struct.pack("!iq", 8, -2)
+    assert _encode_int8(3.0) == struct.pack("!iq", 8, 3)
+
+
+def test_int8_rejects_non_integral_floats():
+    with pytest.raises(ValueError):
+        _encode_int8(1.5)
+
+
+def test_timestamp_and_date_count_from_postgres_epoch():
+    assert _encode_timestamp(datetime(2000, 1, 1, 0, 0, 1)) == struct.pack("!iq", 8, 1_000_000)
+    assert _encode_timestamp("2000-01-01T01:00:00+01:00") == struct.pack("!iq", 8, 0)
+    assert _encode_date(date(2000, 1, 2)) == struct.pack("!ii", 4, 1)
+    assert _encode_date("1999-12-31 23:59:59") == struct.pack("!ii", 4, -1)
+
+
+# ---------------------------
+# Binary NUMERIC
+# ---------------------------
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (Decimal("0"), (0, 0, 0x0000, 0, [])),
+        (Decimal("12345.678"), (3, 1, 0x0000, 3, [1, 2345, 6780])),
+        (Decimal("-0.0001"), (1, -1, 0x4000, 4, [1])),
+        (Decimal("1E+5"), (1, 1, 0x0000, 0, [10])),
+        (100000000, (1, 2, 0x0000, 0, [1])),
+        ("3.14", (2, 0, 0x0000, 2, [3, 1400])),
+    ],
+)
+def test_numeric_base_10000_packing(value, expected):
+    assert _numeric(_encode_numeric(value)) == expected
+
+
+def test_numeric_nan_and_infinity():
+    assert _numeric(_encode_numeric(Decimal("NaN"))) == (0, 0, 0xC000, 0, [])
+    with pytest.raises(ValueError):
+        _encode_numeric(Decimal("Infinity"))
+
+
+# ---------------------------
+# Binary rows / stream
+# ---------------------------
+def test_binary_row_layout():
+    encoder = BinaryCopyEncoder(["BIGINT", "TEXT", "BYTEA"])
+    data = encoder.encode_batch([(7, "é", None)])
+    assert data == (
+        struct.pack("!h", 3)
+        + struct.pack("!iq", 8, 7)
+        + struct.pack("!i", 2) + "é".encode("utf-8")
+        + BINARY_NULL
+    )
+
+
+def test_binary_stream_has_header_and_trailer():
+    encoder = build_copy_encoder("binary", ["BIGINT"])
+    payload = b"".join(iter_copy_chunks(encoder, [[(1,)], [(2,)]]))
+    assert payload.startswith(BINARY_HEADER)
+    assert payload.endswith(BINARY_TRAILER)
+
+
+def test_build_copy_encoder_validates_arguments():
+    with pytest.raises(ValueError):
+        build_copy_encoder("binary")
+    with pytest.raises(ValueError):
+        build_copy_encoder("text")
+
+
+def test_copy_stream_serves_reads_across_chunks():
+    stream = CopyStream(iter([b"abc", b"de", b"f"]))
+    assert stream.read(4) == b"abcd"
+    assert stream.read(-1) == b"ef"
+    assert stream.read(1) == b""
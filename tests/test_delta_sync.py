@@ -0,0 +1,240 @@
+import contextlib
+import sqlite3
+import types
+
+import pytest
+
+from src.application.dtos import StartSyncRequest
+from src.application.migration import delta_sync
+from src.application.migration.delta_sync import DeltaSyncRunner
+from src.domain.models import JobStatus, MigrationJob
+from src.infrastructure.adapters.sqlite_change_capture import CHANGES_TABLE
+
+
+# ---------------------------
+# Fakes: target tables and watermarks in memory
+# ---------------------------
+class _Session:
+    def __init__(self, target):
+        self.target = target
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self):
+        return contextlib.nullcontext()
+
+    def upsert_rows(self, table, columns, pk_columns, batches):
+        rows = self.target.tables.setdefault(table, {})
+        key_index = [columns.index(c) for c in pk_columns]
+        count = 0
+        for batch in batches:
+            for row in batch:
+                rows[tuple(row[i] for i in key_index)] = tuple(row)
+                self.target.ops.append(("U", table))
+                count += 1
+        return count
+
+    def delete_keys(self, table, pk_columns, keys):
+        rows = self.target.tables.setdefault(table, {})
+        for key in keys:
+            rows.pop(tuple(key), None)
+            self.target.ops.append(("D", table))
+        return len(keys)
+
+
+class _Writer:
+    postgres_url = "postgresql://fake/delta"
+    schema = "public"
+    pool = types.SimpleNamespace(stats=lambda: {})
+
+    def __init__(self):
+        self.tables = {}
+        self.ops = []
+
+    def get_catalog_version(self):
+        return 0
+
+    def get_all_table_schemas(self):
+        return {}
+
+    def session(self):
+        return _Session(self)
+
+    def close(self):
+        pass
+
+
+class _Watermarks:
+    def __init__(self):
+        self.values = {}
+
+    def ensure_table(self, cursor):
+        pass
+
+    def get(self, cursor, source, table):
+        return self.values.get(table)
+
+    def save(self, cursor, source, table, column, value):
+        self.values[table] = value
+
+
+class _JobManager:
+    def __init__(self):
+        self.jobs = {}
+
+    def get(self, job_id):
+        return self.jobs.setdefault(job_id, MigrationJob(job_id=job_id, status=JobStatus.RUNNING))
+
+    def update(self, job):
+        pass
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = str(tmp_path / "source.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE parent (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE child (
+            id INTEGER PRIMARY KEY,
+            parent_id INTEGER REFERENCES parent(id),
+            updated_at TEXT
+        );
+        INSERT INTO parent VALUES (1, 'a'), (2, 'b');
+        INSERT INTO child VALUES (10, 1, '2024-01-01'), (11, 2, '2024-01-02');
+        """
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def sync(source, monkeypatch):
+    """Runs sync passes against one fake target; returns (run, writer, watermarks)."""
+    writer = _Writer()
+    monkeypatch.setattr(delta_sync, "PostgreSQLWriter", lambda *args, **kwargs: writer)
+    manager = _JobManager()
+    watermarks = _Watermarks()
+    passes = []
+
+    def run(**kwargs):
+        runner = DeltaSyncRunner(manager)
+        runner.watermarks = watermarks
+        job_id = f"sync-{len(passes)}"
+        runner.run(job_id, StartSyncRequest(sqlite_path=source, postgres_url=writer.postgres_url, **kwargs))
+        job = manager.get(job_id)
+        passes.append(job)
+        assert job.errors == []
+        assert job.status == JobStatus.COMPLETED
+        return job
+
+    return run, writer, watermarks
+
+
+def _execute(path, sql):
+    conn = sqlite3.connect(path)
+    conn.executescript(sql)
+    conn.commit()
+    conn.close()
+
+
+def _pending(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f"SELECT table_name, op FROM {CHANGES_TABLE} ORDER BY seq").fetchall()
+    finally:
+        conn.close()
+
+
+# ---------------------------
+# Watermark mode
+# ---------------------------
+def test_watermark_pass_copies_rows_above_the_watermark(source, sync):
+    run, writer, watermarks = sync
+    run(tables=["parent"])
+    assert set(writer.tables["parent"]) == {(1,), (2,)}
+    assert watermarks.values["parent"] == 2
+
+    _execute(source, "INSERT INTO parent VALUES (3, 'c')")
+    run(tables=["parent"])
+    assert writer.tables["parent"][(3,)] == (3, "c")
+    assert watermarks.values["parent"] == 3
+
+
+def test_rows_sharing_the_watermark_value_are_not_skipped(source, sync):
+    run, writer, watermarks = sync
+    options = {"tables": ["child"], "watermark_columns": {"child": "updated_at"}}
+    run(**options)
+    assert watermarks.values["child"] == "2024-01-02"
+
+    # Escrita después del pase anterior, con el mismo timestamp que el watermark
+    _execute(source, "INSERT INTO child VALUES (12, 1, '2024-01-02')")
+    run(**options)
+    assert (12,) in writer.tables["child"]
+
+
+def test_baseline_records_the_watermark_without_copying(sync):
+    run, writer, watermarks = sync
+    run(tables=["parent"], baseline=True)
+    assert watermarks.values["parent"] == 2
+    assert writer.tables == {}
+
+
+# ---------------------------
+# Change capture mode
+# ---------------------------
+def test_capture_applies_net_changes_in_foreign_key_order(source, sync):
+    run, writer, _ = sync
+    run(capture_changes=True, baseline=True)
+
+    _execute(
+        source,
+        """
+        INSERT INTO parent VALUES (3, 'c');
+        INSERT INTO child VALUES (12, 3, '2024-02-01');
+        UPDATE parent SET name = 'a2' WHERE id = 1;
+        DELETE FROM child WHERE id = 11;
+        DELETE FROM parent WHERE id = 2;
+        """
+    )
+    writer.tables = {
+        "parent": {(1,): (1, "a"), (2,): (2, "b")},
+        "child": {(10,): (10, 1, "2024-01-01"), (11,): (11, 2, "2024-01-02")},
+    }
+    run(capture_changes=True)
+
+    assert writer.tables["parent"] == {(1,): (1, "a2"), (3,): (3, "c")}
+    assert set(writer.tables["child"]) == {(10,), (12,)}
+
+    # Altas de padres antes que de hijos; bajas de hijos antes que de padres
+    assert writer.ops == [("U", "parent"), ("U", "parent"), ("U", "child"), ("D", "child"), ("D", "parent")]
+    assert _pending(source) == []
+
+
+def test_scoped_capture_pass_leaves_other_tables_pending(source, sync):
+    run, writer, watermarks = sync
+    run(capture_changes=True, baseline=True)
+
+    _execute(
+        source,
+        """
+        INSERT INTO parent VALUES (3, 'c');
+        INSERT INTO child VALUES (12, 3, '2024-02-01');
+        """
+    )
+    run(capture_changes=True, tables=["parent"])
+
+    assert set(writer.tables["parent"]) == {(3,)}
+    assert "child" not in writer.tables
+    assert _pending(source) == [("child", "U")]
+
+    # El pase sobre child aplica lo que quedó pendiente
+    run(capture_changes=True, tables=["child"])
+    assert set(writer.tables["child"]) == {(12,)}
+    assert _pending(source) == []
@@ -0,0 +1,118 @@
+import asyncio
+
+from src.application.jobs.job_events import JobEventStream
+from src.application.jobs.job_manager import JobManager
+from src.domain.models import JobStatus, MigrationJob
+
+
+def _snapshot(job):
+    return {"rows": job.processed_rows, "status": job.status.value}
+
+
+def _stream(manager, job_id, **kwargs):
+    return JobEventStream(manager, job_id, _snapshot, **kwargs)
+
+
+def _manager(status=JobStatus.RUNNING):
+    manager = JobManager()
+    manager.create(MigrationJob(job_id="job-1", status=status))
+    return manager
+
+
+def _collect(events):
+    async def run():
+        return [event async for event in events]
+
+    return asyncio.run(run())
+
+
+# ---------------------------
+# Coalescing
+# ---------------------------
+def test_burst_of_updates_yields_one_snapshot():
+    manager = _manager()
+    job = manager.get("job-1")
+
+    async def run():
+        events = _stream(manager, "job-1", interval=0.05, heartbeat=5).events()
+        seen = [await events.__anext__()]
+
+        # Cada lote notifica; el stream despierta una vez y lee el estado acumulado
+        for _ in range(50):
+            job.record_progress(10)
+            manager.update(job)
+        job.record_table_done("parent")
+        manager.update(job)
+        seen += [await events.__anext__(), await events.__anext__()]
+
+        job.mark_completed()
+        manager.update(job)
+        seen += [event async for event in events]
+        return seen
+
+    events = asyncio.run(run())
+
+    assert events == [
+        ("progress", {"rows": 0, "status": "RUNNING"}),
+        ("table", {"job_id": "job-1", "table": "parent"}),
+        ("progress", {"rows": 500, "status": "RUNNING"}),
+        ("end", {"job_id": "job-1", "status": "COMPLETED"}),
+    ]
+
+
+# ---------------------------
+# Heartbeat
+# ---------------------------
+def test_idle_job_gets_pings_until_it_changes():
+    manager = _manager()
+    job = manager.get("job-1")
+
+    async def run():
+        events = _stream(manager, "job-1", interval=0, heartbeat=0.02).events()
+        seen = [await events.__anext__(), await events.__anext__(), await events.__anext__()]
+
+        job.cancel()
+        manager.update(job)
+        seen += [event async for event in events if event[0] != "ping"]
+        return seen
+
+    events = asyncio.run(run())
+
+    assert [name for name, _ in events] == ["progress", "ping", "ping", "progress", "end"]
+    assert events[-1] == ("end", {"job_id": "job-1", "status": "CANCELLED"})
+
+
+# ---------------------------
+# Termination
+# ---------------------------
+def test_finished_job_ends_the_stream_and_unsubscribes():
+    manager = _manager(status=JobStatus.COMPLETED)
+
+    events = _collect(_stream(manager, "job-1").events())
+
+    assert [name for name, _ in events] == ["progress", "end"]
+    assert manager._listeners == {}
+
+
+def test_failure_reports_the_error_before_ending():
+    manager = _manager()
+    job = manager.get("job-1")
+    job.mark_failed("connection refused")
+
+    events = _collect(_stream(manager, "job-1").events())
+
+    assert events[0] == ("error", {"job_id": "job-1", "error": "connection refused"})
+    assert events[-1] == ("end", {"job_id": "job-1", "status": "FAILED"})
+
+
+def test_disconnected_client_unsubscribes():
+    manager = _manager()
+
+    async def run():
+        events = _stream(manager, "job-1", heartbeat=5).events()
+        await events.__anext__()
+        assert list(manager._listeners) == ["job-1"]
+        await events.aclose()
+
+    asyncio.run(run())
+    assert manager._listeners == {}
@@ -0,0 +1,88 @@
+import threading
+import time
+
+import pytest
+
+from src.application.jobs.job_scheduler import JobScheduler
+
+
+def _blocking(started: list, release: threading.Event, name: str):
+    def run():
+        started.append(name)
+        release.wait(timeout=5)
+
+    return run
+
+
+def _wait_for(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+def test_limits_must_be_positive():
+    with pytest.raises(ValueError):
+        JobScheduler(max_workers=0)
+
+
+def test_per_target_limit_does_not_block_other_targets():
+    scheduler = JobScheduler(max_workers=3, max_per_target=1, max_per_source=5)
+    release = threading.Event()
+    started = []
+    try:
+        scheduler.submit("a1", _blocking(started, release, "a1"), target="a")
+        scheduler.submit("a2", _blocking(started, release, "a2"), target="a")
+        scheduler.submit("b1", _blocking(started, release, "b1"), target="b")
+
+        _wait_for(lambda: len(started) == 2)
+        assert sorted(started) == ["a1", "b1"]
+        assert scheduler.position("a2") == 1
+
+        release.set()
+        _wait_for(lambda: "a2" in started)
+    finally:
+        release.set()
+        scheduler.shutdown()
+
+
+def test_priority_then_fifo_order():
+    scheduler = JobScheduler(max_workers=1)
+    release = threading.Event()
+    started = []
+    try:
+        scheduler.submit("first", _blocking(started, release, "first"))
+        _wait_for(lambda: started == ["first"])
+
+        scheduler.submit("low", lambda: started.append("low"), priority=0)
+        scheduler.submit("high", lambda: started.append("high"), priority=5)
+        scheduler.submit("low2", lambda: started.append("low2"), priority=0)
+        assert [scheduler.position(j) for j in ("high", "low", "low2")] == [1, 2, 3]
+
+        release.set()
+        _wait_for(lambda: len(started) == 4)
+        assert started == ["first", "high", "low", "low2"]
+    finally:
+        release.set()
+        scheduler.shutdown()
+
+
+def test_cancel_and_duplicate_submit():
+    scheduler = JobScheduler(max_workers=1)
+    release = threading.Event()
+    started = []
+    try:
+        scheduler.submit("running", _blocking(started, release, "running"))
+        scheduler.submit("queued", lambda: started.append("queued"))
+        with pytest.raises(ValueError):
+            scheduler.submit("queued", lambda: None)
+
+        assert scheduler.cancel("queued") is True
+        assert scheduler.cancel("running") is False
+        assert scheduler.stats()["queued"] == 0
+    finally:
+        release.set()
+        scheduler.shutdown()
+    assert started == ["running"]
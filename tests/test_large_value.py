@@ -0,0 +1,63 @@
+import sqlite3
+
+import pytest
+
+from src.application.dtos import StartExportRequest
+from src.application.migration.migration_plan import MigrationPlanner
+from src.infrastructure.adapters.copy_encoder import BinaryCopyEncoder, CsvCopyEncoder
+from src.infrastructure.adapters.large_value import LargeValue
+from src.infrastructure.adapters.sqlite_reader import SQLiteReader
+
+BLOB = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = str(tmp_path / "source.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE docs (id INTEGER PRIMARY KEY, body TEXT, data BLOB)")
+    conn.execute("INSERT INTO docs VALUES (1, ?, ?)", ("é\x00" * 3000, BLOB))
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _plan(path, tmp_path):
+    reader = SQLiteReader(path, pool_size=1, read_only=True)
+    req = StartExportRequest(sqlite_path=path, spool_dir=str(tmp_path), large_value_bytes=1024)
+    return reader, MigrationPlanner(reader, None).compile_tables(req)[0]["docs"]
+
+
+def test_declared_blob_streams_as_bytea(source, tmp_path):
+    reader, plan = _plan(source, tmp_path)
+    try:
+        assert plan.large_columns.indexes == {1: False, 2: True}
+
+        value = LargeValue(reader.open_blob, "docs", "data", 1)
+        assert b"".join(value.chunks(1000)) == BLOB
+
+        row = (1, LargeValue(reader.open_blob, "docs", "body", 1), value)
+        binary = b"".join(BinaryCopyEncoder(plan.column_types).encode_streamed_row(row, plan.large_columns))
+        assert BLOB in binary
+        assert ("é" * 3000).encode("utf-8") in binary
+
+        csv = b"".join(CsvCopyEncoder().encode_streamed_row(row, plan.large_columns))
+        assert b"\\x" + BLOB.hex().encode("ascii") in csv
+    finally:
+        reader.close()
+
+
+def test_text_stream_rejects_invalid_utf8(source, tmp_path):
+    conn = sqlite3.connect(source)
+    # Un blob en una columna TEXT: SQLite lo guarda tal cual
+    conn.execute("INSERT INTO docs VALUES (2, ?, NULL)", (b"ok\xff" * 10,))
+    conn.commit()
+    conn.close()
+
+    reader = SQLiteReader(source, pool_size=1, read_only=True)
+    try:
+        value = LargeValue(reader.open_blob, "docs", "body", 2)
+        with pytest.raises(UnicodeDecodeError):
+            b"".join(value.chunks(4, as_bytes=False))
+    finally:
+        reader.close()
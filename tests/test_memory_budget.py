@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from src.application.jobs.memory_budget import MemoryBudget
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        MemoryBudget(0)
+
+
+def test_acquire_blocks_until_release():
+    budget = MemoryBudget(100)
+    budget.acquire(80)
+
+    acquired = threading.Event()
+    thread = threading.Thread(target=lambda: (budget.acquire(30), acquired.set()))
+    thread.start()
+    time.sleep(0.05)
+    assert not acquired.is_set()
+
+    budget.release(80)
+    thread.join(timeout=2)
+    assert acquired.is_set()
+    assert budget.stats() == {"capacity": 100, "used": 30, "peak": 80}
+
+
+def test_oversized_reservation_granted_when_idle():
+    budget = MemoryBudget(10)
+    assert budget.acquire(50)
+    assert budget.used == 50
+
+
+def test_abort_returns_false_without_reserving():
+    budget = MemoryBudget(10)
+    budget.acquire(10)
+    assert budget.acquire(5, abort=lambda: True) is False
+    assert budget.used == 10
+
+
+def test_child_reservations_count_against_parent():
+    parent = MemoryBudget(100)
+    child = MemoryBudget(60, parent=parent)
+    child.acquire(40)
+    assert parent.used == 40
+    child.release(40)
+    assert parent.used == 0 and child.used == 0
+
+
+def test_lease_close_returns_outstanding_bytes():
+    budget = MemoryBudget(100)
+    lease = budget.lease()
+    lease.acquire(30)
+    lease.acquire(20)
+    lease.release(20)
+    lease.close()
+    assert budget.used == 0
+
+    # Tras cerrar, nada queda reservado
+    lease.acquire(10)
+    assert budget.used == 0
+
+
+def test_lease_acquire_gives_up_when_aborted():
+    budget = MemoryBudget(100)
+    budget.acquire(100)
+    lease = budget.lease()
+
+    assert lease.acquire(10, abort=lambda: True) is False
+    assert lease.outstanding == 0 and budget.used == 100
@@ -0,0 +1,46 @@
+import pytest
+
+from src.infrastructure.metrics import MetricsRegistry, _Metric
+
+
+def test_counter_and_labels_render():
+    registry = MetricsRegistry()
+    rows = registry.counter("rows_total", "Rows", ("table",))
+    rows.inc(3, 'we"ird')
+    rows.inc(2, 'we"ird')
+
+    text = registry.render()
+    assert "# HELP rows_total Rows\n# TYPE rows_total counter\n" in text
+    assert 'rows_total{table="we\\"ird"} 5\n' in text
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        latency.observe(value)
+
+    lines = registry.render().splitlines()
+    assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{le="1"} 3' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+    assert "latency_seconds_sum 2.65" in lines
+    assert "latency_seconds_count 4" in lines
+
+
+def test_collectors_run_at_render_time():
+    registry = MetricsRegistry()
+    state = {"running": 1}
+    registry.register_collector(
+        lambda: [("jobs", "gauge", "Jobs", [("jobs", {"status": "running"}, state["running"])])]
+    )
+    state["running"] = 2
+    assert 'jobs{status="running"} 2' in registry.render()
+
+
+def test_metric_without_samples_fails_at_construction():
+    class Gauge(_Metric):
+        kind = "gauge"
+
+    with pytest.raises(TypeError):
+        Gauge("g", "Gauge")
@@ -0,0 +1,158 @@
+import sqlite3
+
+import pytest
+
+from src.application.dtos import StartMigrationRequest
+from src.application.migration.migration_plan import PROBE_TABLE, MigrationPlanner
+from src.domain.models import LoadMode, RowEstimate
+from src.infrastructure.adapters.sqlite_reader import SQLiteReader
+
+
+# ---------------------------
+# Fake target: catalog in memory, probe session recorded
+# ---------------------------
+class _Session:
+    def __init__(self, writer):
+        self.writer = writer
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_sql(self, sql):
+        self.writer.statements.append(sql.split("(")[0].strip())
+
+    def copy_rows(self, table, columns, batches, copy_format="csv", column_types=None):
+        self.writer.copied.append((table, sum(len(b) for b in batches), copy_format))
+
+    def insert_rows(self, table, columns, rows):
+        self.writer.copied.append((table, len(rows), "insert"))
+
+    def rollback(self):
+        self.writer.statements.append("ROLLBACK")
+
+
+class _Writer:
+    schema = "public"
+
+    def __init__(self, postgres_url, schemas=None):
+        # URL propia por test: la caché de catálogo es de proceso
+        self.postgres_url = postgres_url
+        self.schemas = schemas or {}
+        self.statements = []
+        self.copied = []
+
+    def get_catalog_version(self):
+        return 0
+
+    def get_all_table_schemas(self):
+        return self.schemas
+
+    def session(self):
+        return _Session(self)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = str(tmp_path / "source.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE parent (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE child (
+            id INTEGER PRIMARY KEY,
+            parent_id INTEGER REFERENCES parent(id),
+            note TEXT
+        );
+        CREATE INDEX child_parent ON child (parent_id);
+        CREATE TABLE tag (code TEXT PRIMARY KEY) WITHOUT ROWID;
+        """
+    )
+    conn.executemany("INSERT INTO parent VALUES (?, ?)", [(i, f"p{i}") for i in range(1, 11)])
+    conn.executemany("INSERT INTO child VALUES (?, ?, ?)", [(i, i % 10 + 1, "x" * 50) for i in range(1, 41)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def reader(source):
+    reader = SQLiteReader(source, pool_size=1)
+    yield reader
+    reader.close()
+
+
+def _request(source, **kwargs):
+    return StartMigrationRequest(sqlite_path=source, postgres_url="postgresql://fake/plan", **kwargs)
+
+
+# ---------------------------
+# compile / compile_tables
+# ---------------------------
+def test_compile_orders_parents_before_children(source, reader, tmp_path):
+    writer = _Writer(f"postgresql://fake/{tmp_path}")
+    plan = MigrationPlanner(reader, writer).compile(
+        _request(source, table_workers=2, row_estimate=RowEstimate.EXACT)
+    )
+
+    assert plan.order == [["parent", "tag"], ["child"]]
+    assert plan.sizes == {"parent": 10, "child": 40, "tag": 0}
+    assert plan.rows_exact
+    assert plan.dependencies["child"] == {"parent"}
+
+    child = plan.tables["child"]
+    assert child.key_column == "rowid"
+    assert child.copy_sql.startswith("COPY")
+    assert child.estimated_bytes > plan.tables["parent"].estimated_bytes
+    assert [o["name"] for o in child.post_load if o["kind"] == "index"] == ["child_parent"]
+    assert plan.tables["tag"].key_column is None
+
+
+def test_existing_target_columns_drive_the_converters(source, reader, tmp_path):
+    writer = _Writer(
+        f"postgresql://fake/{tmp_path}",
+        {"parent": [{"name": "id", "type": "bigint"}, {"name": "name", "type": "text"}]},
+    )
+    plans, _ = MigrationPlanner(reader, writer).compile_tables(_request(source), ["parent", "child"])
+
+    assert sorted(plans) == ["child", "parent"]
+    assert plans["parent"].describe()["exists"]
+    assert not plans["child"].describe()["exists"]
+
+
+def test_compile_rejects_unknown_tables(source, reader):
+    with pytest.raises(ValueError, match="missing"):
+        MigrationPlanner(reader, None).compile(_request(source), tables=["parent", "missing"])
+
+
+# ---------------------------
+# estimate_duration
+# ---------------------------
+@pytest.mark.parametrize("load_mode", [LoadMode.COPY_CSV, LoadMode.EXECUTE_BATCH])
+def test_estimate_samples_the_largest_table_and_rolls_back(source, reader, tmp_path, load_mode):
+    writer = _Writer(f"postgresql://fake/{tmp_path}")
+    planner = MigrationPlanner(reader, writer)
+    plan = planner.compile(_request(source, load_mode=load_mode))
+
+    estimate = planner.estimate_duration(plan, sample_rows=25)
+
+    assert plan.estimate is estimate
+    assert estimate["sample_table"] == "child"
+    assert estimate["sample_rows"] == 25
+    assert estimate["seconds"] >= 0
+    assert estimate["read_bytes_per_second"] > 0
+
+    # El sondeo escribe en una tabla temporal y se deshace
+    assert writer.statements == [f'CREATE TEMP TABLE IF NOT EXISTS "{PROBE_TABLE}"', "ROLLBACK"]
+    assert [(table, rows) for table, rows, _ in writer.copied] == [(PROBE_TABLE, 25)]
+
+
+def test_estimate_of_an_empty_plan_is_zero(source, reader, tmp_path):
+    writer = _Writer(f"postgresql://fake/{tmp_path}")
+    planner = MigrationPlanner(reader, writer)
+    plan = planner.compile(_request(source), tables=["tag"])
+
+    assert planner.estimate_duration(plan, sample_rows=25) == {"seconds": 0.0, "sample_rows": 0}
+    assert writer.statements == []
@@ -0,0 +1,22 @@
+from src.application.migration_service import MigrationService
+from src.domain.models import MigrationJob
+
+
+def test_errors_endpoint_survives_unreachable_target():
+    service = MigrationService()
+    try:
+        job = MigrationJob(
+            job_id="job-2",
+            request={"postgres_url": "postgresql://u:p@127.0.0.1:1/db"},
+            quarantined_rows=3,
+        )
+        job.mark_failed("boom")
+        service.job_manager.create(job)
+
+        response = service.get_job_errors("job-2")
+        assert response.errors == ["boom"]
+        assert response.quarantined_rows == 3
+        assert response.quarantine == []
+        assert "unreachable" in response.note
+    finally:
+        service.scheduler.shutdown()
@@ -0,0 +1,215 @@
+import psycopg2
+import pytest
+
+from src.application.migration.post_load import (
+    PG_NAME_BYTES,
+    PostLoadBuilder,
+    compile_post_load,
+    select_post_load,
+    _pg_name,
+)
+from src.domain.models import MigrationJob
+
+
+def _col(name, pk=False):
+    return {"name": name, "type": "INTEGER", "pk": pk}
+
+
+SCHEMAS = {
+    "parent": [_col("id", pk=True), _col("a"), _col("b")],
+    "child": [_col("id", pk=True), _col("parent_id"), _col("pa"), _col("pb"), _col("name")],
+}
+
+
+def _index(name, columns, origin="c", unique=False, partial=False, descending=None):
+    return {
+        "name": name,
+        "unique": unique,
+        "origin": origin,
+        "partial": partial,
+        "columns": columns,
+        "descending": descending or [False] * len(columns),
+    }
+
+
+def _fk(fk_id, seq, table, src, dst, on_delete="NO ACTION"):
+    return {"id": fk_id, "seq": seq, "table": table, "from": src, "to": dst, "on_update": "NO ACTION", "on_delete": on_delete}
+
+
+def _by_name(objects):
+    return {o["name"]: o for o in objects}
+
+
+# ---------------------------
+# Compile
+# ---------------------------
+def test_indexes_are_translated_or_skipped():
+    objects = _by_name(compile_post_load(
+        "child",
+        SCHEMAS,
+        [
+            _index("sqlite_autoindex_child_1", ["id"], origin="pk"),
+            _index("child_name", ["name", "parent_id"], descending=[True, False]),
+            _index("sqlite_autoindex_child_2", ["pa", "pb"], origin="u", unique=True),
+            _index("child_expr", [None]),
+            _index("child_part", ["pa"], partial=True),
+        ],
+        [],
+        ["child"],
+    ))
+
+    assert set(objects) == {"child_name", "child_pa_pb_key", "child_expr", "child_part"}
+    assert objects["child_name"]["sql"] == (
+        'CREATE INDEX IF NOT EXISTS "child_name" ON "child" ("name" DESC, "parent_id");'
+    )
+    assert objects["child_pa_pb_key"]["sql"].startswith('CREATE UNIQUE INDEX IF NOT EXISTS "child_pa_pb_key"')
+    assert objects["child_expr"]["skipped"] == "expression index"
+    assert objects["child_part"]["skipped"] == "partial index"
+
+
+def test_foreign_keys_are_grouped_and_added_not_valid():
+    objects = _by_name(compile_post_load(
+        "child",
+        SCHEMAS,
+        [],
+        [
+            # Sin ORDER BY en el catálogo: seq puede llegar desordenado
+            _fk(1, 1, "parent", "pb", "b"),
+            _fk(0, 0, "parent", "parent_id", None, on_delete="CASCADE"),
+            _fk(1, 0, "parent", "pa", "a"),
+        ],
+        ["child", "parent"],
+    ))
+
+    composite = objects["child_pa_pb_fkey"]
+    assert composite["sql"] == (
+        'ALTER TABLE "child" ADD CONSTRAINT "child_pa_pb_fkey" '
+        'FOREIGN KEY ("pa", "pb") REFERENCES "parent" ("a", "b") NOT VALID;'
+    )
+    assert composite["validate_sql"] == 'ALTER TABLE "child" VALIDATE CONSTRAINT "child_pa_pb_fkey";'
+
+    # "to" ausente: referencia el PK del padre
+    implicit = objects["child_parent_id_fkey"]
+    assert 'REFERENCES "parent" ("id") ON DELETE CASCADE NOT VALID' in implicit["sql"]
+
+
+def test_foreign_keys_outside_the_job_are_skipped():
+    objects = compile_post_load("child", SCHEMAS, [], [_fk(0, 0, "parent", "parent_id", "id")], ["child"])
+    assert objects[0]["skipped"] == "references parent, not part of this job"
+
+    selected = select_post_load(
+        compile_post_load("child", SCHEMAS, [], [_fk(0, 0, "parent", "parent_id", "id")], ["child", "parent"]),
+        indexes=True,
+        foreign_keys=True,
+        tables={"child"},
+    )
+    assert selected[0]["skipped"] == "references parent, not part of this job"
+    assert select_post_load(selected, indexes=True, foreign_keys=False) == []
+
+
+def test_long_names_are_truncated_stably():
+    name = _pg_name("t" * 40, "c" * 30, "key")
+    assert len(name.encode("utf-8")) == PG_NAME_BYTES
+    assert name == _pg_name("t" * 40, "c" * 30, "key")
+    assert name != _pg_name("t" * 40, "c" * 29 + "d", "key")
+
+
+# ---------------------------
+# Build (fake writer)
+# ---------------------------
+class _ForeignKeyViolation(psycopg2.Error):
+    pgcode = "23503"
+
+
+class _FakeSession:
+    def __init__(self, writer, settings):
+        self.writer = writer
+        self.settings = settings
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def relation_exists(self, name):
+        return name in self.writer.relations
+
+    def constraint_state(self, table, name):
+        return self.writer.constraints.get(name)
+
+    def execute_sql(self, sql):
+        self.writer.statements.append((self.settings, sql))
+        if "VALIDATE" in sql and sql in self.writer.violated:
+            raise _ForeignKeyViolation("insert or update violates foreign key constraint")
+        if "VALIDATE" in sql and sql in self.writer.broken:
+            raise psycopg2.Error("lock timeout")
+        if "ADD CONSTRAINT" in sql:
+            self.writer.constraints[sql.split('"')[3]] = False
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class _FakeWriter:
+    def __init__(self, relations=(), violated=(), broken=()):
+        self.relations = set(relations)
+        self.constraints = {}
+        self.violated = set(violated)
+        self.broken = set(broken)
+        self.statements = []
+
+    def session(self, settings=None):
+        return _FakeSession(self, settings)
+
+
+class _JobManager:
+    def update(self, job):
+        pass
+
+
+def _objects():
+    return compile_post_load(
+        "child",
+        SCHEMAS,
+        [_index("child_name", ["name"]), _index("child_part", ["pa"], partial=True)],
+        [_fk(0, 0, "parent", "parent_id", "id"), _fk(1, 0, "parent", "pa", "a")],
+        ["child", "parent"],
+    )
+
+
+def test_builder_reports_every_object():
+    writer = _FakeWriter(relations={"child_name"}, violated={
+        'ALTER TABLE "child" VALIDATE CONSTRAINT "child_pa_fkey";'
+    })
+    job = MigrationJob(job_id="post-load-1")
+
+    PostLoadBuilder(writer, _JobManager(), workers=2, settings={"maintenance_work_mem": "1GB"}).run(job, _objects())
+
+    statuses = {name: report["status"] for name, report in job.post_load.items()}
+    assert statuses == {
+        "child_name": "exists",
+        "child_part": "skipped",
+        "child_parent_id_fkey": "validated",
+        # Filas que la violan: queda NOT VALID y el job sigue
+        "child_pa_fkey": "not_valid",
+    }
+    assert set(job.phase_seconds) == {"indexes", "foreign_keys"}
+
+
+def test_builder_fails_after_trying_everything():
+    writer = _FakeWriter(broken={'ALTER TABLE "child" VALIDATE CONSTRAINT "child_parent_id_fkey";'})
+    job = MigrationJob(job_id="post-load-2")
+
+    with pytest.raises(ValueError, match="child_parent_id_fkey"):
+        PostLoadBuilder(writer, _JobManager(), workers=2, settings={"maintenance_work_mem": "2GB"}).run(job, _objects())
+
+    assert job.post_load["child_name"]["status"] == "created"
+    assert job.post_load["child_pa_fkey"]["status"] == "validated"
+    assert job.post_load["child_parent_id_fkey"]["status"] == "failed"
+    # Índices con maintenance_work_mem propio; foreign keys en sesiones normales
+    assert [s for s, sql in writer.statements if "CREATE INDEX" in sql] == [{"maintenance_work_mem": "2GB"}]
+    assert {str(s) for s, sql in writer.statements if "CONSTRAINT" in sql} == {"None"}
@@ -0,0 +1,153 @@
+import types
+
+from src.infrastructure.adapters.connection_pool import ConnectionPool
+from src.infrastructure.adapters.postgres_writer import CommitPolicy, PostgresSession, search_path_option
+
+
+def test_search_path_option_quotes_schema():
+    assert search_path_option("sales") == '-c search_path="sales"'
+    assert search_path_option('my"schema') == '-c search_path="my""schema"'
+
+
+def test_search_path_option_cannot_inject_settings():
+    option = search_path_option("x -c statement_timeout=1")
+    assert option == '-c search_path="x\\ -c\\ statement_timeout=1"'
+    # libpq separa opciones por espacios sin escapar: solo queda un -c
+    assert option.replace("\\ ", "").count(" ") == 1
+
+
+# ---------------------------
+# write_isolated (fake connection)
+# ---------------------------
+class _FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        if sql.startswith("SAVEPOINT"):
+            self.conn.savepoints += 1
+            self.conn.max_depth = max(self.conn.max_depth, self.conn.savepoints)
+        elif sql.startswith("RELEASE"):
+            self.conn.savepoints -= 1
+        self.conn.statements.append(sql)
+
+    def copy_expert(self, sql, stream, size=8192):
+        rows = 0
+        while True:
+            chunk = stream.read(size)
+            if not chunk:
+                break
+            rows += chunk.count(b"\n")
+        self.conn.statements.append(sql)
+        self.conn.copies.append(rows)
+
+
+class _FakeConn:
+    def __init__(self):
+        self.savepoints = 0
+        self.max_depth = 0
+        self.statements = []
+        self.copies = []
+        # Filas COPYadas en cada transacción confirmada
+        self.commits = []
+        self.closed = False
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def commit(self):
+        self.commits.append(sum(self.copies) - sum(self.commits))
+
+    def rollback(self):
+        pass
+
+
+def _session():
+    session = PostgresSession(writer=None, commit_policy=CommitPolicy())
+    session.conn = _FakeConn()
+    return session
+
+
+def _writer(written: list):
+    def write(cursor, rows):
+        if any(row[1] == "bad" for row in rows):
+            raise ValueError("bad row")
+        written.extend(rows)
+
+    return write
+
+
+def test_write_isolated_rejects_only_bad_rows_in_order():
+    rows = [(i, "bad" if i in (3, 6) else "ok") for i in range(8)]
+    written, rejected = [], []
+
+    session = _session()
+    count = session.write_isolated(rows, _writer(written), lambda row, e: rejected.append(row[0]))
+
+    assert count == 6
+    assert [row[0] for row in written] == [0, 1, 2, 4, 5, 7]
+    assert rejected == [3, 6]
+
+
+def test_write_isolated_releases_every_savepoint():
+    rows = [(i, "bad") for i in range(100)]
+
+    session = _session()
+    session.write_isolated(rows, _writer([]), lambda row, e: None)
+
+    # Cada intento fallido suelta su savepoint: nunca hay anidamiento
+    assert session.conn.max_depth == 1
+    assert session.conn.savepoints == 0
+
+
+# ---------------------------
+# Commit cadence (fake connection through a real pool)
+# ---------------------------
+def _copy(policy, batches):
+    writer = types.SimpleNamespace(pool=ConnectionPool(_FakeConn, max_size=1))
+    with PostgresSession(writer, policy) as session:
+        conn = session.conn
+        session.copy_rows("t", ["v"], batches)
+    return conn, session
+
+
+def test_commit_every_batches_cuts_one_copy_per_interval():
+    batches = [[(f"row-{i}",)] * 10 for i in range(5)]
+    conn, session = _copy(CommitPolicy(every_batches=2), batches)
+
+    assert conn.copies == [20, 20, 10]
+    # Dos commits por intervalo y el último al cerrar la sesión
+    assert conn.commits == [20, 20, 10]
+    assert session.commits == 3
+
+
+def test_commit_every_bytes():
+    batches = [[("x" * 100,)] * 10 for _ in range(5)]
+    conn, _ = _copy(CommitPolicy(every_bytes=1500), batches)
+
+    # 1000 bytes por lote: el intervalo se cierra al segundo lote
+    assert conn.commits == [20, 20, 10]
+
+
+def test_without_policy_commits_only_on_close():
+    batches = [[("x",)] * 10 for _ in range(4)]
+    conn, session = _copy(CommitPolicy(), batches)
+
+    assert conn.copies == [40]
+    assert conn.commits == [40]
+    assert session.commits == 1
+
+
+def test_session_returns_its_connection_to_the_pool():
+    writer = types.SimpleNamespace(pool=ConnectionPool(_FakeConn, max_size=1))
+    for _ in range(3):
+        with PostgresSession(writer, CommitPolicy()):
+            pass
+    assert writer.pool.stats()["opened"] == 1
+    assert writer.pool.stats()["in_use"] == 0
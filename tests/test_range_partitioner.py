@@ -0,0 +1,27 @@
+from src.application.migration.range_partitioner import KeyRange, RangePartitioner
+
+
+def test_ranges_cover_key_space_without_gaps():
+    ranges = RangePartitioner(workers=4, min_rows_per_range=100).plan("id", 1, 1000, 1000)
+    assert ranges[0].start == 1
+    assert ranges[-1].end == 1001
+    assert all(a.end == b.start for a, b in zip(ranges, ranges[1:]))
+    assert len(ranges) == 10
+
+
+def test_range_count_is_capped_per_worker():
+    partitioner = RangePartitioner(workers=2, min_rows_per_range=10, ranges_per_worker=3)
+    assert len(partitioner.plan("id", 0, 999_999, 1_000_000)) == 6
+
+
+def test_small_or_keyless_tables_get_one_stream():
+    partitioner = RangePartitioner(workers=4, min_rows_per_range=100)
+    assert partitioner.plan("id", 1, 150, 150) == []
+    assert partitioner.plan(None, 1, 1000, 1000) == []
+    assert partitioner.plan("id", None, None, 1000) == []
+    assert RangePartitioner(workers=1, min_rows_per_range=1).plan("id", 1, 1000, 1000) == []
+
+
+def test_narrow_key_span_limits_ranges():
+    ranges = RangePartitioner(workers=8, min_rows_per_range=10).plan("id", 5, 7, 10_000)
+    assert ranges == [KeyRange("id", 5, 6), KeyRange("id", 6, 7), KeyRange("id", 7, 8)]
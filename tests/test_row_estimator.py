@@ -0,0 +1,96 @@
+import sqlite3
+import time
+
+import pytest
+
+from src.application.migration.row_estimator import RowEstimator
+from src.domain.models import RowEstimate
+from src.infrastructure.adapters.sqlite_reader import SQLiteReader
+
+
+@pytest.fixture
+def reader(tmp_path):
+    path = str(tmp_path / "estimate.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE analyzed (id INTEGER PRIMARY KEY, v TEXT);
+        INSERT INTO analyzed (v) VALUES ('a'), ('b'), ('c'), ('d');
+        ANALYZE analyzed;
+        -- Filas nuevas que sqlite_stat1 todavía no refleja
+        INSERT INTO analyzed (v) VALUES ('e');
+
+        CREATE TABLE gappy (id INTEGER PRIMARY KEY);
+        INSERT INTO gappy VALUES (1), (5), (10);
+
+        CREATE TABLE keyless (code TEXT PRIMARY KEY) WITHOUT ROWID;
+        INSERT INTO keyless VALUES ('x'), ('y');
+
+        -- COUNT(*) sobre esta vista no termina nunca
+        CREATE VIEW endless AS
+            WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n)
+            SELECT x FROM n;
+        """
+    )
+    conn.commit()
+    conn.close()
+
+    reader = SQLiteReader(path, pool_size=2)
+    yield reader
+    reader.close()
+
+
+TABLES = ["analyzed", "gappy", "keyless"]
+
+
+# ---------------------------
+# Quick estimate
+# ---------------------------
+def test_auto_prefers_stat1_then_max_rowid_then_count(reader):
+    sizes = RowEstimator(reader, RowEstimate.AUTO).estimate(TABLES)
+    assert sizes == {"analyzed": 4, "gappy": 10, "keyless": 2}
+
+
+def test_max_rowid_ignores_stat1(reader):
+    sizes = RowEstimator(reader, RowEstimate.MAX_ROWID).estimate(TABLES)
+    assert sizes == {"analyzed": 5, "gappy": 10, "keyless": 2}
+
+
+def test_exact_counts_every_table(reader):
+    estimator = RowEstimator(reader, RowEstimate.EXACT)
+    assert estimator.exact
+    assert estimator.estimate(TABLES) == {"analyzed": 5, "gappy": 3, "keyless": 2}
+
+
+# ---------------------------
+# Background refinement
+# ---------------------------
+def test_refinement_reports_exact_total(reader):
+    estimator = RowEstimator(reader, RowEstimate.AUTO)
+    sizes = estimator.estimate(TABLES)
+    updates = []
+
+    refiner = estimator.refine_in_background(TABLES, sizes, lambda total, exact: updates.append((total, exact)))
+    deadline = time.monotonic() + 5
+    while (not updates or not updates[-1][1]) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert refiner.stop()
+
+    assert updates[-1] == (10, True)
+    assert all(not exact for _, exact in updates[:-1])
+
+
+def test_stop_interrupts_the_count_in_flight(reader):
+    updates = []
+    refiner = RowEstimator(reader).refine_in_background(
+        ["endless"], {"endless": 1}, lambda total, exact: updates.append((total, exact))
+    )
+    time.sleep(0.1)
+
+    started = time.monotonic()
+    assert refiner.stop(timeout=5)
+    assert time.monotonic() - started < 2
+
+    # La conexión del conteo volvió al pool antes de cerrar el reader
+    assert reader.pool.stats()["in_use"] == 0
+    assert updates == []
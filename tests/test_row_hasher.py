@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from src.application.verification.row_hasher import RowHasher, _column_rules
+
+
+def _text(pg_type: str, value):
+    to_text, _ = _column_rules(pg_type, '"c"')
+    return to_text(value)
+
+
+def test_equivalent_source_values_hash_alike():
+    hasher = RowHasher(
+        ["flag", "price", "at"],
+        {"flag": "BOOLEAN", "price": "NUMERIC(10,2)", "at": "TIMESTAMP"},
+    )
+    a = hasher.hash_row((1, "12.5", "2024-01-02 03:04:05"))
+    b = hasher.hash_row(("true", Decimal("12.50"), datetime(2024, 1, 2, 3, 4, 5)))
+    assert a == b
+    assert a != hasher.hash_row((0, "12.5", "2024-01-02 03:04:05"))
+
+
+def test_hash_is_signed_64_bit_and_null_aware():
+    hasher = RowHasher(["a", "b"], {"a": "TEXT", "b": "TEXT"})
+    value = hasher.hash_row(("x", None))
+    assert -(2 ** 63) <= value < 2 ** 63
+    assert value != hasher.hash_row(("x", ""))
+    assert hasher.hash_row(("a", "b")) != hasher.hash_row(("b", "a"))
+
+
+def test_canonical_texts():
+    assert _text("BOOLEAN", "no") == "0"
+    assert _text("BIGINT", 7.0) == "7"
+    assert _text("DOUBLE PRECISION", 0.1 + 0.2) == "0.300000"
+    assert _text("DOUBLE PRECISION", -0.0) == "0.000000"
+    assert _text("NUMERIC(10,1)", "2.25") == "2.300000"
+    assert _text("DATE", "2024-03-01T23:00:00") == "2024-03-01"
+    assert _text("TIMESTAMP WITH TIME ZONE", datetime(2024, 1, 1, 1, tzinfo=timezone.utc)) == (
+        "2024-01-01 01:00:00.000000"
+    )
+    assert _text("TIMESTAMP", "2024-01-01T02:00:00+01:00") == "2024-01-01 01:00:00.000000"
+    assert _text("BYTEA", b"\x00\xff") == "00ff"
+    assert _text("CHARACTER(5)", "ab   ") == "ab"
+
+
+def test_sql_expression_matches_column_layout():
+    hasher = RowHasher(["id", "data"], {"id": "BIGINT", "data": "BYTEA"})
+    assert "\"id\"::text" in hasher.sql
+    assert "encode(\"data\", 'hex')" in hasher.sql
+    assert hasher.sql.endswith("::bit(64)::bigint")
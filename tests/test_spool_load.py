@@ -0,0 +1,47 @@
+import types
+
+from src.application.migration.spool_load import SpoolLoadRunner
+from src.domain.models import MigrationJob
+from src.infrastructure.adapters.checkpoint_store import RangeCheckpoint
+
+
+class _JobManager:
+    def update(self, job):
+        pass
+
+
+def _manifest_tables(parts: int):
+    return {
+        "t": {
+            "rows": parts,
+            "depends_on": [],
+            "files": [{"file": f"t.{p}.csv.gz", "part": p, "rows": 1, "bytes": 1, "sha256": None} for p in range(parts)],
+        }
+    }
+
+
+def _units(job, parts: int):
+    return {"t": [RangeCheckpoint(job.job_id, "t", None, p, p + 1) for p in range(parts)]}
+
+
+def test_loaded_files_complete_the_table():
+    job = MigrationJob(job_id="load-1")
+    runner = SpoolLoadRunner(_JobManager())
+    runner._load_file = lambda *args: True
+
+    runner._load_tables(job, None, _manifest_tables(2), _units(job, 2), types.SimpleNamespace(workers=2))
+    assert job.completed_tables == ["t"]
+
+
+def test_skipped_files_do_not_complete_the_table():
+    job = MigrationJob(job_id="load-2")
+    runner = SpoolLoadRunner(_JobManager())
+
+    def stopped(job, *args):
+        # Lo que hace _load_file cuando el job se paró: no carga nada
+        job.cancel()
+        return False
+
+    runner._load_file = stopped
+    runner._load_tables(job, None, _manifest_tables(1), _units(job, 1), types.SimpleNamespace(workers=1))
+    assert job.completed_tables == []
@@ -0,0 +1,100 @@
+import os
+import sqlite3
+
+import pytest
+
+from src.infrastructure.adapters.sqlite_reader import SQLiteReader
+from src.infrastructure.adapters.sqlite_snapshot import SQLiteSnapshot
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = str(tmp_path / "live.db")
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.executemany("INSERT INTO events (name) VALUES (?)", [("a",), ("b",)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _rows(path):
+    reader = SQLiteReader(path, pool_size=1, immutable=True)
+    try:
+        return [row for batch in reader.read_rows("events", 100) for row in batch]
+    finally:
+        reader.close()
+
+
+# ---------------------------
+# Create
+# ---------------------------
+def test_snapshot_is_a_consistent_copy_of_committed_data(source, tmp_path):
+    snapshot = SQLiteSnapshot(source, directory=str(tmp_path / "snaps"), tag="snapshot-1")
+    os.makedirs(tmp_path / "snaps")
+
+    # Una transacción abierta de la aplicación no entra en la copia
+    live = sqlite3.connect(source)
+    live.execute("INSERT INTO events (name) VALUES ('uncommitted')")
+    try:
+        path = snapshot.create()
+    finally:
+        live.rollback()
+        live.close()
+
+    assert path == str(tmp_path / "snaps" / ".live.db.snapshot-1")
+    assert _rows(path) == [(1, "a"), (2, "b")]
+
+    # Escrituras posteriores en el origen no afectan a la copia
+    conn = sqlite3.connect(source)
+    conn.execute("INSERT INTO events (name) VALUES ('c')")
+    conn.commit()
+    conn.close()
+    assert _rows(path) == [(1, "a"), (2, "b")]
+
+
+def test_snapshot_does_not_depend_on_wal_files(source):
+    path = SQLiteSnapshot(source).create()
+    conn = sqlite3.connect(path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    finally:
+        conn.close()
+    assert not os.path.exists(f"{path}-wal")
+
+
+def test_create_replaces_a_stale_snapshot(source):
+    snapshot = SQLiteSnapshot(source)
+    with open(snapshot.path, "wb") as f:
+        f.write(b"left over by a crashed run")
+
+    assert _rows(snapshot.create()) == [(1, "a"), (2, "b")]
+
+
+def test_missing_source_leaves_no_file(tmp_path):
+    snapshot = SQLiteSnapshot(str(tmp_path / "missing.db"))
+    with pytest.raises(sqlite3.OperationalError):
+        snapshot.create()
+    assert not os.path.exists(snapshot.path)
+
+
+# ---------------------------
+# Remove
+# ---------------------------
+def test_remove_deletes_the_copy_and_its_side_files(source):
+    snapshot = SQLiteSnapshot(source)
+    path = snapshot.create()
+    open(f"{path}-journal", "w").close()
+
+    snapshot.remove()
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.startswith(".live.db")]
+    # Idempotente: el runner lo llama también si create() falló
+    snapshot.remove()
+
+
+def test_context_manager_removes_the_snapshot(source):
+    with SQLiteSnapshot(source, tag="snapshot-2") as path:
+        assert _rows(path) == [(1, "a"), (2, "b")]
+    assert not os.path.exists(path)
+    assert os.path.exists(source)
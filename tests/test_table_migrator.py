@@ -0,0 +1,254 @@
+import threading
+import types
+
+import pytest
+
+from src.application.jobs.memory_budget import MemoryBudget
+from src.application.migration.range_partitioner import KeyRange, RangePartitioner
+from src.application.migration.table_migrator import TableMigrator
+from src.domain.models import MigrationJob
+from src.infrastructure.adapters.checkpoint_store import PostgresCheckpointStore, RangeCheckpoint
+
+
+class _JobManager:
+    def update(self, job):
+        pass
+
+
+class _PressureReader:
+    """Some small batches, then batches that no longer fit next to them."""
+
+    def read_rows(self, table, batch_size, key_range=None, large=None):
+        for _ in range(4):
+            yield [("x" * 75,)]
+        while True:
+            yield [("x" * 1900,)]
+
+
+def _run(target, seconds: float = 5.0) -> None:
+    # Un cuelgue no debe bloquear la suite: el hilo es daemon y se espera con timeout
+    errors = []
+
+    def guarded():
+        try:
+            target()
+        except BaseException as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=guarded, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), "consumer hung"
+    if errors:
+        raise errors[0]
+
+
+# ---------------------------
+# Memory budget / cancellation
+# ---------------------------
+@pytest.mark.parametrize("depth", [0, 4])
+def test_cancel_under_memory_pressure_returns_the_budget(depth):
+    budget = MemoryBudget(2000)
+    migrator = TableMigrator(_PressureReader(), None, None, _JobManager(), prefetch_depth=depth, memory_budget=budget)
+    job = MigrationJob(job_id="cancel-1")
+    unit = RangeCheckpoint(job.job_id, "t", None, 0, 0)
+
+    def consume():
+        batches = migrator._tracked_batches(job, "t", 10, unit)
+        next(batches)
+        job.cancel()
+        for _ in batches:
+            pass
+
+    _run(consume)
+    assert budget.used == 0
+
+
+def test_failed_write_under_memory_pressure_returns_the_budget():
+    budget = MemoryBudget(2000)
+    migrator = TableMigrator(_PressureReader(), None, None, _JobManager(), memory_budget=budget)
+    job = MigrationJob(job_id="fail-1")
+    unit = RangeCheckpoint(job.job_id, "t", None, 0, 0)
+
+    def consume():
+        # El writer falla a mitad de stream (p.ej. una tabla hermana falló)
+        for _ in migrator._tracked_batches(job, "t", 10, unit):
+            raise RuntimeError("write failed")
+
+    with pytest.raises(RuntimeError):
+        _run(consume)
+    assert budget.used == 0
+
+
+# ---------------------------
+# Work plan / checkpoints (fake cursor over the checkpoint table)
+# ---------------------------
+class _CheckpointCursor:
+    """Runs PostgresCheckpointStore's statements against an in-memory table."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=()):
+        sql = sql.strip()
+        if sql.startswith("INSERT"):
+            job_id, table, start, end, column = params
+            self.rows.setdefault(
+                (job_id, table, start),
+                {"key_column": column, "range_end": end, "last_key": None, "rows_copied": 0, "completed": False},
+            )
+        elif sql.startswith("UPDATE"):
+            last_key, rows_copied, completed, job_id, table, start = params
+            self.rows[(job_id, table, start)].update(last_key=last_key, rows_copied=rows_copied, completed=completed)
+        elif sql.startswith("SELECT COALESCE"):
+            (job_id,) = params
+            self.result = [(sum(r["rows_copied"] for k, r in self.rows.items() if k[0] == job_id),)]
+        elif sql.startswith("SELECT"):
+            job_id, table = params
+            self.result = [
+                (r["key_column"], k[2], r["range_end"], r["last_key"], r["rows_copied"], r["completed"])
+                for k, r in sorted(self.rows.items())
+                if k[:2] == (job_id, table)
+            ]
+
+    def fetchall(self):
+        return self.result
+
+    def fetchone(self):
+        return self.result[0]
+
+
+class _CheckpointSession:
+    def __init__(self):
+        self.rows = {}
+        self.statements = []
+
+    def cursor(self):
+        return _CheckpointCursor(self.rows)
+
+    def execute_sql(self, sql):
+        self.statements.append(sql)
+
+
+class _KeyedReader:
+    def __init__(self):
+        self.ranges = []
+
+    def get_key_bounds(self, table, column):
+        return 1, 1000
+
+    def read_keyed_rows(self, table, batch_size, key_range, large=None):
+        self.ranges.append(key_range)
+        yield key_range.end - 1, [(key_range.end - 1,)]
+
+
+def _plan(key_column="id"):
+    return types.SimpleNamespace(table="t", key_column=key_column)
+
+
+def _migrator(reader=None, workers=4):
+    return TableMigrator(
+        reader or _KeyedReader(),
+        None,
+        None,
+        _JobManager(),
+        partitioner=RangePartitioner(workers=workers, min_rows_per_range=100),
+        prefetch_depth=0,
+        checkpoint_store=PostgresCheckpointStore(),
+    )
+
+
+def _store(session, *checkpoints):
+    store = PostgresCheckpointStore()
+    with session.cursor() as cursor:
+        store.create(cursor, list(checkpoints))
+        for cp in checkpoints:
+            store.save(cursor, cp)
+
+
+def test_fresh_job_plans_ranges_and_records_them():
+    session = _CheckpointSession()
+    job = MigrationJob(job_id="plan-1")
+
+    units = _migrator()._plan_work(session, job, _plan(), 1000)
+
+    assert [(u.range_start, u.range_end) for u in units][:2] == [(1, 101), (101, 201)]
+    assert units[-1].range_end == 1001
+    assert len(session.rows) == len(units)
+    assert session.statements == []
+
+
+def test_resume_skips_completed_ranges_and_continues_from_last_key():
+    session = _CheckpointSession()
+    _store(
+        session,
+        RangeCheckpoint("plan-2", "t", "id", 1, 101, last_key=100, rows_copied=100, completed=True),
+        RangeCheckpoint("plan-2", "t", "id", 101, 201, last_key=150, rows_copied=50),
+        RangeCheckpoint("plan-2", "t", "id", 201, 301),
+    )
+    job = MigrationJob(job_id="plan-2")
+
+    migrator = _migrator()
+    units = migrator._plan_work(session, job, _plan(), 300)
+
+    assert [u.range_start for u in units] == [101, 201]
+    assert [u.resume_start for u in units] == [151, 201]
+    # Las filas confirmadas de rangos con clave se conservan: nada se trunca
+    assert session.statements == []
+    assert job.processed_rows == 0
+
+    # La lectura retoma justo después de la última clave confirmada
+    list(migrator._tracked_batches(job, "t", 10, units[0]))
+    assert migrator.reader.ranges == [KeyRange("id", 151, 201)]
+    assert (units[0].last_key, units[0].rows_copied) == (200, 51)
+
+
+def test_keyless_table_cut_mid_way_is_truncated_and_reloaded():
+    session = _CheckpointSession()
+    _store(session, RangeCheckpoint("plan-3", "t", None, 0, 0, rows_copied=40))
+    job = MigrationJob(job_id="plan-3")
+    # El job ya contó las filas copiadas antes del corte
+    job.record_progress(40)
+
+    (unit,) = _migrator()._plan_work(session, job, _plan(key_column=None), 100)
+
+    assert session.statements == ['TRUNCATE "t"']
+    assert unit.rows_copied == 0
+    assert job.processed_rows == 0
+
+
+def test_restart_replays_every_stored_range_from_scratch():
+    session = _CheckpointSession()
+    _store(
+        session,
+        RangeCheckpoint("plan-4", "t", "id", 1, 101, last_key=100, rows_copied=100, completed=True),
+        RangeCheckpoint("plan-4", "t", "id", 101, 201, last_key=150, rows_copied=50),
+    )
+    job = MigrationJob(job_id="plan-4")
+    job.record_progress(150)
+
+    units = _migrator()._plan_work(session, job, _plan(), 200, restart=True)
+
+    assert session.statements == ['TRUNCATE "t"']
+    assert [(u.resume_start, u.rows_copied, u.completed) for u in units] == [(1, 0, False), (101, 0, False)]
+    assert job.processed_rows == 0
+    assert all(r["rows_copied"] == 0 and not r["completed"] for r in session.rows.values())
+
+
+def test_rows_copied_sums_the_committed_rows_of_a_job():
+    session = _CheckpointSession()
+    _store(
+        session,
+        RangeCheckpoint("plan-5", "a", "id", 1, 101, last_key=100, rows_copied=100, completed=True),
+        RangeCheckpoint("plan-5", "b", None, 0, 0, rows_copied=30),
+        RangeCheckpoint("other", "a", "id", 1, 101, rows_copied=7),
+    )
+    with session.cursor() as cursor:
+        assert PostgresCheckpointStore().rows_copied(cursor, "plan-5") == 130
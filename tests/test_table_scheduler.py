@@ -0,0 +1,62 @@
+from src.application.migration.table_scheduler import TableScheduler
+
+
+def _drain(scheduler: TableScheduler, limit: int = 1):
+    """Order in which tables are released, finishing each batch before the next."""
+    order = []
+    while scheduler.has_work():
+        taken = scheduler.take_ready(limit)
+        order.append(taken)
+        for table in taken:
+            scheduler.mark_done(table)
+    return order
+
+
+def test_parents_run_before_children():
+    scheduler = TableScheduler(
+        tables=["child", "parent", "grandchild"],
+        sizes={"child": 10, "parent": 1, "grandchild": 100},
+        dependencies={"child": {"parent"}, "grandchild": {"child"}},
+    )
+    assert _drain(scheduler, limit=3) == [["parent"], ["child"], ["grandchild"]]
+
+
+def test_largest_ready_table_goes_first():
+    scheduler = TableScheduler(
+        tables=["a", "b", "c"],
+        sizes={"a": 5, "b": 50, "c": 20},
+        dependencies={},
+    )
+    assert scheduler.take_ready(2) == ["b", "c"]
+    assert scheduler.take_ready(2) == ["a"]
+
+
+def test_cycle_releases_largest_pending_table():
+    scheduler = TableScheduler(
+        tables=["a", "b"],
+        sizes={"a": 1, "b": 9},
+        dependencies={"a": {"b"}, "b": {"a"}},
+    )
+    assert _drain(scheduler) == [["b"], ["a"]]
+
+
+def test_cycle_waits_while_something_is_running():
+    scheduler = TableScheduler(
+        tables=["x", "a", "b"],
+        sizes={"x": 1, "a": 1, "b": 1},
+        dependencies={"a": {"b"}, "b": {"a"}},
+    )
+    assert scheduler.take_ready(1) == ["x"]
+    # x sigue en curso: el ciclo no se rompe todavía
+    assert scheduler.take_ready(1) == []
+    scheduler.mark_done("x")
+    assert scheduler.take_ready(1) == ["b"]
+
+
+def test_self_and_external_references_do_not_block():
+    scheduler = TableScheduler(
+        tables=["tree"],
+        sizes={},
+        dependencies={"tree": {"tree", "outside"}},
+    )
+    assert scheduler.take_ready(1) == ["tree"]
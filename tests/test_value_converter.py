@@ -0,0 +1,98 @@
+import sqlite3
+from datetime import date, datetime, timezone
+
+import pytest
+
+from src.application.dtos import StartExportRequest
+from src.application.migration.migration_plan import MigrationPlanner
+from src.application.schema.type_converter import TypeConverter
+from src.application.schema.value_converter import (
+    BatchConverter,
+    converter_for,
+    to_bool,
+    to_bytea,
+    to_date,
+    to_text,
+    to_timestamp,
+    to_timestamptz,
+)
+from src.infrastructure.adapters.copy_encoder import BinaryCopyEncoder, CsvCopyEncoder
+from src.infrastructure.adapters.sqlite_reader import SQLiteReader
+
+NOT_UTF8 = b"\xff\xd8\x00\x10"
+
+
+# ---------------------------
+# Column converters
+# ---------------------------
+def test_bool_accepts_sqlite_spellings():
+    assert [to_bool(v) for v in (1, "0", "t", "yes", "False")] == [True, False, True, True, False]
+    assert to_bool("maybe") == "maybe"
+
+
+def test_timestamps_are_normalised_to_utc():
+    assert to_timestamp("2024-01-01 10:00:00") == "2024-01-01 10:00:00"
+    assert to_timestamp("2024-01-01T10:00:00+02:00") == datetime(2024, 1, 1, 8)
+    assert to_timestamptz(0) == datetime(1970, 1, 1, tzinfo=timezone.utc)
+    assert to_date(datetime(2024, 5, 6, 7)) == date(2024, 5, 6)
+
+
+def test_text_strips_nul_and_rejects_invalid_utf8():
+    assert to_text("a\x00b") == "ab"
+    assert to_text("é".encode("utf-8")) == "é"
+    with pytest.raises(ValueError):
+        to_text(NOT_UTF8)
+
+
+def test_bytea_keeps_bytes_and_encodes_text():
+    assert to_bytea(NOT_UTF8) is NOT_UTF8
+    assert to_bytea("é") == "é".encode("utf-8")
+    assert to_bytea(12) == b"12"
+
+
+def test_converter_for_target_types():
+    assert converter_for("BYTEA") is to_bytea
+    assert converter_for("character varying(10)") is to_text
+    assert converter_for("BIGINT") is None
+
+
+def test_batch_converter_only_touches_planned_columns():
+    converter = BatchConverter(["BIGINT", "BOOLEAN", "TEXT"])
+    assert [index for index, _ in converter.plan] == [1, 2]
+    assert converter([(1, "t", "x\x00"), (2, None, None)]) == [(1, True, "x"), (2, None, None)]
+    assert BatchConverter(["BIGINT"]).is_identity
+
+
+# ---------------------------
+# BLOB → BYTEA round trip
+# ---------------------------
+def test_blob_maps_to_bytea():
+    assert TypeConverter.sqlite_to_postgres("BLOB") == "BYTEA"
+    assert TypeConverter.sqlite_to_postgres("") == "TEXT"
+
+
+def test_non_utf8_blob_round_trips(tmp_path):
+    path = str(tmp_path / "source.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE parent (id INTEGER PRIMARY KEY, data BLOB, raw, label)")
+    conn.execute("INSERT INTO parent VALUES (1, ?, ?, 'x')", (NOT_UTF8, NOT_UTF8))
+    conn.commit()
+    conn.close()
+
+    reader = SQLiteReader(path, pool_size=1, read_only=True)
+    try:
+        req = StartExportRequest(sqlite_path=path, spool_dir=str(tmp_path))
+        plans, _ = MigrationPlanner(reader, None).compile_tables(req)
+    finally:
+        reader.close()
+
+    plan = plans["parent"]
+    # Sin tipo declarado: BYTEA solo si la columna guarda blobs
+    assert plan.column_types == ["BIGINT", "BYTEA", "BYTEA", "TEXT"]
+
+    row = plan.converter([(1, NOT_UTF8, NOT_UTF8, "x")])[0]
+    assert row[1] == NOT_UTF8 and row[2] == NOT_UTF8
+
+    assert CsvCopyEncoder().encode_batch([row]) == b'1,\\xffd80010,\\xffd80010,"x"\n'
+    binary = BinaryCopyEncoder(plan.column_types).encode_batch([row])
+    assert binary.count(b"\x00\x00\x00\x04" + NOT_UTF8) == 2